@@ -172,14 +172,53 @@ function calculateFinaPoints(timeMs, gender, poolLength, stroke, distance) {
     return points;
 }
 
+// Points FINA et écarts précalculés par le scraper (standards.py) quand ils
+// correspondent au sexe affiché, sinon calculés ici
+function getFinaPoints(result, gender) {
+    if (!result) return null;
+    if (result.finaPoints !== undefined && gender === swimmer?.gender) return result.finaPoints;
+    return calculateFinaPoints(result.timeMs, gender, result.poolLength, result.stroke, result.distance);
+}
+
+function getStandard(result, cat, time, gender) {
+    const precomputed = gender === swimmer?.gender ? result?.standards?.[cat] : null;
+    if (precomputed) return precomputed;
+    
+    const limitMs = timeToMs(time);
+    return {
+        limitMs,
+        gapMs: result && limitMs ? result.timeMs - limitMs : null,
+        finaPoints: result ? calculateFinaPoints(limitMs, gender, result.poolLength, result.stroke, result.distance) : null
+    };
+}
+
 // =============================================================================
 // SWIMMERS DATA (depuis GitHub - mis à jour automatiquement chaque jour)
 // =============================================================================
+// Un fichier par nageur (data/swimmers/<id>.json) + index des nageurs (publish.py)
+const SWIMMERS_BASE_URL = 'https://raw.githubusercontent.com/smarsys/Swimtimes/main/data/';
+// Fichiers complets, utilisés si l'index n'est pas disponible
 const SWIMMERS_DATA_URL = 'https://raw.githubusercontent.com/smarsys/Swimtimes/main/swimmers-data.json';
 const SWIMMERS_SEASON_URL = 'https://raw.githubusercontent.com/smarsys/Swimtimes/main/swimmers-season.json';
 
+let swimmersIndex = null;
 let swimmersSeasonData = null;
 
+async function loadSwimmersIndex() {
+    if (swimmersIndex) return swimmersIndex;
+    
+    try {
+        const response = await fetch(SWIMMERS_BASE_URL + 'index.json', { cache: 'no-cache' });
+        if (!response.ok) throw new Error('Fichier non trouvé');
+        swimmersIndex = await response.json();
+        console.log('✅ Index nageurs chargé:', swimmersIndex._metadata?.generated);
+        return swimmersIndex;
+    } catch (err) {
+        console.log('ℹ️ index.json non disponible, chargement des fichiers complets');
+        return null;
+    }
+}
+
 async function loadSwimmersData() {
     if (swimmersData) return swimmersData;
     
@@ -211,10 +250,24 @@ async function loadSwimmersSeasonData() {
 }
 
 function getSeasonLabel() {
-    return swimmersSeasonData?._metadata?.season?.label || 'Saison courante';
+    return swimmersIndex?._metadata?.season?.label || swimmersSeasonData?._metadata?.season?.label || 'Saison courante';
 }
 
 async function fetchSwimmerData(athleteId) {
+    const index = await loadSwimmersIndex();
+    if (index) {
+        const entry = index.swimmers.find(s => s.id === athleteId);
+        if (!entry) {
+            throw new Error(`Nageur ${athleteId} non trouvé. Ajoutez cet ID dans athletes.txt et relancez le workflow GitHub.`);
+        }
+        // Le hash change avec le contenu: le fichier peut rester en cache sinon
+        const response = await fetch(`${SWIMMERS_BASE_URL}swimmers/${athleteId}.json?v=${entry.hash}`);
+        if (!response.ok) throw new Error(`Données du nageur ${athleteId} non disponibles`);
+        const swimmerData = await response.json();
+        swimmerData.seasonBests = swimmerData.seasonBests || [];
+        return swimmerData;
+    }
+    
     const data = await loadSwimmersData();
     const seasonData = await loadSwimmersSeasonData();
     
@@ -310,19 +363,20 @@ async function loadSwimmerSelector() {
     const selector = document.getElementById('swimmer-selector');
     if (!selector) return;
     
-    const data = await loadSwimmersData();
+    // Index: liste des nageurs avec le nombre de records (sans les temps)
+    const index = await loadSwimmersIndex();
+    const data = index ? null : await loadSwimmersData();
+    const swimmers = index ? index.swimmers : Object.values(data?.swimmers || {});
     
-    if (!data?.swimmers || Object.keys(data.swimmers).length === 0) {
+    if (swimmers.length === 0) {
         selector.innerHTML = `<option value="">Aucun nageur configuré</option>`;
         return;
     }
     
-    const swimmers = Object.values(data.swimmers);
-    
     selector.innerHTML = `
         <option value="">-- Choisir un nageur --</option>
         ${swimmers.map(s => `
-            <option value="${s.id}">${s.fullName} (${s.club || 'N/A'}) - ${s.personalBests?.length || 0} PBs</option>
+            <option value="${s.id}">${s.fullName} (${s.club || 'N/A'}) - ${index ? s.personalBests : s.personalBests?.length || 0} PBs</option>
         `).join('')}
     `;
 }
@@ -371,6 +425,8 @@ function renderPBsByPool(poolLength, title) {
 async function refreshProfile() {
     if (!swimmer) return;
     swimmersData = null; // Force reload
+    swimmersIndex = null;
+    swimmersSeasonData = null;
     try {
         swimmer = await fetchSwimmerData(swimmer.id);
         localStorage.setItem('swimmer_profile', JSON.stringify(swimmer));
@@ -511,7 +567,7 @@ function updateTimesDisplay() {
     if (pb || seasonBest) {
         pbDisplay.classList.remove('empty');
         const displayTime = pb || seasonBest;
-        const finaPoints = calculateFinaPoints(displayTime.timeMs, gender, poolLengthNum, stroke, parseInt(actualDistance));
+        const finaPoints = getFinaPoints(displayTime, gender);
         
         let pbHtml = '';
         if (pb) {
@@ -553,13 +609,13 @@ function updateTimesDisplay() {
             return catInfo.poolLength === poolLengthNum;
         })
         .map(([cat, time]) => {
-            const limitMs = timeToMs(time);
+            const limitMs = getStandard(pb || seasonBest, cat, time, gender).limitMs;
             const pbMs = pb?.timeMs;
             const seasonMs = seasonBest?.timeMs;
             
             // Calculate diffs
-            const pbDiffMs = (pbMs && limitMs) ? pbMs - limitMs : null;
-            const seasonDiffMs = (seasonMs && limitMs) ? seasonMs - limitMs : null;
+            const pbDiffMs = pb ? getStandard(pb, cat, time, gender).gapMs : null;
+            const seasonDiffMs = seasonBest ? getStandard(seasonBest, cat, time, gender).gapMs : null;
             
             // Determine qualification status
             // qualified: season time under limit
@@ -706,8 +762,8 @@ function updateProgressDisplay() {
         );
         
         // Calculate current FINA points (from PB)
-        const pbFinaPoints = calculateFinaPoints(pb.timeMs, gender, pb.poolLength, pb.stroke, pb.distance);
-        const seasonFinaPoints = seasonBest ? calculateFinaPoints(seasonBest.timeMs, gender, pb.poolLength, pb.stroke, pb.distance) : null;
+        const pbFinaPoints = getFinaPoints(pb, gender);
+        const seasonFinaPoints = seasonBest ? getFinaPoints(seasonBest, gender) : null;
         
         // Find qualifications and next targets
         let qualifiedSeason = []; // Qualified with season time
@@ -717,12 +773,13 @@ function updateProgressDisplay() {
         let smallestFinaGap = Infinity;
         
         Object.entries(standards).forEach(([cat, time]) => {
-            const limitMs = timeToMs(time);
-            const pbDiff = pb.timeMs - limitMs;
-            const seasonDiff = seasonBest ? seasonBest.timeMs - limitMs : null;
+            const standard = getStandard(pb, cat, time, gender);
+            const limitMs = standard.limitMs;
+            const pbDiff = standard.gapMs;
+            const seasonDiff = seasonBest ? getStandard(seasonBest, cat, time, gender).gapMs : null;
             
-            // Calculate FINA points for the target time
-            const targetFinaPoints = calculateFinaPoints(limitMs, gender, pb.poolLength, pb.stroke, pb.distance);
+            // FINA points for the target time
+            const targetFinaPoints = standard.finaPoints;
             const finaGap = targetFinaPoints && pbFinaPoints ? targetFinaPoints - pbFinaPoints : Infinity;
             
             if (seasonDiff !== null && seasonDiff <= 0) {
@@ -730,7 +787,7 @@ function updateProgressDisplay() {
                 qualifiedSeason.push({ cat, time, targetFinaPoints });
             } else if (pbDiff <= 0) {
                 // PB qualifies but not season time - need to redo
-                qualifiedPBOnly.push({ cat, time, targetFinaPoints, finaGap: seasonFinaPoints && targetFinaPoints ? targetFinaPoints - seasonFinaPoints : finaGap });
+                qualifiedPBOnly.push({ cat, time, limitMs, targetFinaPoints, finaGap: seasonFinaPoints && targetFinaPoints ? targetFinaPoints - seasonFinaPoints : finaGap });
             } else {
                 // PB doesn't qualify yet - add to objectives
                 notYetQualified.push({ cat, time, targetFinaPoints, finaGap: Math.round(finaGap), gap: pbDiff });
@@ -780,7 +837,7 @@ function updateProgressDisplay() {
     const pendingRedo = [];
     analysis.forEach(a => {
         a.qualifiedPBOnly.forEach(q => {
-            const limitMs = timeToMs(q.time);
+            const limitMs = q.limitMs;
             const pbDiff = a.timeMs - limitMs; // Diff between PB and limit (should be <= 0 since PB qualifies)
             const seasonDiff = a.seasonBest ? a.seasonBest.timeMs - limitMs : null;
             // FINA gap from PB to target (for sorting - always use PB-based gap)
@@ -977,7 +1034,8 @@ function initializePoolSelectors() {
 
 document.addEventListener('DOMContentLoaded', async () => {
     await loadTimeStandards();
-    await loadSwimmersSeasonData(); // Pre-load season data
+    // Pre-load index (season label); fichier saison complet seulement sans index
+    if (!await loadSwimmersIndex()) await loadSwimmersSeasonData();
     
     const savedProfile = localStorage.getItem('swimmer_profile');
     if (savedProfile) {
@@ -986,9 +1044,9 @@ document.addEventListener('DOMContentLoaded', async () => {
             document.getElementById('select-gender').value = swimmer.gender || 'Female';
             
             // Attach season bests if available
-            const seasonData = await loadSwimmersSeasonData();
-            if (seasonData?.swimmers?.[swimmer.id]) {
-                swimmer.seasonBests = seasonData.swimmers[swimmer.id].seasonBests || [];
+            const fresh = await fetchSwimmerData(swimmer.id).catch(() => null);
+            if (fresh) {
+                swimmer.seasonBests = fresh.seasonBests || [];
             }
         } catch (e) {
             console.error('Error loading profile:', e);
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Rattrapage des saisons passées: meilleurs temps de chaque saison (pbest=<année>) par athlète
+
+Chaque couple (athlète, saison) est une tâche; les tâches passent par un pool de
+--workers threads, la session HTTP espaçant les requêtes vers SwimRankings
+(--min-interval). Chaque tâche réussie est ajoutée au fichier de reprise (une ligne
+JSON par tâche): un rattrapage interrompu reprend là où il s'est arrêté.
+
+Sortie: un fichier par saison, au format de swimmers-season.json
+    seasons/2024.json, seasons/2025.json, ...
+    seasons/index.json: saisons disponibles (année, label, nombre de nageurs)
+Les athlètes déjà présents dans le fichier d'une saison ne sont pas re-téléchargés
+(sauf --refresh).
+
+Usage:
+    python backfill_seasons.py --from 2019 --ids-file athletes.txt
+    python backfill_seasons.py --from 2019 --to 2024 --store swimmers-history.db 5332548
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from swimrankings import (
+    SEASON_BESTS, add_common_arguments, build_output, collect_athlete_ids, fetch_record, get_season_label,
+    get_season_year, load_output, make_cache, make_session, report_run, select_shard, shard_metadata,
+    write_json,
+)
+from metrics import RunMetrics
+from parse_pool import make_parse_pool
+from results_store import make_store
+from standards import load_standards
+
+DEFAULT_OUTPUT_DIR = "seasons"
+CHECKPOINT_FILE = ".backfill-checkpoint.jsonl"
+INDEX_FILE = "index.json"
+
+
+def season_path(output_dir, season_year):
+    return os.path.join(output_dir, f"{season_year}.json")
+
+
+def load_checkpoint(path):
+    """Tâches terminées d'un rattrapage interrompu: {(athlete_id, saison): enregistrement}"""
+    done = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Dernière ligne tronquée par l'interruption
+                    continue
+                done[(entry["athleteId"], entry["season"])] = entry["record"]
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def run_jobs(jobs, job_fn, workers, on_done):
+    """Exécute job_fn(job) en parallèle et appelle on_done(job, résultat) au fil des fins de tâche
+    
+    Au plus 2 × workers tâches sont en attente à la fois: une interruption ne laisse
+    pas des milliers de tâches soumises. Une exception compte comme un résultat None.
+    """
+    jobs = iter(jobs)
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while True:
+            while len(pending) < 2 * max(1, workers):
+                job = next(jobs, None)
+                if job is None:
+                    break
+                pending[pool.submit(job_fn, job)] = job
+            if not pending:
+                return
+            
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"  Erreur {job}: {e}", file=sys.stderr)
+                    result = None
+                on_done(job, result)
+
+
+def write_index(output_dir):
+    """Liste des fichiers de saison présents dans output_dir"""
+    seasons = []
+    for name in sorted(os.listdir(output_dir)):
+        year = name[:-len(".json")]
+        if not (name.endswith(".json") and year.isdigit()):
+            continue
+        document = load_output(os.path.join(output_dir, name))
+        if document:
+            seasons.append({"year": int(year), "label": get_season_label(int(year)), "file": name,
+                            "count": len(document["swimmers"])})
+    write_json(os.path.join(output_dir, INDEX_FILE), {"seasons": seasons})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rattrape les meilleurs temps des saisons passées")
+    add_common_arguments(parser)
+    parser.add_argument("--from", dest="first", type=int, required=True,
+                        help="première saison (année de fin, ex: 2019 pour 2018-2019)")
+    parser.add_argument("--to", dest="last", type=int, default=None,
+                        help="dernière saison (défaut: saison précédant la saison courante)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help=f"répertoire des fichiers par saison (défaut: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("--checkpoint", default=None, metavar="FICHIER",
+                        help=f"fichier de reprise (défaut: <output-dir>/{CHECKPOINT_FILE})")
+    parser.add_argument("--minify", action="store_true", help="écrit les fichiers JSON sans indentation")
+    args = parser.parse_args()
+    
+    athlete_ids = collect_athlete_ids(args)
+    if not athlete_ids:
+        print("Usage: python backfill_seasons.py --from ANNÉE [--to ANNÉE] [--ids-file FICHIER] <athleteId> ...")
+        sys.exit(1)
+    athlete_ids = select_shard(athlete_ids, args)
+    
+    last = args.last or get_season_year() - 1
+    seasons = list(range(args.first, last + 1))
+    os.makedirs(args.output_dir, exist_ok=True)
+    checkpoint_path = args.checkpoint or os.path.join(args.output_dir, CHECKPOINT_FILE)
+    
+    # Enregistrements déjà disponibles: fichiers de saison existants puis fichier de reprise
+    records = {season_year: {} for season_year in seasons}
+    if not args.refresh:
+        for season_year in seasons:
+            document = load_output(season_path(args.output_dir, season_year))
+            if document:
+                records[season_year].update(document["swimmers"])
+    for (athlete_id, season_year), record in load_checkpoint(checkpoint_path).items():
+        if season_year in records:
+            records[season_year][athlete_id] = record
+    
+    # Saison la plus récente d'abord: les premières tâches sont les plus utiles
+    jobs = [(athlete_id, season_year) for season_year in reversed(seasons) for athlete_id in athlete_ids
+            if athlete_id not in records[season_year]]
+    total = len(athlete_ids) * len(seasons)
+    print(f"Saisons {get_season_label(seasons[0])} à {get_season_label(seasons[-1])}: "
+          f"{len(jobs)}/{total} tâches à faire", file=sys.stderr)
+    
+    session = make_session(args)
+    cache = make_cache(args)
+    metrics = RunMetrics()
+    store = make_store(args)
+    parse_pool = make_parse_pool(args)
+    failed = []
+    
+    def fetch(job):
+        athlete_id, season_year = job
+        return fetch_record(athlete_id, session, SEASON_BESTS, season_year, cache=cache, metrics=metrics,
+                            parse_pool=parse_pool)
+    
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        def on_done(job, record):
+            athlete_id, season_year = job
+            if record is None:
+                failed.append(job)
+                print(f"  ✗ {athlete_id} {get_season_label(season_year)}", file=sys.stderr)
+                return
+            records[season_year][athlete_id] = record
+            checkpoint.write(json.dumps({"athleteId": athlete_id, "season": season_year, "record": record},
+                                        ensure_ascii=False) + "\n")
+            checkpoint.flush()
+            if store:
+                store.add_record(record, SEASON_BESTS, f"{SEASON_BESTS}:{season_year}")
+            print(f"  ✓ {record['fullName']} {get_season_label(season_year)} - "
+                  f"{len(record[SEASON_BESTS])} temps", file=sys.stderr)
+        
+        try:
+            run_jobs(jobs, fetch, args.workers, on_done)
+        except KeyboardInterrupt:
+            print(f"Interrompu: relancer la même commande pour reprendre ({checkpoint_path})", file=sys.stderr)
+            sys.exit(130)
+        finally:
+            if parse_pool:
+                parse_pool.close()
+    
+    report_run(session, metrics, args)
+    if store:
+        store.close()
+    
+    standards = load_standards(args.standards)
+    for season_year in seasons:
+        # Ordre de la liste d'IDs, comme les autres fichiers publiés
+        swimmers = {athlete_id: records[season_year][athlete_id]
+                    for athlete_id in athlete_ids if athlete_id in records[season_year]}
+        if not swimmers:
+            continue
+        if standards:
+            standards.annotate_swimmers(swimmers, SEASON_BESTS)
+        document = build_output(swimmers, season_year, standards)
+        if args.shard:
+            document["_metadata"]["shard"] = shard_metadata(args, athlete_ids)
+        write_json(season_path(args.output_dir, season_year), document, args.minify)
+    write_index(args.output_dir)
+    
+    if failed:
+        # Le fichier de reprise est gardé: seules les tâches en erreur seront refaites
+        print(f"{len(failed)} tâches en erreur: relancer pour les reprendre", file=sys.stderr)
+        sys.exit(1)
+    os.remove(checkpoint_path)
+    print(f"Écrit {len(seasons)} saisons dans {args.output_dir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark hors ligne du parser sur le corpus de pages enregistrées (bench/corpus/)
+
+Pour chaque page du manifeste: parse la page comme fetch_record (texte transmis au
+parser par morceaux, profil repris de la page des records pour les pages de saison),
+vérifie que l'enregistrement obtenu est identique au JSON attendu (bench/corpus/golden/),
+puis mesure le débit (pages/s, Mo/s) et la mémoire maximale allouée pendant le parsing.
+
+Usage: python bench/bench_corpus.py [--repeat N] [--update-golden] [pages...]
+Code de sortie 1 si un résultat diffère du JSON attendu.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from swimrankings import CHUNK_SIZE, SwimRankingsParser, finish_athlete  # noqa: E402
+from record_corpus import CORPUS_DIR, load_manifest  # noqa: E402
+
+GOLDEN_DIR = os.path.join(CORPUS_DIR, "golden")
+
+# Champs qui varient d'un run à l'autre, exclus de la comparaison
+VOLATILE_FIELDS = ("lastUpdated",)
+
+
+def parse_page(html, entry, profile=None):
+    """Parse une page du corpus comme fetch_record (morceaux de CHUNK_SIZE caractères)"""
+    parser = SwimRankingsParser(entry["resultsKey"], parse_profile=profile is None)
+    for start in range(0, len(html), CHUNK_SIZE):
+        parser.feed(html[start:start + CHUNK_SIZE])
+    # finish_athlete affiche le nombre de temps: sans intérêt ici
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        data = finish_athlete(parser, entry["athleteId"], profile)
+    for field in VOLATILE_FIELDS:
+        data.pop(field, None)
+    return data
+
+
+def golden_path(entry):
+    return os.path.join(GOLDEN_DIR, f"{entry['name']}.json")
+
+
+def load_golden(entry):
+    try:
+        with open(golden_path(entry), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_golden(entry, data):
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    with open(golden_path(entry), "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, indent=2, ensure_ascii=False))
+        f.write("\n")
+
+
+def describe_difference(expected, actual):
+    """Première différence entre deux enregistrements, pour le message d'erreur"""
+    for key in sorted(set(expected) | set(actual)):
+        if expected.get(key) != actual.get(key):
+            if isinstance(expected.get(key), list) and isinstance(actual.get(key), list):
+                for i, (want, got) in enumerate(zip(expected[key], actual[key])):
+                    if want != got:
+                        return f"{key}[{i}]: attendu {want}, obtenu {got}"
+                return f"{key}: {len(expected[key])} éléments attendus, {len(actual[key])} obtenus"
+            return f"{key}: attendu {expected.get(key)!r}, obtenu {actual.get(key)!r}"
+    return "aucune"
+
+
+def bench_page(html, entry, profile, repeat):
+    """Meilleur temps de parsing sur `repeat` passes, puis pic mémoire sur une passe"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_page(html, entry, profile)
+        best = min(best, time.perf_counter() - start)
+    
+    tracemalloc.start()
+    parse_page(html, entry, profile)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne du parser sur le corpus enregistré")
+    parser.add_argument("pages", nargs="*", help="noms des pages à mesurer (défaut: tout le corpus)")
+    parser.add_argument("--repeat", type=int, default=5, help="répétitions par page (meilleur temps retenu)")
+    parser.add_argument("--update-golden", action="store_true",
+                        help="réécrit le JSON attendu à partir du parser actuel au lieu de le vérifier")
+    args = parser.parse_args()
+    
+    entries = load_manifest()["pages"]
+    if not entries:
+        print("Corpus vide: python bench/record_corpus.py synthetic", file=sys.stderr)
+        sys.exit(1)
+    by_name = {entry["name"]: entry for entry in entries}
+    selected = [by_name[name] for name in args.pages] if args.pages else entries
+    
+    failures = 0
+    total_bytes = total_time = 0.0
+    print(f"{'page':<22} {'Ko':>7} {'temps':>6} {'ms':>8} {'pages/s':>8} {'Mo/s':>6} {'pic Ko':>7}")
+    for entry in selected:
+        with open(os.path.join(CORPUS_DIR, entry["file"]), "rb") as f:
+            body = f.read()
+        html = body.decode("utf-8", errors="ignore")
+        
+        profile = None
+        if entry.get("profileFrom"):
+            source = by_name[entry["profileFrom"]]
+            with open(os.path.join(CORPUS_DIR, source["file"]), "rb") as f:
+                profile = parse_page(f.read().decode("utf-8", errors="ignore"), source)
+        
+        data = parse_page(html, entry, profile)
+        if args.update_golden:
+            write_golden(entry, data)
+        else:
+            expected = load_golden(entry)
+            if expected != data:
+                failures += 1
+                reason = "JSON attendu absent" if expected is None else describe_difference(expected, data)
+                print(f"  ✗ {entry['name']}: {reason}", file=sys.stderr)
+        
+        seconds, peak = bench_page(html, entry, profile, args.repeat)
+        total_bytes += len(body)
+        total_time += seconds
+        print(f"{entry['name']:<22} {len(body) / 1024:>7.1f} {len(data[entry['resultsKey']]):>6} "
+              f"{seconds * 1000:>8.2f} {1 / seconds:>8.0f} {len(body) / seconds / 1e6:>6.2f} {peak / 1024:>7.0f}")
+    
+    print(f"{'total':<22} {total_bytes / 1024:>7.1f} {'':>6} {total_time * 1000:>8.2f} "
+          f"{len(selected) / total_time:>8.0f} {total_bytes / total_time / 1e6:>6.2f}")
+    
+    if args.update_golden:
+        print(f"JSON attendu réécrit pour {len(selected)} pages dans {GOLDEN_DIR}", file=sys.stderr)
+    elif failures:
+        print(f"✗ {failures} page(s) différente(s) du JSON attendu", file=sys.stderr)
+        sys.exit(1)
+    else:
+        print(f"✓ {len(selected)} pages identiques au JSON attendu", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Débit du parsing en pool de processus (parse_pool.py) sur le corpus enregistré
+
+Parse chaque page du corpus --copies fois, d'abord dans des threads (le parsing
+garde le GIL), puis avec ParsePool pour chaque nombre de processus demandé, soumis
+depuis --threads threads comme le feraient les threads de téléchargement. Vérifie
+que chaque enregistrement est identique au JSON attendu (bench/corpus/golden/).
+
+Usage: python bench/bench_parse_pool.py [--copies N] [--threads N] [--processes 1 2 4]
+Code de sortie 1 si un résultat diffère du JSON attendu.
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_corpus import VOLATILE_FIELDS, load_golden  # noqa: E402
+from parse_pool import ParsePool, parse_body  # noqa: E402
+from record_corpus import CORPUS_DIR, load_manifest  # noqa: E402
+
+
+@contextlib.contextmanager
+def quiet_stderr():
+    """Sortie d'erreur vers /dev/null, processus du pool compris (finish_athlete affiche chaque page)"""
+    saved = os.dup(2)
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 2)
+    try:
+        yield
+    finally:
+        os.dup2(saved, 2)
+        os.close(saved)
+
+
+def load_jobs(copies):
+    """[(entrée du manifeste, corps, profil)] × copies; profil pris dans le JSON attendu"""
+    entries = load_manifest()["pages"]
+    by_name = {entry["name"]: entry for entry in entries}
+    jobs = []
+    for entry in entries:
+        with open(os.path.join(CORPUS_DIR, entry["file"]), "rb") as f:
+            body = f.read()
+        profile = load_golden(by_name[entry["profileFrom"]]) if entry.get("profileFrom") else None
+        jobs.append((entry, body, profile))
+    return jobs * copies
+
+
+def run(jobs, threads, parse):
+    """Parse les pages depuis `threads` threads; retourne (secondes, enregistrements dans l'ordre)"""
+    def job_fn(job):
+        entry, body, profile = job
+        data, _ = parse(body, entry["athleteId"], entry["resultsKey"], profile)
+        return data
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        records = list(pool.map(job_fn, jobs))
+    return time.perf_counter() - start, records
+
+
+def check(jobs, records):
+    failures = 0
+    for (entry, _, _), data in zip(jobs, records):
+        for field in VOLATILE_FIELDS:
+            data.pop(field, None)
+        if data != load_golden(entry):
+            failures += 1
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit du parsing en pool de processus sur le corpus")
+    parser.add_argument("--copies", type=int, default=20, help="passes sur le corpus (défaut: 20)")
+    parser.add_argument("--threads", type=int, default=8, help="threads qui soumettent les pages (défaut: 8)")
+    parser.add_argument("--processes", type=int, nargs="+", default=None,
+                        help="nombres de processus à mesurer (défaut: 1, 2, 4 ... jusqu'au nombre de cœurs)")
+    args = parser.parse_args()
+    
+    jobs = load_jobs(args.copies)
+    if not jobs:
+        print("Corpus vide: python bench/record_corpus.py synthetic", file=sys.stderr)
+        sys.exit(1)
+    cores = os.cpu_count() or 1
+    counts = args.processes or sorted({1, *[n for n in (2, 4, 8, 16) if n <= cores], cores})
+    
+    failures = 0
+    print(f"{len(jobs)} pages, {args.threads} threads, {cores} cœurs")
+    print(f"{'parsing':<22} {'s':>7} {'pages/s':>8} {'gain':>6}")
+    with quiet_stderr():
+        baseline, records = run(jobs, args.threads, parse_body)
+    failures += check(jobs, records)
+    print(f"{'threads (GIL)':<22} {baseline:>7.2f} {len(jobs) / baseline:>8.0f} {1:>5.2f}x")
+    
+    for processes in counts:
+        with quiet_stderr(), ParsePool(processes) as pool:
+            # Démarrage des processus hors mesure
+            run(jobs[:processes], processes, pool.parse)
+            seconds, records = run(jobs, args.threads, pool.parse)
+        failures += check(jobs, records)
+        print(f"{f'{processes} processus':<22} {seconds:>7.2f} {len(jobs) / seconds:>8.0f} {baseline / seconds:>5.2f}x")
+    
+    if failures:
+        print(f"✗ {failures} enregistrement(s) différent(s) du JSON attendu", file=sys.stderr)
+        sys.exit(1)
+    print("✓ enregistrements identiques au JSON attendu", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark du SwimRankingsParser sur des pages à longue historique
+
+Compare le parser actuel au parser d'origine (legacy_parser.py, copie d'avant l'index
+par épreuve et les regex précompilées) sur des pages de taille croissante, et vérifie
+que les deux relèvent les mêmes temps (code de sortie 1 sinon).
+
+Mesure seulement, sans gain de vitesse revendiqué: la tokenisation de html.parser domine
+et le parser actuel relève aussi date, lieu et styleId de chaque temps. Les écarts
+mesurés (colonne min-max) restent de l'ordre du bruit, quelle que soit la taille de page.
+
+Usage: python bench/bench_parser.py [--repeat N] [--rows 36 200 1000 5000]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from swimrankings import SwimRankingsParser  # noqa: E402
+from legacy_parser import SwimRankingsParser as LegacyParser  # noqa: E402
+from synthetic import generate_page  # noqa: E402
+
+# Champs relevés par les deux parsers
+COMMON_FIELDS = ("stroke", "distance", "poolLength", "timeMs", "timeDisplay")
+
+
+def bench(parser_class, html, repeat):
+    """Durées de `repeat` parsings complets; retourne (durées, temps relevés)"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser = parser_class()
+        parser.feed(html)
+        parser.close()
+        durations.append(time.perf_counter() - start)
+    results = [tuple(result.get(field) for field in COMMON_FIELDS) for result in parser.data["personalBests"]]
+    return durations, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark du parser SwimRankings")
+    parser.add_argument("--repeat", type=int, default=9, help="répétitions par mesure (défaut: 9)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[36, 200, 1000, 5000],
+                        help="nombre de lignes de temps par page")
+    args = parser.parse_args()
+    
+    print(f"{'lignes':>8} {'Ko':>8} {'origine ms':>11} {'actuel ms':>10} {'ratio':>6} {'min-max':>12}")
+    for rows in args.rows:
+        html = generate_page(rows, seed=rows)
+        legacy, expected = bench(LegacyParser, html, args.repeat)
+        current, results = bench(SwimRankingsParser, html, args.repeat)
+        
+        if results != expected:
+            print(f"  ✗ résultats différents pour {rows} lignes", file=sys.stderr)
+            sys.exit(1)
+        
+        # Ratio des médianes, et plage des ratios meilleur/pire cas pour juger du bruit
+        legacy_ms = statistics.median(legacy) * 1000
+        current_ms = statistics.median(current) * 1000
+        spread = f"{min(legacy) / max(current):.2f}-{max(legacy) / min(current):.2f}"
+        print(f"{rows:>8} {len(html) / 1024:>8.1f} {legacy_ms:>11.2f} {current_ms:>10.2f} "
+              f"{legacy_ms / current_ms:>5.2f}x {spread:>12}")
+
+
+if __name__ == "__main__":
+    main()
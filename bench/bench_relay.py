@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la composition des relais (relay_optimizer) sur des effectifs synthétiques
+
+1. Vérification: sur de petits effectifs aléatoires, les k meilleures compositions
+   (temps totaux) sont comparées à l'énumération de toutes les compositions possibles.
+   Code de sortie 1 en cas d'écart.
+2. Durée de optimize_relays (2 sexes × 2 bassins × 4 relais) selon la taille de l'effectif.
+
+Usage: python bench/bench_relay.py [--top K] [--checks N] [--swimmers 100 500 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from itertools import combinations, product
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from relay_optimizer import GENDERS, POOLS, RELAYS, best_lineups, optimize_relays, relay_candidates  # noqa: E402
+from synthetic import generate_roster  # noqa: E402
+
+
+def brute_force_totals(legs, top):
+    """Temps totaux des `top` meilleures compositions, par énumération complète"""
+    if all(candidates == legs[0] for candidates in legs):
+        lineups = combinations(legs[0], len(legs))
+    else:
+        lineups = (lineup for lineup in product(*legs) if len({athlete_id for _, athlete_id in lineup}) == len(legs))
+    return sorted(sum(time_ms for time_ms, _ in lineup) for lineup in lineups)[:top]
+
+
+def check(checks, top, seed):
+    """Compare best_lineups à l'énumération sur `checks` effectifs de 6 à 16 nageurs"""
+    rng = random.Random(seed)
+    failures = 0
+    for i in range(checks):
+        swimmers = generate_roster(rng.randrange(6, 17), seed=seed + i)
+        for gender in GENDERS:
+            for pool in POOLS:
+                candidates = relay_candidates(swimmers, gender=gender, pool=pool)
+                for relay, (distance, strokes) in RELAYS.items():
+                    legs = [candidates.get((distance, stroke), []) for stroke in strokes]
+                    lineups = best_lineups(legs, top)
+                    expected = brute_force_totals(legs, top)
+                    totals = [total for total, _ in lineups]
+                    distinct = all(len({athlete_id for _, athlete_id in lineup}) == len(lineup)
+                                   for _, lineup in lineups)
+                    if totals != expected or not distinct:
+                        failures += 1
+                        print(f"  ✗ effectif {i} {gender} {pool}m {relay}: {totals} au lieu de {expected}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark et vérification de la composition des relais")
+    parser.add_argument("--top", type=int, default=5, help="compositions par relais (défaut: 5)")
+    parser.add_argument("--checks", type=int, default=200, help="effectifs vérifiés par énumération (défaut: 200)")
+    parser.add_argument("--swimmers", type=int, nargs="+", default=[100, 500, 2000],
+                        help="tailles d'effectif à mesurer")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    
+    failures = check(args.checks, args.top, args.seed)
+    print(f"{'✗' if failures else '✓'} {args.checks} effectifs vérifiés par énumération, {failures} écarts")
+    
+    print(f"{'nageurs':>8} {'relais':>7} {'ms':>8} {'énumération (4 nages 4x100, 1 sexe/bassin)':>44}")
+    for count in args.swimmers:
+        swimmers = generate_roster(count, seed=args.seed)
+        start = time.perf_counter()
+        results = optimize_relays(swimmers, top=args.top)
+        elapsed = time.perf_counter() - start
+        # Taille de l'espace qu'une énumération parcourrait: produit des candidats par parcours
+        candidates = relay_candidates(swimmers, gender="Female", pool=50)
+        space = 1
+        for stroke in RELAYS["4x100_Medley"][1]:
+            space *= len(candidates.get((100, stroke), []))
+        print(f"{count:>8} {len(results):>7} {elapsed * 1000:>8.2f} {space:>44,} compositions")
+    
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
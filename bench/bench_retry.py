@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Vérification des relances et du disjoncteur de HttpSession contre un serveur local
+
+Démarre un http.server sur 127.0.0.1 (port libre) dont chaque chemin répond selon un
+scénario (503 avec ou sans Retry-After, puis 200), et vérifie:
+- relances sur 503: nombre de tentatives (Response.attempts, requêtes reçues, session.retries)
+- Retry-After respecté (délai mesuré côté serveur) et plafonné à max_delay
+- dernière réponse retournée quand les relances sont épuisées
+- disjoncteur: ouverture, pause, CircuitOpenError après max_trips ouvertures consécutives
+  (sans requête envoyée), puis remise à zéro après un succès
+
+Usage: python bench/bench_retry.py
+Code de sortie 1 si une vérification échoue.
+"""
+
+import contextlib
+import email.utils
+import http.server
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_session import CircuitBreaker, CircuitOpenError, HttpSession, RetryPolicy, parse_retry_after  # noqa: E402
+
+
+class ScenarioHandler(http.server.BaseHTTPRequestHandler):
+    """Répond selon server.scenarios[chemin]: [(statut, Retry-After ou None)], le dernier se répète"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits.setdefault(self.path, []).append(time.monotonic())
+            steps = server.scenarios[self.path]
+            status, retry_after = steps.pop(0) if len(steps) > 1 else steps[0]
+        body = b"ok" if status == 200 else b""
+        self.send_response(status)
+        if retry_after is not None:
+            self.send_header("Retry-After", retry_after)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ScenarioHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.scenarios = {}
+    server.hits = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_session(retries=3, max_delay=5.0, breaker=None):
+    """Session sans limite de débit, backoff court (les délais mesurés sont ceux de Retry-After)"""
+    return HttpSession(min_interval=0, retry_policy=RetryPolicy(retries, base_delay=0.01, max_delay=max_delay),
+                       circuit_breaker=breaker or CircuitBreaker(window=1000))
+
+
+class Checks:
+    """Affiche chaque vérification (✓ / ✗) et compte les échecs"""
+    
+    def __init__(self):
+        self.failures = 0
+    
+    def expect(self, condition, message):
+        print(f"  {'✓' if condition else '✗'} {message}", file=sys.stderr)
+        if not condition:
+            self.failures += 1
+
+
+def get(session, url):
+    """(statut, tentatives) d'une requête, ou (nom de l'exception, 0)"""
+    # Les relances et l'ouverture du disjoncteur sont affichées sur stderr: masquées ici
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        try:
+            with session.get(url) as response:
+                response.read()
+                return response.status, response.attempts
+        except CircuitOpenError as e:
+            return type(e).__name__, 0
+
+
+def check_retry_after(server, base, checks):
+    print("Retry-After", file=sys.stderr)
+    server.scenarios["/retry-after"] = [(503, "1"), (503, "1"), (200, None)]
+    session = make_session(retries=3)
+    status, attempts = get(session, base + "/retry-after")
+    hits = server.hits["/retry-after"]
+    gaps = [later - earlier for earlier, later in zip(hits, hits[1:])]
+    checks.expect(status == 200 and attempts == 3, f"200 à la 3e tentative (statut {status}, {attempts} tentatives)")
+    checks.expect(len(hits) == 3 and session.retries == 2, f"{len(hits)} requêtes reçues, {session.retries} relances")
+    checks.expect(all(0.95 <= gap < 2.0 for gap in gaps),
+                  f"délais de Retry-After (1s): {', '.join(f'{gap:.2f}s' for gap in gaps)}")
+    
+    server.scenarios["/retry-after-capped"] = [(503, "30"), (200, None)]
+    started = time.monotonic()
+    status, attempts = get(make_session(retries=1, max_delay=0.2), base + "/retry-after-capped")
+    elapsed = time.monotonic() - started
+    checks.expect(status == 200 and elapsed < 1.0, f"Retry-After: 30 plafonné à max_delay=0.2s ({elapsed:.2f}s)")
+    
+    # Date HTTP à la seconde près: 5 s après `now`
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    seconds = parse_retry_after(email.utils.format_datetime(now + timedelta(seconds=5), usegmt=True), now=now)
+    checks.expect(seconds == 5, f"Retry-After en date HTTP 5s plus tard: {seconds}")
+
+
+def check_exhausted(server, base, checks):
+    print("Relances épuisées", file=sys.stderr)
+    server.scenarios["/down"] = [(503, None)]
+    session = make_session(retries=2)
+    status, attempts = get(session, base + "/down")
+    hits = len(server.hits["/down"])
+    checks.expect(status == 503 and attempts == 3 and hits == 3,
+                  f"dernière réponse 503 après 3 tentatives ({attempts} tentatives, {hits} requêtes reçues)")
+
+
+def check_circuit_breaker(server, base, checks):
+    print("Disjoncteur", file=sys.stderr)
+    pause = 0.3
+    server.scenarios["/breaker"] = [(503, None)]
+    breaker = CircuitBreaker(threshold=0.5, window=4, pause=pause, max_trips=2)
+    session = make_session(retries=0, breaker=breaker)
+    for _ in range(4):
+        get(session, base + "/breaker")
+    checks.expect(breaker.trips == 1, f"ouvert après 4 échecs sur 4 ({breaker.trips} ouverture)")
+    
+    started = time.monotonic()
+    get(session, base + "/breaker")
+    waited = time.monotonic() - started
+    checks.expect(waited >= pause * 0.9, f"requête suivante retenue pendant la pause ({waited:.2f}s >= {pause}s)")
+    for _ in range(3):
+        get(session, base + "/breaker")
+    hits = len(server.hits["/breaker"])
+    status, _ = get(session, base + "/breaker")
+    checks.expect(breaker.trips == 2 and status == "CircuitOpenError",
+                  f"CircuitOpenError après 2 ouvertures consécutives ({status})")
+    checks.expect(len(server.hits["/breaker"]) == hits, "aucune requête envoyée une fois le disjoncteur coupé")
+    
+    # Reprise: après la pause, un succès remet à zéro le compte des ouvertures consécutives
+    server.scenarios["/recover"] = [(503, None)] * 4 + [(200, None)]
+    breaker = CircuitBreaker(threshold=0.5, window=4, pause=pause, max_trips=2)
+    session = make_session(retries=0, breaker=breaker)
+    for _ in range(4):
+        get(session, base + "/recover")
+    statuses = [get(session, base + "/recover")[0] for _ in range(5)]
+    checks.expect(breaker.trips == 1 and statuses == [200] * 5,
+                  f"refermé après la pause: {statuses} ({breaker.trips} ouverture)")
+    server.scenarios["/recover"] = [(503, None)] * 4 + [(200, None)]
+    for _ in range(4):
+        get(session, base + "/recover")
+    status, _ = get(session, base + "/recover")
+    checks.expect(breaker.trips == 2 and status == 200,
+                  f"nouvelle ouverture après un succès: pas d'abandon ({status}, {breaker.trips} ouvertures)")
+
+
+def main():
+    server = start_server()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    checks = Checks()
+    try:
+        check_retry_after(server, base, checks)
+        check_exhausted(server, base, checks)
+        check_circuit_breaker(server, base, checks)
+    finally:
+        server.shutdown()
+    
+    if checks.failures:
+        print(f"✗ {checks.failures} vérification(s) en échec", file=sys.stderr)
+        sys.exit(1)
+    print("✓ relances, Retry-After et disjoncteur conformes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
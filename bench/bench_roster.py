@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark du moteur vectorisé (roster_engine) sur des effectifs synthétiques
+
+Compare Roster.evaluate (une passe NumPy sur tout l'effectif) à l'annotation
+résultat par résultat de standards.Standards, et vérifie que les points FINA et
+les écarts aux temps limites sont identiques.
+
+Usage: python bench/bench_roster.py [--repeat N] [--swimmers 100 500 2000]
+"""
+
+import argparse
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from roster_engine import CATEGORY_INDEX, EVENT_INDEX, POOL_INDEX, Roster  # noqa: E402
+from standards import load_standards  # noqa: E402
+from swimrankings import PERSONAL_BESTS  # noqa: E402
+from synthetic import generate_roster  # noqa: E402
+
+
+def best_of(repeat, function):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check(roster, annotated):
+    """Compare les tableaux du moteur aux annotations de Standards; retourne le nombre d'écarts"""
+    result = roster.evaluate()
+    mismatches = 0
+    for a, athlete_id in enumerate(roster.ids):
+        for item in annotated[athlete_id][PERSONAL_BESTS]:
+            e = EVENT_INDEX[f"{item['distance']}_{item['stroke']}"]
+            p = POOL_INDEX[item["poolLength"]]
+            mismatches += int(result["points"][a, e, p]) != (item["finaPoints"] or 0)
+            for category, standard in item["standards"].items():
+                c = CATEGORY_INDEX[category]
+                mismatches += int(result["gaps"][a, c, e, p]) != standard["gapMs"]
+                mismatches += bool(result["qualified"][a, c, e, p]) != (standard["gapMs"] <= 0)
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du moteur vectorisé de l'effectif")
+    parser.add_argument("--repeat", type=int, default=5, help="répétitions par mesure (meilleur temps retenu)")
+    parser.add_argument("--swimmers", type=int, nargs="+", default=[100, 500, 2000],
+                        help="tailles d'effectif à mesurer")
+    args = parser.parse_args()
+    
+    standards = load_standards()
+    if standards is None:
+        sys.exit(1)
+    
+    print(f"{'nageurs':>8} {'temps':>7} {'annotate (ms)':>14} {'numpy (ms)':>11} {'gain':>6}")
+    failed = False
+    for count in args.swimmers:
+        swimmers = generate_roster(count)
+        times = sum(len(record[PERSONAL_BESTS]) for record in swimmers.values())
+        roster = Roster(swimmers, {}, standards)
+        
+        annotated = copy.deepcopy(swimmers)
+        standards.annotate_swimmers(annotated, PERSONAL_BESTS)
+        mismatches = check(roster, annotated)
+        failed = failed or mismatches > 0
+        
+        # L'annotation modifie les résultats en place: mesurée sur une copie fraîche à chaque passe
+        copies = [copy.deepcopy(swimmers) for _ in range(args.repeat)]
+        scalar = best_of(args.repeat, lambda: standards.annotate_swimmers(copies.pop(), PERSONAL_BESTS))
+        vectorized = best_of(args.repeat, roster.evaluate)
+        
+        status = "" if not mismatches else f"  ✗ {mismatches} écarts"
+        print(f"{count:>8} {times:>7} {scalar * 1000:>14.2f} {vectorized * 1000:>11.2f} "
+              f"{scalar / vectorized:>5.1f}x{status}")
+    
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
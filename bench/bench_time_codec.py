@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Vérification aléatoire et débit du module time_codec
+
+1. Fuzz: aller-retour ms → texte → ms sur des temps aléatoires, formats acceptés
+   (zéros en tête, virgule), et rejet de temps altérés (caractère parasite, chiffre
+   manquant, secondes >= 60); find_time doit trouver le même temps que l'ancienne
+   regex. Code de sortie 1 en cas d'écart.
+2. Débit (temps/s): parse_time, find_time et parse_times comparés aux anciennes
+   conversions (split/int de SwimRankingsParser.parse_time, regex par cellule).
+
+Usage: python bench/bench_time_codec.py [--count N] [--seed S] [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from time_codec import find_time, format_time, parse_time, parse_times, try_parse_time  # noqa: E402
+
+OLD_TIME_RE = re.compile(r"(?:(\d{1,2}):)?(\d{2})\.(\d{2})")
+
+
+def old_split_parse(time_str):
+    """Ancien SwimRankingsParser.parse_time (split/int)"""
+    clean = time_str.replace(",", ".").strip()
+    if ":" in clean:
+        parts = clean.split(":")
+        sec_parts = parts[1].split(".")
+        return (int(parts[0]) * 60 + int(sec_parts[0])) * 1000 + int(sec_parts[1]) * 10
+    parts = clean.split(".")
+    return int(parts[0]) * 1000 + int(parts[1]) * 10
+
+
+def old_find_time(cell):
+    """Ancienne recherche d'un temps dans une cellule (regex seule)"""
+    match = OLD_TIME_RE.search(cell)
+    if match is None:
+        return None
+    minutes, seconds, centis = match.groups()
+    return (int(minutes or 0) * 60 + int(seconds)) * 1000 + int(centis) * 10, match.group(0)
+
+
+def old_regex_parse(cell):
+    """Ancienne conversion des cellules: regex recompilée par le moteur à chaque recherche"""
+    minutes, seconds, centis = re.search(r"(?:(\d{1,2}):)?(\d{2})\.(\d{2})", cell).groups()
+    return (int(minutes or 0) * 60 + int(seconds)) * 1000 + int(centis) * 10
+
+
+def random_ms(rng):
+    # 20 s à 20 min, au centième
+    return rng.randrange(2000, 120000) * 10
+
+
+def variants(ms):
+    """Écritures acceptées d'un même temps"""
+    centis = ms // 10
+    seconds, cc = divmod(centis, 100)
+    minutes, ss = divmod(seconds, 60)
+    texts = [format_time(ms), f"{minutes:02d}:{ss:02d}.{cc:02d}", f"{minutes}:{ss:02d},{cc:02d}",
+             f"  {minutes}:{ss:02d}.{cc:02d} "]
+    if not minutes and ss < 100:
+        texts.append(f"{ss}.{cc:02d}")
+    return texts
+
+
+def corrupt(text, rng):
+    """Altération qui rend le temps invalide"""
+    kind = rng.randrange(3)
+    if kind == 0:
+        position = rng.randrange(len(text) + 1)
+        return text[:position] + rng.choice("ab-+x/;'é") + text[position:]
+    if kind == 1:
+        return text[:-1]
+    minutes = text.partition(":")[0] if ":" in text else "1"
+    return f"{minutes}:{rng.randrange(60, 100)}.{rng.randrange(100):02d}"
+
+
+def fuzz(count, seed):
+    rng = random.Random(seed)
+    failures = []
+    for _ in range(count):
+        ms = random_ms(rng)
+        for text in variants(ms):
+            if parse_time(text) != ms:
+                failures.append(f"parse_time({text!r}) = {parse_time(text)}, attendu {ms}")
+        display = format_time(ms)
+        if find_time(f"<{display}>") != (ms, display):
+            failures.append(f"find_time({display!r}) = {find_time(display)}")
+        bad = corrupt(format_time(ms), rng)
+        if try_parse_time(bad) is not None:
+            failures.append(f"parse_time({bad!r}) accepté: {try_parse_time(bad)}")
+        # find_time doit trouver exactement ce que trouvait la regex, cellule valide ou non
+        for cell in (display, bad, f" {bad} "):
+            if find_time(cell) != old_find_time(cell):
+                failures.append(f"find_time({cell!r}) = {find_time(cell)}, regex: {old_find_time(cell)}")
+    for bad in ("", "   ", "1:04", "1:04.8", ":04.85", "1::04.85", "1:4.85", "104.85", "1:04.85.1", "١:٠٤.٨٥"):
+        if try_parse_time(bad) is not None:
+            failures.append(f"parse_time({bad!r}) accepté")
+    return failures
+
+
+def throughput(label, function, values, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(values)
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<34} {len(values) / best / 1e6:>6.2f} M temps/s")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzz et débit du module time_codec")
+    parser.add_argument("--count", type=int, default=20000, help="temps aléatoires pour le fuzz (défaut: 20000)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5, help="répétitions par mesure (meilleur temps retenu)")
+    args = parser.parse_args()
+    
+    failures = fuzz(args.count, args.seed)
+    for failure in failures[:20]:
+        print(f"  ✗ {failure}")
+    print(f"{'✗' if failures else '✓'} fuzz: {args.count} temps, {len(failures)} écarts")
+    
+    rng = random.Random(args.seed)
+    values = [format_time(random_ms(rng)) for _ in range(200000)]
+    print(f"Débit sur {len(values)} temps:")
+    baseline = throughput("ancien split/int", lambda vs: [old_split_parse(v) for v in vs], values, args.repeat)
+    throughput("ancienne regex par cellule", lambda vs: [old_regex_parse(v) for v in vs], values, args.repeat)
+    throughput("find_time (cellules)", lambda vs: [find_time(v) for v in vs], values, args.repeat)
+    best = throughput("parse_time (validé)", lambda vs: [parse_time(v) for v in vs], values, args.repeat)
+    throughput("parse_times (lot)", parse_times, values, args.repeat)
+    ms_values = parse_times(values)
+    throughput("format_time", lambda vs: [format_time(ms) for ms in vs], ms_values, args.repeat)
+    print(f"parse_time / ancien split: {baseline / best:.2f}x")
+    
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Constitue le corpus de pages athlète utilisé par bench/bench_corpus.py
+
+Les pages sont enregistrées dans bench/corpus/ et décrites dans bench/corpus/manifest.json
+(type de page, ID, page de records fournissant le profil pour les pages de saison).
+
+Usage:
+    python bench/record_corpus.py synthetic
+        régénère les pages synthétiques (records et saison, historiques courts et longs, F/M)
+    python bench/record_corpus.py record <nom> <athleteId> [--season ANNÉE] [--profile-from <nom>]
+        télécharge une page réelle depuis SwimRankings et l'ajoute au manifeste
+
+Après modification du corpus: python bench/bench_corpus.py --update-golden
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from swimrankings import PERSONAL_BESTS, SEASON_BESTS, athlete_url, fetch_page  # noqa: E402
+from synthetic import generate_page  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+MANIFEST = os.path.join(CORPUS_DIR, "manifest.json")
+
+# (nom, sexe, lignes, type de page, nom, année de naissance, club)
+SYNTHETIC_PAGES = [
+    ("female-pb-short", "Female", 10, PERSONAL_BESTS, "HEHLEN, Ava", 2013, "Lausanne Aquatique"),
+    ("female-pb-long", "Female", 400, PERSONAL_BESTS, "MÜLLER, Léa", 2008, "Genève Natation 1885"),
+    ("female-season-short", "Female", 6, SEASON_BESTS, "HEHLEN, Ava", 2013, "Lausanne Aquatique"),
+    ("female-season-long", "Female", 120, SEASON_BESTS, "MÜLLER, Léa", 2008, "Genève Natation 1885"),
+    ("male-pb-short", "Male", 12, PERSONAL_BESTS, "DUPONT, Noé", 2012, "Red-Fish Neuchâtel"),
+    ("male-pb-long", "Male", 400, PERSONAL_BESTS, "ROSSI, Matteo", 2006, "Nuoto Lugano"),
+    ("male-season-short", "Male", 8, SEASON_BESTS, "DUPONT, Noé", 2012, "Red-Fish Neuchâtel"),
+    ("male-season-long", "Male", 120, SEASON_BESTS, "ROSSI, Matteo", 2006, "Nuoto Lugano"),
+]
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"pages": []}
+
+
+def save_manifest(manifest):
+    manifest["pages"].sort(key=lambda page: page["name"])
+    with open(MANIFEST, "w", encoding="utf-8") as f:
+        f.write(json.dumps(manifest, indent=2, ensure_ascii=False))
+        f.write("\n")
+
+
+def add_page(manifest, entry, body):
+    """Écrit la page et remplace l'entrée de même nom dans le manifeste"""
+    with open(os.path.join(CORPUS_DIR, entry["file"]), "wb") as f:
+        f.write(body)
+    manifest["pages"] = [page for page in manifest["pages"] if page["name"] != entry["name"]]
+    manifest["pages"].append(entry)
+
+
+def record_synthetic(manifest):
+    for seed, (name, gender, rows, results_key, full_name, year, club) in enumerate(SYNTHETIC_PAGES):
+        html = generate_page(rows, gender, seed=seed, name=full_name, year_of_birth=year, club=club, chrome=True)
+        entry = {
+            "name": name,
+            "file": f"{name}.html",
+            "athleteId": str(9000000 + seed),
+            "resultsKey": results_key,
+            "source": "synthetic",
+        }
+        if results_key == SEASON_BESTS:
+            # Comme update_swimmers.py: le profil vient de la page des records
+            entry["profileFrom"] = name.replace("-season-", "-pb-")
+        add_page(manifest, entry, html.encode("utf-8"))
+        print(f"  {name}: {rows} lignes, {len(html) / 1024:.1f} Ko", file=sys.stderr)
+
+
+def record_live(manifest, name, athlete_id, season_year=None, profile_from=None):
+    url = athlete_url(athlete_id, season_year)
+    page = fetch_page(url)
+    if page is None:
+        sys.exit(1)
+    
+    entry = {
+        "name": name,
+        "file": f"{name}.html",
+        "athleteId": athlete_id,
+        "resultsKey": SEASON_BESTS if season_year else PERSONAL_BESTS,
+        "source": url,
+    }
+    if profile_from:
+        entry["profileFrom"] = profile_from
+    add_page(manifest, entry, page.body)
+    print(f"  {name}: {len(page.body) / 1024:.1f} Ko depuis {url}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Constitue le corpus de pages du benchmark hors ligne")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("synthetic", help="régénère les pages synthétiques")
+    record = commands.add_parser("record", help="enregistre une page réelle de SwimRankings")
+    record.add_argument("name", help="nom de la page dans le corpus (ex: female-pb-long)")
+    record.add_argument("athlete_id", help="ID SwimRankings de l'athlète")
+    record.add_argument("--season", type=int, help="page des meilleurs temps de la saison (pbest=ANNÉE)")
+    record.add_argument("--profile-from", help="page de records du corpus fournissant le profil")
+    args = parser.parse_args()
+    
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    manifest = load_manifest()
+    if args.command == "synthetic":
+        record_synthetic(manifest)
+    else:
+        record_live(manifest, args.name, args.athlete_id, args.season, args.profile_from)
+    save_manifest(manifest)
+    print("Pensez à régénérer les résultats attendus: python bench/bench_corpus.py --update-golden",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
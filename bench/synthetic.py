@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Génère des pages athlète SwimRankings synthétiques (même structure HTML que le site)
+Utilisé par les benchmarks pour mesurer le parser sans accéder au site.
+generate_roster: effectif déjà parsé (format de swimmers-data.json) pour les calculs sur l'effectif.
+"""
+
+import random
+
+from standards import FINA_BASE_TIMES
+from swimrankings import PERSONAL_BESTS
+
+EVENTS = [
+    (50, "Freestyle"), (100, "Freestyle"), (200, "Freestyle"), (400, "Freestyle"),
+    (800, "Freestyle"), (1500, "Freestyle"), (50, "Backstroke"), (100, "Backstroke"),
+    (200, "Backstroke"), (50, "Breaststroke"), (100, "Breaststroke"), (200, "Breaststroke"),
+    (50, "Butterfly"), (100, "Butterfly"), (200, "Butterfly"), (100, "Medley"),
+    (200, "Medley"), (400, "Medley"),
+]
+
+# Secondes approximatives par 50m selon le nage
+PACE = {"Freestyle": 31, "Backstroke": 36, "Breaststroke": 40, "Butterfly": 34, "Medley": 37}
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+CITIES = ["Lausanne", "Genève", "Bern", "Zürich", "Basel", "Sion", "Neuchâtel", "Lugano"]
+
+
+def format_time(centis):
+    minutes, rest = divmod(centis, 6000)
+    seconds, hundredths = divmod(rest, 100)
+    if minutes:
+        return f"{minutes}:{seconds:02d}.{hundredths:02d}"
+    return f"{seconds:02d}.{hundredths:02d}"
+
+
+def page_chrome(rng):
+    """En-tête, scripts et menus entourant le contenu sur le site (poids réaliste des pages)"""
+    
+    head = [
+        '<meta http-equiv="Content-Type" content="text/html; charset=utf-8">\n',
+        '<link rel="stylesheet" type="text/css" href="/css/swimrankings.css">\n',
+        '<script type="text/javascript" src="/js/swimrankings.js"></script>\n',
+        '<script type="text/javascript">\n<!--\nfunction openMenu(id) { var m = document.getElementById(id);'
+        ' if (m) { m.style.display = (m.style.display == "none") ? "block" : "none"; } }\n//-->\n</script>\n',
+    ]
+    nav = ['<table class="navigation"><tr>']
+    for i in range(40):
+        nav.append(f'<td class="navItem"><a href="index.php?page=menu&amp;item={i}" '
+                   f'onmouseover="openMenu(\'m{i}\')">Menu {i}</a></td>')
+        if i % 8 == 7:
+            nav.append("</tr>\n<tr>")
+    nav.append("</tr></table>\n<!-- navigation -->\n")
+    footer = ['<div id="footer"><!-- footer -->']
+    for city in rng.sample(CITIES, len(CITIES)):
+        footer.append(f'<a href="index.php?page=meetSelect&amp;city={city}">{city}</a> | ')
+    footer.append("&copy; swimrankings.net</div>\n")
+    return "".join(head), "".join(nav), "".join(footer)
+
+
+def generate_page(rows, gender="Female", seed=0, name="HEHLEN, Ava", year_of_birth=2010,
+                  club="Lausanne Aquatique", chrome=False):
+    """Page athlète avec `rows` lignes de temps (les épreuves se répètent au-delà de 36 lignes)
+    
+    chrome: ajoute en-tête, scripts, menus et pied de page comme sur le site
+    """
+    
+    rng = random.Random(seed)
+    gender_icon = "gender2.png" if gender == "Female" else "gender1.png"
+    head, nav, footer = page_chrome(rng) if chrome else ("", "", "")
+    
+    parts = [
+        "<!DOCTYPE html>\n<html><head><title>Swimrankings - ", name, "</title>\n", head, "</head>\n<body>\n",
+        nav,
+        '<div id="name">', name, "&nbsp;&nbsp;(", str(year_of_birth),
+        '&nbsp;&nbsp;<img src="images/', gender_icon, '">)</div>\n',
+        '<div id="nationclub"><br>SUI - Suisse<br>', club, "</div>\n",
+        '<table class="athleteBest">\n',
+        '<tr><th class="event">Event</th><th class="course">Course</th><th class="time">Time</th>'
+        '<th class="code">Pts</th><th class="date">Date</th><th class="city">City</th>'
+        '<th class="name">Meet</th></tr>\n',
+    ]
+    
+    for i in range(rows):
+        event = (i // 2) % len(EVENTS)
+        distance, stroke = EVENTS[event]
+        pool = 50 if i % 2 == 0 else 25
+        centis = int(distance / 50 * PACE[stroke] * 100 * rng.uniform(0.95, 1.15))
+        date = f"{rng.randint(1, 28):02d}&nbsp;{rng.choice(MONTHS)}&nbsp;{rng.randint(2018, 2026)}"
+        city = rng.choice(CITIES)
+        parts.append(
+            f'<tr class="athleteBest{i % 2}"><td class="event">'
+            f'<a href="index.php?page=athleteDetail&amp;athleteId=1&amp;styleId={event + 1}">'
+            f'{distance}m {stroke}</a></td>'
+            f'<td class="course">{pool}m</td><td class="time"><a href="#">{format_time(centis)}</a></td>'
+            f'<td class="code">{rng.randint(200, 700)}</td><td class="date">{date}</td>'
+            f'<td class="city">{city}</td><td class="name">Meeting {city}</td></tr>\n'
+        )
+    
+    parts.append("</table>\n")
+    parts.append(footer)
+    parts.append("</body></html>\n")
+    return "".join(parts)
+
+
+def generate_history_page(distance, stroke, races, seed=0, name="HEHLEN, Ava"):
+    """Page d'historique d'une épreuve (styleId): une ligne par course, les plus récentes d'abord"""
+    
+    rng = random.Random(seed)
+    parts = [
+        "<!DOCTYPE html>\n<html><head><title>Swimrankings - ", name, "</title></head>\n<body>\n",
+        f'<table class="athleteRanking">\n<tr><th colspan="6">{distance}m {stroke}</th></tr>\n',
+        '<tr><th class="time">Time</th><th class="course">Course</th><th class="code">Pts</th>'
+        '<th class="date">Date</th><th class="city">City</th><th class="name">Meet</th></tr>\n',
+    ]
+    for i in range(races):
+        centis = int(distance / 50 * PACE[stroke] * 100 * rng.uniform(0.95, 1.15))
+        city = rng.choice(CITIES)
+        parts.append(
+            f'<tr class="athleteRanking{i % 2}"><td class="time">{format_time(centis)}</td>'
+            f'<td class="course">{rng.choice((25, 50))}m</td><td class="code">{rng.randint(200, 700)}</td>'
+            f'<td class="date">{rng.randint(1, 28):02d}&nbsp;{rng.choice(MONTHS)}&nbsp;{2026 - i // 10}</td>'
+            f'<td class="city">{city}</td><td class="name">Meeting {city}</td></tr>\n'
+        )
+    parts.append("</table>\n</body></html>\n")
+    return "".join(parts)
+
+
+def generate_roster(count, seed=1):
+    """Effectif aléatoire: chaque nageur a un temps sur environ la moitié des épreuves"""
+    rng = random.Random(seed)
+    swimmers = {}
+    for i in range(count):
+        gender = rng.choice(("Female", "Male"))
+        year_of_birth = rng.randrange(2005, 2016)
+        results = []
+        for pool, events in FINA_BASE_TIMES[gender].items():
+            for event, base_ms in events.items():
+                if rng.random() < 0.5:
+                    continue
+                distance, _, stroke = event.partition("_")
+                results.append({
+                    "stroke": stroke,
+                    "distance": int(distance),
+                    "poolLength": pool,
+                    # 60 à 130% au-dessus du temps de base (≈ 85 à 470 points)
+                    "timeMs": int(base_ms * rng.uniform(1.6, 2.3)) // 10 * 10,
+                })
+        athlete_id = str(1000000 + i)
+        swimmers[athlete_id] = {"id": athlete_id, "fullName": f"Nageur {i}", "gender": gender,
+                                "yearOfBirth": year_of_birth, PERSONAL_BESTS: results}
+    return swimmers
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Flux des changements: ne met à jour que les athlètes qui ont nagé dans une compétition récente
+
+Au lieu de re-télécharger chaque jour les 2 pages de tous les athlètes suivis (le plus
+souvent inchangées), le flux lit la liste des compétitions récentes de SwimRankings puis,
+pour chaque compétition, la page des résultats de chaque club suivi (--club). Une page
+dont les résultats ont changé depuis le passage précédent (empreinte du texte des
+tableaux) désigne ses athlètes suivis: seuls ceux-là sont mis à jour, avec
+update_swimmers.py --only. Quelques requêtes par passage au lieu de 2 par athlète,
+sauf les week-ends de grosses compétitions.
+
+Filet de sécurité: tous les --full-sweep-days jours (ou avec --full-sweep), tous les
+athlètes suivis sont re-téléchargés (résultats hors des clubs suivis, compétitions
+publiées tardivement). L'état (empreintes des pages, date du dernier passage complet)
+n'est enregistré qu'après un run réussi de update_swimmers.py: un lot en erreur est
+repris au passage suivant. Une page dont un athlète n'a pas pu être mis à jour
+(--failed-file de update_swimmers.py) garde son ancienne empreinte et le désigne de
+nouveau au passage suivant.
+
+Usage:
+    python change_feed.py --club 65773 --ids-file athletes.txt -- --store swimmers-history.db --publish-dir data
+    python change_feed.py --club 65773 --dry-run       affiche les athlètes à mettre à jour
+Les options après -- sont transmises à update_swimmers.py.
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import swimrankings
+from discover_clubs import AthleteLinkParser, meet_url
+from http_cache import HttpCache
+from scheduler import load_state, run_update_script, save_state, tracked_ids
+from swimrankings import (
+    add_http_arguments, fetch_concurrently, fetch_html, load_output, make_session, parse_timestamp, read_id_file,
+    select_stale, write_id_file,
+)
+
+DEFAULT_STATE = "change-feed-state.json"
+DEFAULT_FULL_SWEEP_DAYS = 7
+
+# Lien vers une compétition: "...page=meetDetail&meetId=612345"
+MEET_ID_RE = re.compile(r"meetId=(\d+)")
+
+
+def recent_meets_url(nation_id=0):
+    """Liste des compétitions récentes (résultats publiés), toutes nations si nation_id vaut 0"""
+    return f"{swimrankings.BASE_URL}?page=meetSelect&nationId={nation_id}&selectPage=RECENT"
+
+
+class MeetLinkParser(AthleteLinkParser):
+    """Relève les liens vers des compétitions: {meetId: nom affiché}"""
+    
+    link_re = MEET_ID_RE
+
+
+class MeetResultsParser(AthleteLinkParser):
+    """Page de résultats d'un club: athlètes (liens) et texte des tableaux de résultats"""
+    
+    def __init__(self):
+        super().__init__()
+        self.table_depth = 0
+        self.table_text = []
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self.table_depth += 1
+        super().handle_starttag(tag, attrs)
+    
+    def handle_endtag(self, tag):
+        super().handle_endtag(tag)
+        if tag == "table" and self.table_depth:
+            self.table_depth -= 1
+    
+    def handle_data(self, data):
+        super().handle_data(data)
+        text = data.strip()
+        if self.table_depth and text:
+            self.table_text.append(text)
+    
+    def digest(self):
+        """Empreinte des résultats publiés (insensible au reste de la page: menus, publicités)"""
+        return hashlib.sha256("\n".join(self.table_text).encode("utf-8")).hexdigest()[:16]
+
+
+def parse_meets(html):
+    parser = MeetLinkParser()
+    parser.feed(html)
+    parser.close()
+    return parser.athletes
+
+
+def parse_meet_results(html):
+    """(athlètes {id: nom}, empreinte des résultats)"""
+    parser = MeetResultsParser()
+    parser.feed(html)
+    parser.close()
+    return parser.athletes, parser.digest()
+
+
+def poll_meets(meets, club_ids, session, cache, workers, pages):
+    """Relève les pages de résultats (compétition, club) modifiées
+    
+    `pages` est l'état précédent: {"meetId:clubId": {"meet": nom, "digest": empreinte}}.
+    Retourne (athlètes par page modifiée {clé: {id: nom}}, nouvel état, pages en erreur).
+    Le nouvel état ne garde que les compétitions encore listées; une page en erreur garde
+    son ancienne empreinte (elle sera comparée de nouveau au passage suivant).
+    """
+    keys = [f"{meet_id}:{club_id}" for meet_id in meets for club_id in club_ids]
+    
+    def fetch(key):
+        meet_id, club_id = key.split(":")
+        return fetch_html(meet_url(meet_id, club_id), session, cache)
+    
+    changed = {}
+    new_pages = {}
+    errors = []
+    for key, html in fetch_concurrently(keys, fetch, workers):
+        if html is None:
+            errors.append(key)
+            if key in pages:
+                new_pages[key] = pages[key]
+            continue
+        found, digest = parse_meet_results(html)
+        meet_name = meets[key.split(":")[0]]
+        new_pages[key] = {"meet": meet_name, "digest": digest}
+        if pages.get(key, {}).get("digest") != digest and found:
+            print(f"  {meet_name} (club {key.split(':')[1]}): {len(found)} athlètes, résultats modifiés",
+                  file=sys.stderr)
+            changed[key] = found
+    return changed, new_pages, errors
+
+
+def sweep_due(state, days, now):
+    """True si le dernier passage complet date de plus de `days` jours (ou n'a jamais eu lieu)"""
+    last_sweep = parse_timestamp(state.get("lastFullSweep"))
+    return last_sweep is None or now - last_sweep >= timedelta(days=days)
+
+
+def temp_id_file(athlete_ids):
+    """Écrit les IDs dans un fichier temporaire (format --ids-file); retourne son chemin"""
+    fd, path = tempfile.mkstemp(prefix="change-feed-", suffix=".txt")
+    os.close(fd)
+    write_id_file(path, athlete_ids)
+    return path
+
+
+def run_update(update_args, athlete_ids, only=None):
+    """Lance update_swimmers.py sur les athlètes suivis (uniquement `only` s'il est fourni)
+    
+    Les IDs passent par des fichiers temporaires (--ids-file, --only-file) et non par la
+    ligne de commande, limitée en longueur pour les gros effectifs.
+    Retourne les IDs en erreur ([] si tous ont été mis à jour), None si le run a échoué.
+    """
+    paths = [temp_id_file(athlete_ids)]
+    try:
+        if only is None:
+            # Passage complet: tous les athlètes re-téléchargés, fusion dans les fichiers existants
+            return run_update_script([*update_args, "--incremental", "--stale-hours", "0", "--ids-file", paths[0]])
+        paths.append(temp_id_file(only))
+        return run_update_script([*update_args, "--ids-file", paths[0], "--only-file", paths[1]])
+    finally:
+        for path in paths:
+            os.remove(path)
+
+
+def keep_failed_pages(pages, previous_pages, changed_pages, failed):
+    """Remet l'ancienne empreinte des pages modifiées dont un athlète est en erreur
+    
+    La page est de nouveau vue comme modifiée au passage suivant, qui reprend ses athlètes.
+    Retourne le nombre de pages remises.
+    """
+    kept = 0
+    for key, found in changed_pages.items():
+        if failed.isdisjoint(found):
+            continue
+        if key in previous_pages:
+            pages[key] = previous_pages[key]
+        else:
+            pages.pop(key, None)
+        kept += 1
+    return kept
+
+
+def make_feed_cache(args):
+    """Cache HTTP des pages du flux: toujours revalidées (TTL 0), requêtes conditionnelles si possible"""
+    if args.no_cache:
+        return None
+    return HttpCache(args.cache_dir, ttl=0, refresh=args.refresh)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Met à jour uniquement les athlètes ayant nagé récemment")
+    parser.add_argument("--club", nargs="+", default=[], metavar="CLUB_ID", help="IDs SwimRankings des clubs suivis")
+    parser.add_argument("--clubs-file", metavar="FICHIER",
+                        help="IDs de clubs dans un fichier (un par ligne, # pour les commentaires)")
+    parser.add_argument("--nation", type=int, default=0, metavar="NATION_ID",
+                        help="compétitions récentes d'une nation SwimRankings (défaut: 0, toutes)")
+    parser.add_argument("--ids-file", metavar="FICHIER", help="athlètes suivis (défaut: ceux de --data)")
+    parser.add_argument("--data", default="swimmers-data.json", help="records personnels publiés")
+    parser.add_argument("--state", default=DEFAULT_STATE,
+                        help=f"empreintes des pages de résultats et date du dernier passage complet "
+                             f"(défaut: {DEFAULT_STATE})")
+    parser.add_argument("--full-sweep-days", type=float, default=DEFAULT_FULL_SWEEP_DAYS,
+                        help=f"jours entre deux passages complets (défaut: {DEFAULT_FULL_SWEEP_DAYS})")
+    parser.add_argument("--full-sweep", action="store_true", help="force un passage complet")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="affiche les athlètes à mettre à jour (sans run ni écriture de l'état)")
+    add_http_arguments(parser)
+    args, update_args = parser.parse_known_args()
+    if update_args[:1] == ["--"]:
+        update_args = update_args[1:]
+    
+    club_ids = list(args.club)
+    if args.clubs_file:
+        club_ids += read_id_file(args.clubs_file)
+    club_ids = list(dict.fromkeys(club_ids))
+    if not club_ids:
+        parser.error("indiquer au moins un --club ou --clubs-file")
+    
+    document = load_output(args.data)
+    athlete_ids = tracked_ids(args, document)
+    if not athlete_ids:
+        parser.error("aucun athlète suivi (--ids-file ou --data)")
+    
+    now = datetime.utcnow()
+    state = load_state(args.state)
+    session = make_session(args)
+    cache = make_feed_cache(args)
+    
+    html = fetch_html(recent_meets_url(args.nation), session, cache)
+    if html is None:
+        print("Liste des compétitions récentes indisponible", file=sys.stderr)
+        sys.exit(1)
+    meets = parse_meets(html)
+    print(f"{len(meets)} compétitions récentes, {len(club_ids)} clubs suivis", file=sys.stderr)
+    
+    previous_pages = state.get("pages", {})
+    changed_pages, pages, errors = poll_meets(meets, club_ids, session, cache, args.workers, previous_pages)
+    raced = dict.fromkeys(athlete_id for found in changed_pages.values() for athlete_id in found)
+    tracked = set(athlete_ids)
+    changed = [athlete_id for athlete_id in raced if athlete_id in tracked]
+    untracked = len(raced) - len(changed)
+    # Athlètes suivis pas encore publiés (ajoutés à la liste depuis le dernier run)
+    missing = [athlete_id for athlete_id in select_stale(athlete_ids, [document], float("inf"))
+               if athlete_id not in raced]
+    full_sweep = args.full_sweep or sweep_due(state, args.full_sweep_days, now)
+    
+    print(f"{len(changed)}/{len(athlete_ids)} athlètes suivis avec de nouveaux résultats"
+          f"{f', {len(missing)} nouveaux athlètes' if missing else ''}"
+          f"{f', {untracked} non suivis ignorés' if untracked else ''}"
+          f"{f', {len(errors)} pages en erreur' if errors else ''}", file=sys.stderr)
+    changed += missing
+    
+    if args.dry_run:
+        if full_sweep:
+            print(f"Passage complet dû: {len(athlete_ids)} athlètes")
+        print(" ".join(changed))
+        return
+    
+    if full_sweep:
+        print(f"Passage complet: {len(athlete_ids)} athlètes", file=sys.stderr)
+        failed = run_update(update_args, athlete_ids)
+    elif changed:
+        failed = run_update(update_args, athlete_ids, changed)
+    else:
+        failed = []
+    
+    if failed is None:
+        print("  update_swimmers.py en erreur, changements repris au prochain passage", file=sys.stderr)
+        sys.exit(1)
+    if failed:
+        kept = keep_failed_pages(pages, previous_pages, changed_pages, set(failed))
+        print(f"  {len(failed)} athlètes en erreur: {kept} pages de résultats reprises au prochain passage",
+              file=sys.stderr)
+    state["pages"] = pages
+    if full_sweep:
+        state["lastFullSweep"] = now.isoformat() + "Z"
+    save_state(args.state, state)
+
+
+if __name__ == "__main__":
+    main()
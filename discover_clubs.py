@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Découverte des IDs SwimRankings d'un ou plusieurs clubs (au lieu de tenir athletes.txt à la main)
+
+Parcourt les classements du club (hommes/dames, bassins 25m/50m, page par page) et,
+optionnellement, les résultats du club à des compétitions; chaque lien athleteDetail
+donne un ID. Les pages d'une liste sont téléchargées en parallèle, par vagues de
+--workers pages, jusqu'à une page vide ou identique à la précédente. Si une page ne
+peut pas être téléchargée, la liste serait incomplète: rien n'est écrit (code de sortie 1)
+et le fichier de sortie précédent reste en place.
+
+Les IDs déjà connus (--include, --data) sont gardés en tête, dans leur ordre; les
+nouveaux sont ajoutés à la suite. La liste s'écrit dans un fichier (format athletes.txt)
+ou sur stdout, pour les scrapers (--ids-file):
+
+    python discover_clubs.py --club 65773 --include athletes.txt --output athlete-ids.txt
+    python update_swimmers.py --incremental --ids-file athlete-ids.txt
+    python discover_clubs.py --club 65773 --new-only | python fetch_swimmers.py --ids-file -
+"""
+
+import argparse
+import os
+import re
+import sys
+from html.parser import HTMLParser
+
+import swimrankings
+from swimrankings import (
+    add_http_arguments, fetch_concurrently, fetch_html, load_output, make_cache, make_session, read_id_file,
+)
+
+# Lien vers une page athlète: "...page=athleteDetail&athleteId=5332548"
+ATHLETE_ID_RE = re.compile(r"athleteId=(\d+)")
+
+# Nombre de lignes par page de classement (paramètre firstPlace)
+LISTING_PAGE_SIZE = 25
+DEFAULT_MAX_PAGES = 40
+
+GENDERS = (1, 2)  # 1 = hommes, 2 = dames
+COURSES = ("LCM", "SCM")  # bassin 50m, 25m
+
+
+def ranking_url(club_id, gender, course, first_place=1):
+    """Page du classement d'un club (toutes nages, toutes catégories d'âge)"""
+    return (f"{swimrankings.BASE_URL}?page=rankingDetail&clubId={club_id}&gender={gender}&season=-1"
+            f"&course={course}&stroke=0&agegroup=0&firstPlace={first_place}")
+
+
+def meet_url(meet_id, club_id):
+    """Résultats des nageurs d'un club à une compétition"""
+    return f"{swimrankings.BASE_URL}?page=meetDetail&meetId={meet_id}&clubId={club_id}"
+
+
+class AthleteLinkParser(HTMLParser):
+    """Relève les liens vers des pages athlète: {id: nom affiché}"""
+    
+    link_re = ATHLETE_ID_RE
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.athletes = {}
+        self.current_id = None
+        self.text_parts = []
+    
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        match = self.link_re.search(dict(attrs).get("href") or "")
+        if match:
+            self.current_id = match.group(1)
+            self.text_parts = []
+    
+    def handle_data(self, data):
+        if self.current_id:
+            self.text_parts.append(data)
+    
+    def handle_endtag(self, tag):
+        if tag == "a" and self.current_id:
+            name = " ".join("".join(self.text_parts).split())
+            if name or self.current_id not in self.athletes:
+                self.athletes[self.current_id] = name
+            self.current_id = None
+
+
+def parse_athlete_links(html):
+    parser = AthleteLinkParser()
+    parser.feed(html)
+    parser.close()
+    return parser.athletes
+
+
+def crawl_listing(url_for_page, session, cache, workers, max_pages):
+    """Parcourt une liste paginée; retourne {id: nom}, ou None si une page n'a pas pu être téléchargée
+    
+    url_for_page(n) donne l'URL de la page n (0, 1, ...). Les pages sont demandées par
+    vagues de `workers`; le parcours s'arrête à la première page vide ou identique à la
+    précédente (au-delà de la dernière page, SwimRankings renvoie une liste vide ou la
+    dernière page). Une page sans nouvel athlète ne termine pas la liste: un nageur
+    classé dans plusieurs épreuves apparaît sur plusieurs pages.
+    """
+    athletes = {}
+    previous = None
+    page_number = 0
+    while page_number < max_pages:
+        wave = list(range(page_number, min(page_number + max(1, workers), max_pages)))
+        results = fetch_concurrently(wave, lambda n: fetch_html(url_for_page(n), session, cache), workers)
+        for n, html in results:
+            if html is None:
+                print(f"  ✗ {url_for_page(n)}: page non téléchargée", file=sys.stderr)
+                return None
+            found = list(parse_athlete_links(html).items())
+            if not found or found == previous:
+                return athletes
+            for athlete_id, name in found:
+                athletes.setdefault(athlete_id, name)
+            previous = found
+        page_number = wave[-1] + 1
+    return athletes
+
+
+def discover_club(club_id, session, cache, workers, max_pages):
+    """Athlètes d'un club: classements hommes/dames en bassin 25m et 50m; None si un classement est incomplet"""
+    athletes = {}
+    for gender in GENDERS:
+        for course in COURSES:
+            def url_for_page(n, gender=gender, course=course):
+                return ranking_url(club_id, gender, course, 1 + n * LISTING_PAGE_SIZE)
+            
+            found = crawl_listing(url_for_page, session, cache, workers, max_pages)
+            if found is None:
+                return None
+            print(f"  club {club_id} {course} {'hommes' if gender == 1 else 'dames'}: {len(found)} athlètes",
+                  file=sys.stderr)
+            for athlete_id, name in found.items():
+                athletes.setdefault(athlete_id, name)
+    return athletes
+
+
+def parse_meet(value):
+    """'meetId:clubId' → (meetId, clubId)"""
+    meet_id, _, club_id = value.partition(":")
+    if not meet_id.isdigit() or not club_id.isdigit():
+        raise argparse.ArgumentTypeError("format attendu: meetId:clubId")
+    return meet_id, club_id
+
+
+def known_ids(args):
+    """IDs déjà suivis, dans l'ordre: fichiers --include puis document --data"""
+    athlete_ids = []
+    for path in args.include or []:
+        try:
+            athlete_ids += read_id_file(path)
+        except FileNotFoundError:
+            print(f"  {path} absent, ignoré", file=sys.stderr)
+    document = load_output(args.data) if args.data else None
+    if document:
+        athlete_ids += list(document["swimmers"])
+    return list(dict.fromkeys(athlete_ids))
+
+
+def write_ids(path, athlete_ids, names):
+    """Écrit la liste au format athletes.txt (nom en commentaire pour les nouveaux IDs)"""
+    lines = [f"{athlete_id}  # {names[athlete_id]}" if names.get(athlete_id) else athlete_id
+             for athlete_id in athlete_ids]
+    content = "\n".join(lines) + "\n" if lines else ""
+    if path in (None, "-"):
+        sys.stdout.write(content)
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Découvre les IDs SwimRankings des nageurs d'un ou plusieurs clubs")
+    parser.add_argument("--club", nargs="+", default=[], metavar="CLUB_ID", help="IDs SwimRankings des clubs")
+    parser.add_argument("--clubs-file", metavar="FICHIER",
+                        help="IDs de clubs dans un fichier (un par ligne, # pour les commentaires)")
+    parser.add_argument("--meet", nargs="+", type=parse_meet, default=[], metavar="MEET:CLUB",
+                        help="ajoute les nageurs d'un club à une compétition (meetId:clubId)")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES,
+                        help=f"pages maximum par classement (défaut: {DEFAULT_MAX_PAGES})")
+    parser.add_argument("--include", nargs="+", metavar="FICHIER",
+                        help="listes d'IDs déjà suivis (ex: athletes.txt), gardées en tête de la sortie")
+    parser.add_argument("--data", default="swimmers-data.json",
+                        help="document publié dont les IDs sont déjà suivis (défaut: swimmers-data.json)")
+    parser.add_argument("--new-only", action="store_true", help="n'écrit que les IDs absents des listes connues")
+    parser.add_argument("--output", "-o", metavar="FICHIER", help="fichier de sortie (défaut: stdout)")
+    add_http_arguments(parser)
+    args = parser.parse_args()
+    
+    club_ids = list(args.club)
+    if args.clubs_file:
+        club_ids += read_id_file(args.clubs_file)
+    club_ids = list(dict.fromkeys(club_ids))
+    if not club_ids and not args.meet:
+        parser.error("indiquer au moins un --club, --clubs-file ou --meet")
+    
+    session = make_session(args)
+    cache = make_cache(args)
+    
+    discovered = {}
+    failed = []
+    for club_id in club_ids:
+        athletes = discover_club(club_id, session, cache, args.workers, args.max_pages)
+        if athletes is None:
+            failed.append(f"club {club_id}")
+            continue
+        for athlete_id, name in athletes.items():
+            discovered.setdefault(athlete_id, name)
+    
+    meet_urls = [meet_url(meet_id, club_id) for meet_id, club_id in args.meet]
+    for url, html in fetch_concurrently(meet_urls, lambda url: fetch_html(url, session, cache), args.workers):
+        if html is None:
+            print(f"  ✗ {url}: page non téléchargée", file=sys.stderr)
+            failed.append(url)
+            continue
+        found = parse_athlete_links(html)
+        print(f"  {url}: {len(found)} athlètes", file=sys.stderr)
+        for athlete_id, name in found.items():
+            discovered.setdefault(athlete_id, name)
+    
+    if failed:
+        # Une liste incomplète retirerait des athlètes suivis: la sortie précédente reste en place
+        print(f"Découverte incomplète ({', '.join(failed)}): {args.output or 'stdout'} non écrit", file=sys.stderr)
+        sys.exit(1)
+    
+    known = known_ids(args)
+    known_set = set(known)
+    new_ids = [athlete_id for athlete_id in discovered if athlete_id not in known_set]
+    athlete_ids = new_ids if args.new_only else known + new_ids
+    
+    print(f"{len(discovered)} athlètes trouvés, {len(new_ids)} nouveaux ({len(known)} déjà suivis)",
+          file=sys.stderr)
+    print(f"Latence moyenne: {session.latency.summary()}", file=sys.stderr)
+    write_ids(args.output, athlete_ids, {athlete_id: discovered[athlete_id] for athlete_id in new_ids})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Cache HTTP sur disque pour les pages SwimRankings
+
+Chaque URL est stockée sous <cache_dir>/<sha256(url)>.html (corps brut) et .json
+(métadonnées: ETag, Last-Modified, hash du contenu, date de récupération et
+enregistrement déjà parsé). Les requêtes suivantes envoient If-None-Match /
+If-Modified-Since quand le serveur a fourni ces en-têtes; sinon la page est
+considérée fraîche pendant `ttl` secondes, puis comparée par hash du contenu.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_CACHE_DIR = ".cache/swimrankings"
+DEFAULT_TTL = 6 * 3600  # secondes, pour les pages sans ETag ni Last-Modified
+
+
+class CacheEntry:
+    """Entrée de cache: métadonnées + accès paresseux au corps"""
+    
+    def __init__(self, cache, url, meta):
+        self.cache = cache
+        self.url = url
+        self.meta = meta
+    
+    @property
+    def etag(self):
+        return self.meta.get("etag")
+    
+    @property
+    def last_modified(self):
+        return self.meta.get("lastModified")
+    
+    @property
+    def content_hash(self):
+        return self.meta.get("contentHash")
+    
+    @property
+    def parsed(self):
+        return self.meta.get("parsed")
+    
+    def has_validators(self):
+        return bool(self.etag or self.last_modified)
+    
+    def age(self):
+        return time.time() - self.meta.get("fetchedAt", 0)
+    
+    def read_body(self):
+        body_path, _ = self.cache.paths(self.url)
+        with open(body_path, "rb") as f:
+            return f.read()
+
+
+class HttpCache:
+    """Cache HTTP sur disque indexé par URL (thread-safe: un fichier par URL)"""
+    
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, refresh=False):
+        self.directory = directory
+        self.ttl = ttl
+        # refresh=True ignore le cache en lecture (mais le remplit)
+        self.refresh = refresh
+        os.makedirs(directory, exist_ok=True)
+    
+    def paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".html", base + ".json"
+    
+    def lookup(self, url):
+        """Retourne l'entrée de cache pour `url`, ou None"""
+        if self.refresh:
+            return None
+        
+        body_path, meta_path = self.paths(url)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return None
+        
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        return CacheEntry(self, url, meta)
+    
+    def is_fresh(self, entry):
+        """Une entrée sans validateurs est réutilisée sans requête pendant le TTL"""
+        return not entry.has_validators() and entry.age() < self.ttl
+    
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+    
+    def store(self, url, body, response_headers):
+        """Enregistre une réponse 200 déjà lue en mémoire (voir CacheWriter)"""
+        writer = self.writer(url)
+        writer.write(body)
+        return writer.commit(response_headers)
+    
+    def writer(self, url):
+        """Écriture progressive d'une réponse 200, morceau par morceau"""
+        return CacheWriter(self, url)
+    
+    def touch(self, entry):
+        """Marque une entrée comme revalidée (réponse 304)"""
+        entry.meta["fetchedAt"] = time.time()
+        self._write_meta(self.paths(entry.url)[1], entry.meta)
+    
+    def save_parsed(self, entry, parsed):
+        """Associe l'enregistrement parsé au contenu en cache"""
+        entry.meta["parsed"] = parsed
+        self._write_meta(self.paths(entry.url)[1], entry.meta)
+    
+    def _write_meta(self, path, meta):
+        self._write(path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+    
+    def _write(self, path, content):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+class CacheWriter:
+    """Écrit le corps d'une réponse dans un fichier temporaire en calculant son hash
+    
+    commit() retourne (entry, unchanged): unchanged vaut True si le contenu est identique
+    à la version en cache (même hash), auquel cas l'enregistrement parsé est conservé.
+    """
+    
+    def __init__(self, cache, url):
+        self.cache = cache
+        self.url = url
+        self.body_path, self.meta_path = cache.paths(url)
+        self.tmp_path = f"{self.body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self.hash = hashlib.sha256()
+        self.file = open(self.tmp_path, "wb")
+    
+    def write(self, chunk):
+        self.hash.update(chunk)
+        self.file.write(chunk)
+    
+    def commit(self, response_headers):
+        self.file.close()
+        content_hash = self.hash.hexdigest()
+        previous = self.cache.lookup(self.url)
+        unchanged = previous is not None and previous.content_hash == content_hash
+        
+        if unchanged:
+            os.remove(self.tmp_path)
+        else:
+            os.replace(self.tmp_path, self.body_path)
+        
+        meta = {
+            "url": self.url,
+            "etag": response_headers.get("ETag"),
+            "lastModified": response_headers.get("Last-Modified"),
+            "contentHash": content_hash,
+            "fetchedAt": time.time(),
+            "parsed": previous.parsed if unchanged else None,
+        }
+        self.cache._write_meta(self.meta_path, meta)
+        return CacheEntry(self.cache, self.url, meta), unchanged
+    
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
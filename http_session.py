@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Session HTTP partagée par les scrapers SwimRankings
+
+- connexions HTTP/1.1 persistantes (keep-alive), une par thread et par hôte
+- Accept-Encoding gzip/deflate et décompression transparente au fil de la lecture
+- délai minimum entre deux requêtes vers le même hôte, timeout et relance
+  sur connexion persistante fermée par le serveur, au même endroit
+- relances avec backoff exponentiel plafonné, jitter et respect de Retry-After
+- disjoncteur qui suspend toutes les requêtes quand le taux d'erreur explose
+- mesure de la latence des requêtes avec et sans réutilisation de connexion,
+  de la durée d'ouverture des connexions et des octets reçus
+"""
+
+import email.utils
+import http.client
+import random
+import ssl
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urlsplit
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_MIN_INTERVAL = 0.5
+MAX_REDIRECTS = 5
+
+# Statuts pour lesquels la requête est relancée (limitation de débit, panne temporaire)
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_MAX = 60.0
+
+DEFAULT_CIRCUIT_THRESHOLD = 0.5
+DEFAULT_CIRCUIT_WINDOW = 20
+DEFAULT_CIRCUIT_PAUSE = 120.0
+
+# Erreurs indiquant qu'une connexion persistante a été fermée côté serveur
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class HostRateLimiter:
+    """Espace les requêtes vers un même hôte d'au moins `min_interval` secondes (thread-safe)"""
+    
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+    
+    def wait(self, url):
+        if self.min_interval <= 0:
+            return
+        
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class HttpError(Exception):
+    """Réponse HTTP inattendue (statut >= 400)"""
+    
+    def __init__(self, url, status, reason=""):
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.url = url
+        self.status = status
+
+
+class CircuitOpenError(Exception):
+    """Le disjoncteur a coupé trop de fois: les requêtes restantes échouent immédiatement"""
+
+
+class RetryPolicy:
+    """Relances avec backoff exponentiel plafonné et jitter ("full jitter")
+    
+    Le délai avant la relance n°k (k >= 0) est tiré dans [0, min(max_delay, base_delay * 2^k)].
+    Un en-tête Retry-After (secondes ou date HTTP) remplace ce délai, plafonné à max_delay.
+    """
+    
+    def __init__(self, retries=DEFAULT_RETRIES, base_delay=DEFAULT_BACKOFF_BASE, max_delay=DEFAULT_BACKOFF_MAX,
+                 rng=None):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+    
+    def delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_delay)
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def parse_retry_after(value, now=None):
+    """Convertit un en-tête Retry-After en secondes; None s'il est absent ou invalide"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class CircuitBreaker:
+    """Suspend toutes les requêtes du run quand le taux d'erreur récent dépasse un seuil
+    
+    Sur les `window` dernières requêtes, si la part d'échecs atteint `threshold`, le
+    disjoncteur s'ouvre: toutes les requêtes attendent `pause` secondes, puis reprennent
+    avec une fenêtre vide. Après `max_trips` ouvertures consécutives sans succès entre
+    deux, les requêtes échouent immédiatement (CircuitOpenError).
+    """
+    
+    def __init__(self, threshold=DEFAULT_CIRCUIT_THRESHOLD, window=DEFAULT_CIRCUIT_WINDOW,
+                 pause=DEFAULT_CIRCUIT_PAUSE, max_trips=3):
+        self.threshold = threshold
+        self.window = window
+        self.pause = pause
+        self.max_trips = max_trips
+        self.trips = 0
+        self._outcomes = deque(maxlen=window)
+        self._open_until = 0.0
+        self._consecutive_trips = 0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """Bloque tant que le disjoncteur est ouvert"""
+        with self._lock:
+            if self._consecutive_trips >= self.max_trips:
+                raise CircuitOpenError(f"disjoncteur ouvert {self._consecutive_trips} fois de suite, abandon")
+            delay = self._open_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def record(self, success):
+        with self._lock:
+            self._outcomes.append(success)
+            if success:
+                self._consecutive_trips = 0
+                return
+            
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.window and failures / len(self._outcomes) >= self.threshold:
+                self.trips += 1
+                self._consecutive_trips += 1
+                self._open_until = time.monotonic() + self.pause
+                self._outcomes.clear()
+                print(f"  ⚡ Disjoncteur ouvert ({failures} erreurs sur {self.window} requêtes), "
+                      f"pause de {self.pause:.0f}s", file=sys.stderr)
+
+
+class LatencyStats:
+    """Latences des requêtes, séparées selon que la connexion était neuve ou réutilisée"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {"new": [], "reused": []}
+    
+    def add(self, reused, seconds):
+        with self._lock:
+            self.samples["reused" if reused else "new"].append(seconds)
+    
+    def summary(self):
+        """Ex: 'nouvelle connexion: 412 ms (n=8), connexion réutilisée: 138 ms (n=40)'"""
+        parts = []
+        for key, label in (("new", "nouvelle connexion"), ("reused", "connexion réutilisée")):
+            samples = self.samples[key]
+            if samples:
+                parts.append(f"{label}: {sum(samples) / len(samples) * 1000:.0f} ms (n={len(samples)})")
+        return ", ".join(parts) or "aucune requête"
+
+
+class Response:
+    """Réponse HTTP dont le corps est lu (et décompressé) au fil de l'eau
+    
+    La connexion est rendue à la session une fois le corps entièrement lu; à utiliser
+    comme gestionnaire de contexte pour la fermer si la lecture est interrompue.
+    """
+    
+    def __init__(self, session, url, conn, raw, reused, started, connect_time=0.0):
+        self.session = session
+        self.url = url
+        self.status = raw.status
+        self.reason = raw.reason
+        self.headers = raw.headers
+        self.reused = reused
+        # Durée d'ouverture de la connexion (DNS + TCP + TLS), 0 si réutilisée
+        self.connect_time = connect_time
+        # Durée entre l'envoi de la requête et la fin de la lecture du corps
+        self.elapsed = None
+        # Octets reçus sur le réseau (corps compressé)
+        self.bytes_received = 0
+        # Nombre de tentatives (relances comprises) pour obtenir cette réponse
+        self.attempts = 1
+        self._conn = conn
+        self._raw = raw
+        self._started = started
+        self._decompressor = make_decompressor(raw.getheader("Content-Encoding"))
+    
+    def iter_content(self, chunk_size=16 * 1024):
+        """Itère sur le corps décompressé, par morceaux"""
+        while True:
+            chunk = self._raw.read(chunk_size)
+            if not chunk:
+                break
+            self.bytes_received += len(chunk)
+            if self._decompressor:
+                chunk = self._decompressor.decompress(chunk)
+                if not chunk:
+                    continue
+            yield chunk
+        
+        if self._decompressor:
+            tail = self._decompressor.flush()
+            if tail:
+                yield tail
+        self._finish()
+    
+    def read(self):
+        return b"".join(self.iter_content())
+    
+    def _finish(self):
+        if self._conn is None:
+            return
+        self.elapsed = time.perf_counter() - self._started
+        self.session.latency.add(self.reused, self.elapsed)
+        if self._raw.will_close or not self.session.keep_alive:
+            self._conn.close()
+        else:
+            self.session._release(self.url, self._conn)
+        self._conn = None
+    
+    def close(self):
+        # Corps non lu en entier: la connexion ne peut pas être réutilisée
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def make_decompressor(encoding):
+    encoding = (encoding or "").strip().lower()
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return _DeflateDecompressor()
+    return None
+
+
+class _DeflateDecompressor:
+    """Décompresse 'deflate' avec ou sans en-tête zlib"""
+    
+    def __init__(self):
+        self._obj = None
+        self._pending = b""
+    
+    def decompress(self, data):
+        if self._obj is None:
+            self._pending += data
+            if len(self._pending) < 2:
+                return b""
+            data, self._pending = self._pending, b""
+            # En-tête zlib: CMF=0x78 et (CMF*256 + FLG) multiple de 31
+            has_header = data[0] & 0x0F == 8 and (data[0] * 256 + data[1]) % 31 == 0
+            self._obj = zlib.decompressobj(zlib.MAX_WBITS if has_header else -zlib.MAX_WBITS)
+        return self._obj.decompress(data)
+    
+    def flush(self):
+        if self._obj is None:
+            return b""
+        return self._obj.flush()
+
+
+class HttpSession:
+    """Pool de connexions persistantes (une par thread et par hôte)"""
+    
+    def __init__(self, headers=None, timeout=DEFAULT_TIMEOUT, min_interval=DEFAULT_MIN_INTERVAL, keep_alive=True,
+                 retry_policy=None, circuit_breaker=None):
+        self.headers = dict(headers or {})
+        self.headers.setdefault("Accept-Encoding", "gzip, deflate")
+        if keep_alive:
+            self.headers.setdefault("Connection", "keep-alive")
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.rate_limiter = HostRateLimiter(min_interval)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.latency = LatencyStats()
+        self.retries = 0
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self._ssl_context = ssl.create_default_context()
+    
+    def _pool(self):
+        pool = getattr(self._local, "connections", None)
+        if pool is None:
+            pool = self._local.connections = {}
+        return pool
+    
+    def _connection(self, url):
+        """Retourne (connexion, réutilisée) pour l'hôte de `url`"""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        conn = self._pool().pop(key, None)
+        if conn is not None:
+            return conn, True
+        
+        if parts.scheme == "https":
+            conn = http.client.HTTPSConnection(parts.netloc, timeout=self.timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(parts.netloc, timeout=self.timeout)
+        return conn, False
+    
+    def _release(self, url, conn):
+        parts = urlsplit(url)
+        previous = self._pool().get((parts.scheme, parts.netloc))
+        if previous is not None:
+            previous.close()
+        self._pool()[(parts.scheme, parts.netloc)] = conn
+    
+    def get(self, url, headers=None):
+        """Envoie une requête GET et retourne la Response (en-têtes lus, corps non lu)
+        
+        Les erreurs réseau et les statuts 429/5xx sont relancés selon la RetryPolicy;
+        après la dernière tentative, la dernière réponse est retournée (ou l'erreur levée).
+        Chaque tentative passe par le disjoncteur.
+        """
+        request_headers = dict(self.headers)
+        request_headers.update(headers or {})
+        policy = self.retry_policy
+        
+        for attempt in range(policy.retries + 1):
+            self.circuit_breaker.wait()
+            last_attempt = attempt == policy.retries
+            
+            try:
+                response = self._get_following_redirects(url, request_headers)
+            except (OSError, http.client.HTTPException) as e:
+                self.circuit_breaker.record(False)
+                if last_attempt:
+                    raise
+                delay = policy.delay(attempt)
+                print(f"  ↻ {url}: {e}, relance dans {delay:.1f}s", file=sys.stderr)
+            else:
+                if response.status not in RETRYABLE_STATUSES:
+                    self.circuit_breaker.record(True)
+                    response.attempts = attempt + 1
+                    return response
+                
+                self.circuit_breaker.record(False)
+                response.read()
+                if last_attempt:
+                    response.attempts = attempt + 1
+                    return response
+                delay = policy.delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+                print(f"  ↻ {url}: HTTP {response.status}, relance dans {delay:.1f}s", file=sys.stderr)
+            
+            with self._stats_lock:
+                self.retries += 1
+            time.sleep(delay)
+    
+    def _get_following_redirects(self, url, headers):
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(url, headers)
+            location = response.headers.get("Location") if response.status in (301, 302, 303, 307, 308) else None
+            if not location:
+                return response
+            response.read()
+            url = urljoin(url, location)
+        
+        raise HttpError(url, response.status, "too many redirects")
+    
+    def _send(self, url, headers):
+        self.rate_limiter.wait(url)
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        
+        for attempt in range(2):
+            conn, reused = self._connection(url)
+            connect_time = 0.0
+            try:
+                if not reused:
+                    connect_started = time.perf_counter()
+                    conn.connect()
+                    connect_time = time.perf_counter() - connect_started
+                started = time.perf_counter()
+                conn.request("GET", path, headers=headers)
+                raw = conn.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            return Response(self, url, conn, raw, reused, started, connect_time)
+    
+    def close(self):
+        for conn in self._pool().values():
+            conn.close()
+        self._pool().clear()
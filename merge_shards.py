@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Fusion des sorties partielles d'un scraping réparti sur plusieurs jobs (--shard i/N)
+
+Avec --shard i/N, les scrapers ne traitent que les athlètes du shard i (hash stable
+de l'ID, voir swimrankings.shard_index) et notent dans _metadata["shard"] le shard et
+les IDs qui lui sont attribués. Ce script combine les sorties partielles en un seul
+document, au format publié:
+- vérifie que les N shards sont tous présents et que chaque ID attendu a un
+  enregistrement (IDs de --ids-file, sinon IDs attribués aux shards); un ID absent
+  est repris du document précédent (--previous) s'il y figure, sinon la fusion échoue
+  (sauf --allow-missing)
+- un ID présent dans plusieurs sorties (shard relancé): l'enregistrement le plus récent
+- lastUpdated repris du document précédent pour les enregistrements inchangés
+  (contentHash), ordre des IDs de la liste, _metadata recalculé: le résultat est celui
+  d'un run unique sur toute la liste
+
+Usage (matrice de 4 jobs, puis un job de fusion):
+    python update_swimmers.py --ids-file athlete-ids.txt --shard 2/4 \\
+        --data-output shards/data-2.json --season-output shards/season-2.json
+    python merge_shards.py --ids-file athlete-ids.txt --previous swimmers-data.json -o swimmers-data.json \\
+        shards/data-*.json
+    python merge_shards.py --ids-file athlete-ids.txt --previous swimmers-season.json -o swimmers-season.json \\
+        shards/season-*.json
+"""
+
+import argparse
+import sys
+
+from swimrankings import (
+    build_metadata, carry_unchanged, latest_update, load_output, merge_swimmers, read_id_file, write_json,
+)
+
+
+def load_partials(paths):
+    """[(chemin, document)]; SystemExit si une sortie est absente ou illisible"""
+    partials = []
+    for path in paths:
+        document = load_output(path)
+        if document is None:
+            sys.exit(f"Sortie partielle absente ou illisible: {path}")
+        partials.append((path, document))
+    return partials
+
+
+def check_shards(partials):
+    """Problèmes de la répartition (nombre de shards différents, shards manquants); [] si complète"""
+    shards = [document["_metadata"]["shard"] for _, document in partials if "shard" in document["_metadata"]]
+    if not shards:
+        return []
+    counts = {shard["count"] for shard in shards}
+    if len(counts) > 1:
+        return [f"nombres de shards différents: {sorted(counts)}"]
+    count = counts.pop()
+    missing = sorted(set(range(1, count + 1)) - {shard["index"] for shard in shards})
+    return [f"shard {index}/{count} absent" for index in missing]
+
+
+def assigned_ids(partials):
+    """IDs attribués aux shards, par shard puis dans l'ordre de la liste d'origine"""
+    shards = sorted((document["_metadata"]["shard"] for _, document in partials if "shard" in document["_metadata"]),
+                    key=lambda shard: shard["index"])
+    athlete_ids = [athlete_id for shard in shards for athlete_id in shard["ids"]]
+    # Documents sans shard (run complet): leurs IDs à la suite
+    for _, document in partials:
+        if "shard" not in document["_metadata"]:
+            athlete_ids += list(document["swimmers"])
+    return list(dict.fromkeys(athlete_ids))
+
+
+def merge_records(partials):
+    """{id: enregistrement} de toutes les sorties; en double, le lastUpdated le plus récent l'emporte
+    
+    Retourne (enregistrements, nombre de doublons). À égalité, la première sortie fournie.
+    """
+    merged = {}
+    duplicates = 0
+    for _, document in partials:
+        for athlete_id, record in document["swimmers"].items():
+            if athlete_id in merged:
+                duplicates += 1
+                if (record.get("lastUpdated") or "") <= (merged[athlete_id].get("lastUpdated") or ""):
+                    continue
+            merged[athlete_id] = record
+    return merged, duplicates
+
+
+def single_value(partials, name, get):
+    """Valeur commune à toutes les sorties (saison, version des temps limites); SystemExit si elles diffèrent"""
+    values = {get(document["_metadata"]) for _, document in partials}
+    if len(values) > 1:
+        sys.exit(f"Sorties partielles incompatibles ({name}): {sorted(values, key=str)}")
+    return values.pop() if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fusionne les sorties partielles d'un scraping réparti (--shard)")
+    parser.add_argument("partials", nargs="+", metavar="FICHIER", help="sorties partielles (une par shard)")
+    parser.add_argument("--output", "-o", required=True, metavar="FICHIER", help="document fusionné")
+    parser.add_argument("--ids-file", metavar="FICHIER",
+                        help="liste des IDs attendus, dans l'ordre de sortie (défaut: IDs attribués aux shards)")
+    parser.add_argument("--previous", metavar="FICHIER",
+                        help="document précédent: IDs manquants et lastUpdated des enregistrements inchangés")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="écrit le document même si des IDs attendus n'ont pas d'enregistrement")
+    parser.add_argument("--minify", action="store_true", help="écrit le JSON sans indentation")
+    args = parser.parse_args()
+    
+    partials = load_partials(args.partials)
+    problems = check_shards(partials)
+    season_year = single_value(partials, "saison", lambda metadata: metadata.get("season", {}).get("year"))
+    standards_version = single_value(partials, "temps limites", lambda metadata: metadata.get("standards"))
+    
+    expected = list(dict.fromkeys(read_id_file(args.ids_file))) if args.ids_file else assigned_ids(partials)
+    merged, duplicates = merge_records(partials)
+    expected_set = set(expected)
+    extra = [athlete_id for athlete_id in merged if athlete_id not in expected_set]
+    
+    previous = load_output(args.previous) if args.previous else None
+    if previous and previous["_metadata"].get("season", {}).get("year") != season_year:
+        # Les meilleurs temps d'une autre saison ne sont pas réutilisables
+        previous = None
+    swimmers = merge_swimmers(expected, previous, merged)
+    from_previous = sum(1 for athlete_id in swimmers if athlete_id not in merged)
+    changed = sum(carry_unchanged(record, previous) for athlete_id, record in swimmers.items() if athlete_id in merged)
+    
+    missing = [athlete_id for athlete_id in expected if athlete_id not in swimmers]
+    print(f"{len(partials)} sorties partielles: {len(merged)} athlètes ({duplicates} doublons), "
+          f"{changed} nouveaux ou modifiés, {from_previous} repris du document précédent", file=sys.stderr)
+    if extra:
+        print(f"  {len(extra)} IDs hors de la liste ignorés: {' '.join(extra[:10])}", file=sys.stderr)
+    if missing:
+        problems.append(f"{len(missing)} IDs sans enregistrement: {' '.join(missing[:10])}"
+                        f"{' ...' if len(missing) > 10 else ''}")
+    for problem in problems:
+        print(f"  ✗ {problem}", file=sys.stderr)
+    if problems and not args.allow_missing:
+        sys.exit("Fusion incomplète: relancer les shards en erreur (ou --allow-missing)")
+    
+    metadata = build_metadata(len(swimmers), latest_update(swimmers), season_year, standards_version=standards_version)
+    write_json(args.output, {"_metadata": metadata, "swimmers": swimmers}, args.minify)
+    print(f"Écrit {args.output} ({len(swimmers)}/{len(expected)})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Mesures d'un run de scraping: durées par athlète et par phase, octets, cache, relances
+
+Phases d'une page:
+- connect: ouverture de connexion (DNS + TCP + TLS), 0 si connexion réutilisée
+- download: attente et lecture de la réponse (hors décodage et parsing)
+- decode: décodage UTF-8 du corps
+- parse: HTMLParser.feed (tokenisation et callbacks, hors process_row)
+- process_row: extraction des temps ligne par ligne
+
+Le résumé (JSON) donne pour chaque phase le total et les percentiles p50/p95 par athlète.
+"""
+
+import json
+import math
+import sys
+import threading
+import time
+
+PHASES = ("connect", "download", "decode", "parse", "process_row")
+
+
+def percentile(values, pct):
+    """Percentile au rang le plus proche (values non vide)"""
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class RunMetrics:
+    """Accumule les mesures d'un run (thread-safe)"""
+    
+    def __init__(self):
+        self.started = time.time()
+        self._wall_start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.athletes = {}
+        self.counters = {
+            "pages": 0,
+            "requests": 0,
+            "errors": 0,
+            "bytesReceived": 0,
+            "bytesDecoded": 0,
+            "cacheHits": 0,
+            "notModified": 0,
+            "retries": 0,
+            "circuitTrips": 0,
+        }
+        # IDs dont le contenu a changé, par type de liste (personalBests, seasonBests)
+        self.changed = {}
+    
+    def _athlete(self, athlete_id):
+        athlete = self.athletes.get(athlete_id)
+        if athlete is None:
+            athlete = self.athletes[athlete_id] = {phase: 0.0 for phase in PHASES}
+            athlete["total"] = 0.0
+        return athlete
+    
+    def record_page(self, athlete_id, page, elapsed):
+        """Enregistre les mesures d'une page (voir swimrankings.Page.timings)"""
+        with self._lock:
+            athlete = self._athlete(athlete_id)
+            for phase in PHASES:
+                athlete[phase] += page.timings.get(phase, 0.0)
+            athlete["total"] += elapsed
+            
+            counters = self.counters
+            counters["pages"] += 1
+            if page.response is not None:
+                # Page demandée à SwimRankings (200 ou 304), et non servie par le cache sans requête
+                counters["requests"] += 1
+            counters["bytesReceived"] += page.bytes_received
+            counters["bytesDecoded"] += page.bytes_decoded
+            if page.unchanged:
+                counters["cacheHits"] += 1
+            if page.not_modified:
+                counters["notModified"] += 1
+    
+    def record_error(self, athlete_id, elapsed):
+        with self._lock:
+            self._athlete(athlete_id)["total"] += elapsed
+            self.counters["errors"] += 1
+    
+    def record_session(self, session):
+        """Reprend les compteurs de la session HTTP (relances, ouvertures du disjoncteur)"""
+        with self._lock:
+            self.counters["retries"] = session.retries
+            self.counters["circuitTrips"] = session.circuit_breaker.trips
+    
+    def record_changes(self, results_key, athlete_ids):
+        """Enregistre les athlètes dont le contenu a changé (voir swimrankings.carry_unchanged)"""
+        with self._lock:
+            self.changed[results_key] = list(athlete_ids)
+    
+    def summary(self):
+        """Résumé du run, sérialisable en JSON"""
+        with self._lock:
+            athletes = list(self.athletes.values())
+            phases = {}
+            for phase in PHASES + ("total",):
+                values = [athlete[phase] for athlete in athletes]
+                if values:
+                    phases[phase] = {
+                        "totalMs": round(sum(values) * 1000, 1),
+                        "p50Ms": round(percentile(values, 50) * 1000, 1),
+                        "p95Ms": round(percentile(values, 95) * 1000, 1),
+                    }
+            
+            return {
+                "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+                "wallTimeMs": round((time.perf_counter() - self._wall_start) * 1000, 1),
+                "athletes": len(athletes),
+                **self.counters,
+                "changed": dict(self.changed),
+                "phases": phases,
+            }
+    
+    def print_summary(self, file=sys.stderr):
+        summary = self.summary()
+        print(f"Métriques: {summary['athletes']} athlètes, {summary['pages']} pages, "
+              f"{summary['bytesReceived'] / 1024:.0f} Ko reçus, {summary['cacheHits']} pages en cache, "
+              f"{summary['retries']} relances, {summary['errors']} erreurs, "
+              f"{summary['wallTimeMs'] / 1000:.1f}s", file=file)
+        for phase, stats in summary["phases"].items():
+            print(f"  {phase:<12} p50 {stats['p50Ms']:>8.1f} ms  p95 {stats['p95Ms']:>8.1f} ms  "
+                  f"total {stats['totalMs'] / 1000:>7.2f}s", file=file)
+    
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+            f.write("\n")
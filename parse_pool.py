@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Parsing des pages athlète dans un pool de processus, séparé des téléchargements
+
+Par défaut, chaque thread de téléchargement parse sa page au fil de l'eau: le parsing
+(HTMLParser, regex) est en Python pur et garde le GIL, si bien qu'au-delà de quelques
+threads le run est limité par un seul cœur. Avec --parse-processes N, les threads ne
+font que télécharger et transmettent le corps brut de la page à N processus de parsing.
+
+Entre les deux, au plus --parse-queue pages attendent ou sont en cours de parsing: un
+thread qui a fini de télécharger attend qu'une place se libère avant de soumettre sa
+page (les corps téléchargés ne s'accumulent pas en mémoire si le parsing est plus lent).
+Les résultats restent dans l'ordre des IDs (fetch_concurrently).
+
+Usage: python update_swimmers.py --workers 16 --parse-processes 4 --ids-file athletes.txt
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from swimrankings import SwimRankingsParser, finish_athlete
+
+# Pages en attente ou en cours de parsing par processus (défaut de --parse-queue)
+PENDING_PER_PROCESS = 2
+
+
+def parse_body(body, athlete_id, results_key, profile=None):
+    """Parse le corps brut d'une page athlète (exécuté dans un processus du pool)
+    
+    Retourne (enregistrement, durées par phase), comme fetch_record pour une page
+    parsée au fil de l'eau: décodage, parsing hors process_row, process_row.
+    """
+    started = time.perf_counter()
+    html = body.decode("utf-8", errors="ignore")
+    decoded = time.perf_counter()
+    parser = SwimRankingsParser(results_key, parse_profile=profile is None)
+    parser.feed(html)
+    data = finish_athlete(parser, athlete_id, profile)
+    parse_time = time.perf_counter() - decoded
+    timings = {
+        "decode": decoded - started,
+        "parse": max(0.0, parse_time - parser.process_row_time),
+        "process_row": parser.process_row_time,
+    }
+    return data, timings
+
+
+def pool_context():
+    """Démarrage des processus sans fork des threads de téléchargement (verrous tenus)"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class ParsePool:
+    """Pool de processus de parsing, au plus `max_pending` pages soumises à la fois
+    
+    parse() est appelé par les threads de téléchargement: il bloque tant que la file
+    est pleine, puis jusqu'au résultat de sa page.
+    """
+    
+    def __init__(self, processes, max_pending=None):
+        self.processes = max(1, processes)
+        self.max_pending = max_pending or PENDING_PER_PROCESS * self.processes
+        self.executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=pool_context())
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+    
+    def parse(self, body, athlete_id, results_key, profile=None):
+        """Parse une page dans le pool: (enregistrement, durées par phase)"""
+        self._slots.acquire()
+        try:
+            future = self.executor.submit(parse_body, body, athlete_id, results_key, profile)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+    
+    def close(self):
+        """Arrête les processus; les pages encore en file (run interrompu) ne sont pas parsées"""
+        self.executor.shutdown(cancel_futures=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def make_parse_pool(args):
+    """Pool de parsing si --parse-processes est fourni (0: parsing dans les threads de téléchargement)"""
+    if not args.parse_processes:
+        return None
+    return ParsePool(args.parse_processes, args.parse_queue)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Proxy SwimRankings auto-hébergeable (alternative Python à cloudflare-worker.js)
+
+Sert le même contrat que le Worker: GET /?athleteId=5332548 → JSON de l'athlète
+(records personnels, format de swimmers-data.json), avec CORS. Le parsing est celui
+des scrapers (SwimRankingsParser) au lieu d'une réimplémentation JavaScript.
+
+Pour limiter les requêtes vers SwimRankings (week-ends de compétition):
+- cache LRU en mémoire, borné (--max-entries), valide --ttl secondes
+- entrée périmée depuis moins de --stale secondes: servie immédiatement et
+  rafraîchie en arrière-plan (stale-while-revalidate); servie aussi si SwimRankings
+  est en erreur
+- requêtes simultanées pour le même athlète: un seul téléchargement, partagé
+Le cache HTTP sur disque (--cache-dir) ne sert qu'à revalider (requêtes conditionnelles,
+304 sans re-parsing): chaque rafraîchissement interroge SwimRankings, la fraîcheur ne
+dépend que de --ttl.
+GET /stats donne les compteurs (hits, périmés, partagés, requêtes SwimRankings, 304, erreurs).
+
+Usage: python proxy_server.py [--host 127.0.0.1] [--port 8787] [--ttl 900] [--stale 86400]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from http_cache import HttpCache
+from metrics import RunMetrics
+from swimrankings import PERSONAL_BESTS, add_http_arguments, fetch_record, make_session
+from standards import DEFAULT_STANDARDS, load_standards
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+DEFAULT_TTL = 15 * 60  # secondes
+DEFAULT_STALE = 24 * 3600  # secondes au-delà du TTL pendant lesquelles une entrée reste servie
+DEFAULT_MAX_ENTRIES = 2000
+
+ATHLETE_ID_RE = re.compile(r"^\d+$")
+MAX_REQUEST_LINE = 8192
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+    "Access-Control-Max-Age": "86400",
+}
+
+STATUS_TEXT = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               502: "Bad Gateway"}
+
+HOME_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>SwimRankings Proxy</title></head>
+<body style="font-family:sans-serif;max-width:600px;margin:50px auto;padding:20px">
+  <h1>🏊 SwimRankings Proxy</h1>
+  <p>Proxy Python vers SwimRankings.net (cache et requêtes partagées)</p>
+  <h3>Usage:</h3>
+  <pre style="background:#f0f0f0;padding:10px;border-radius:5px">?athleteId=5332548</pre>
+  <p><a href="?athleteId=5332548">Tester avec l'ID 5332548</a> · <a href="/stats">Statistiques</a></p>
+</body>
+</html>"""
+
+
+class TtlLruCache:
+    """Cache LRU borné: {clé: (valeur, date de téléchargement)}
+    
+    get() retourne (valeur, état) avec état "fresh" (moins de ttl secondes), "stale"
+    (moins de ttl + stale secondes) ou (None, "miss").
+    """
+    
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, stale=DEFAULT_STALE):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale = stale
+        self.entries = OrderedDict()
+    
+    def get(self, key, now=None):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None, "miss"
+        value, fetched_at = entry
+        age = (now or time.monotonic()) - fetched_at
+        if age > self.ttl + self.stale:
+            del self.entries[key]
+            return None, "miss"
+        self.entries.move_to_end(key)
+        return value, "fresh" if age <= self.ttl else "stale"
+    
+    def age(self, key, now=None):
+        return (now or time.monotonic()) - self.entries[key][1]
+    
+    def put(self, key, value, now=None):
+        self.entries[key] = (value, now or time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class AthleteProxy:
+    """Sert les athlètes depuis le cache; un seul téléchargement en cours par athlète"""
+    
+    def __init__(self, session, http_cache, cache, standards=None, workers=4):
+        self.session = session
+        self.http_cache = http_cache
+        self.cache = cache
+        self.standards = standards
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        # Pages téléchargées: distingue requêtes réelles et réponses servies par le cache disque
+        self.metrics = RunMetrics()
+        # Téléchargements en cours: {athlete_id: asyncio.Task}
+        self.inflight = {}
+        self.stats = {"requests": 0, "hits": 0, "stale": 0, "misses": 0, "coalesced": 0, "upstream": 0,
+                      "notModified": 0, "errors": 0}
+    
+    def _fetch(self, athlete_id):
+        """Téléchargement bloquant (thread du pool): enregistrement annoté ou None"""
+        record = fetch_record(athlete_id, self.session, PERSONAL_BESTS, cache=self.http_cache, metrics=self.metrics)
+        if record and self.standards:
+            self.standards.annotate_swimmers({athlete_id: record}, PERSONAL_BESTS)
+        return record
+    
+    async def _refresh(self, athlete_id):
+        try:
+            record = await asyncio.get_running_loop().run_in_executor(self.executor, self._fetch, athlete_id)
+        except Exception as e:
+            print(f"  Erreur {athlete_id}: {e}", file=sys.stderr)
+            record = None
+        finally:
+            del self.inflight[athlete_id]
+            # Requêtes réellement envoyées à SwimRankings (200 ou 304)
+            self.stats["upstream"] = self.metrics.counters["requests"]
+            self.stats["notModified"] = self.metrics.counters["notModified"]
+        if record is None:
+            self.stats["errors"] += 1
+        else:
+            self.cache.put(athlete_id, record)
+        return record
+    
+    def refresh(self, athlete_id):
+        """Tâche de téléchargement de l'athlète, partagée avec les requêtes simultanées"""
+        task = self.inflight.get(athlete_id)
+        if task is None:
+            task = self.inflight[athlete_id] = asyncio.ensure_future(self._refresh(athlete_id))
+        else:
+            self.stats["coalesced"] += 1
+        return task
+    
+    async def get(self, athlete_id):
+        """Retourne (enregistrement ou None, état du cache: HIT, STALE, MISS)"""
+        self.stats["requests"] += 1
+        record, state = self.cache.get(athlete_id)
+        if state == "fresh":
+            self.stats["hits"] += 1
+            return record, "HIT"
+        if state == "stale":
+            # Servi tout de suite, rafraîchi en arrière-plan
+            self.stats["stale"] += 1
+            self.refresh(athlete_id)
+            return record, "STALE"
+        self.stats["misses"] += 1
+        # shield: un client qui se déconnecte n'annule pas le téléchargement partagé
+        return await asyncio.shield(self.refresh(athlete_id)), "MISS"
+
+
+def http_response(status, body, content_type="application/json", headers=None):
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+             f"Content-Type: {content_type}; charset=utf-8",
+             f"Content-Length: {len(body)}",
+             "Connection: close"]
+    for name, value in {**CORS_HEADERS, **(headers or {})}.items():
+        lines.append(f"{name}: {value}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def json_response(status, document, headers=None):
+    return http_response(status, json.dumps(document, ensure_ascii=False), headers=headers)
+
+
+async def handle_request(proxy, method, target):
+    """Réponse HTTP complète (octets) pour une requête"""
+    if method == "OPTIONS":
+        return http_response(204, b"", "text/plain")
+    if method != "GET":
+        return json_response(405, {"error": "Method not allowed"})
+    
+    url = urlsplit(target)
+    if url.path == "/stats":
+        return json_response(200, {**proxy.stats, "entries": len(proxy.cache.entries),
+                                   "inflight": len(proxy.inflight)})
+    if url.path not in ("/", ""):
+        return json_response(404, {"error": "Not found"})
+    
+    athlete_id = (parse_qs(url.query).get("athleteId") or [""])[0]
+    if not athlete_id:
+        return http_response(200, HOME_PAGE, "text/html")
+    if not ATHLETE_ID_RE.match(athlete_id):
+        return json_response(400, {"error": "Invalid athleteId format"})
+    
+    record, state = await proxy.get(athlete_id)
+    if record is None:
+        # SwimRankings en erreur: dernière version connue si elle existe encore
+        record, _ = proxy.cache.get(athlete_id)
+        if record is None:
+            return json_response(502, {"error": "SwimRankings indisponible"})
+        state = "STALE"
+    
+    max_age = max(0, int(proxy.cache.ttl - proxy.cache.age(athlete_id))) if state == "HIT" else 0
+    return json_response(200, record, {"Cache-Control": f"public, max-age={max_age}", "X-Cache": state})
+
+
+async def handle_connection(proxy, reader, writer):
+    try:
+        request_line = await reader.readline()
+        if not request_line or len(request_line) > MAX_REQUEST_LINE:
+            return
+        # En-têtes ignorés (lus jusqu'à la ligne vide)
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.decode("latin-1").split()
+        if len(parts) < 2:
+            writer.write(json_response(400, {"error": "Bad request"}))
+        else:
+            writer.write(await handle_request(proxy, parts[0].upper(), parts[1]))
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    except Exception as e:
+        print(f"  Erreur requête: {e}", file=sys.stderr)
+    finally:
+        writer.close()
+
+
+async def serve(proxy, host, port):
+    server = await asyncio.start_server(lambda r, w: handle_connection(proxy, r, w), host, port)
+    print(f"Proxy SwimRankings sur http://{host}:{port}/?athleteId=...", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proxy SwimRankings (JSON athlète), cache et requêtes partagées")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"adresse d'écoute (défaut: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (défaut: {DEFAULT_PORT})")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL,
+                        help=f"durée en secondes pendant laquelle un athlète est servi sans rafraîchissement "
+                             f"(défaut: {DEFAULT_TTL})")
+    parser.add_argument("--stale", type=float, default=DEFAULT_STALE,
+                        help=f"durée supplémentaire pendant laquelle il est servi et rafraîchi en arrière-plan "
+                             f"(défaut: {DEFAULT_STALE})")
+    parser.add_argument("--max-entries", type=int, default=DEFAULT_MAX_ENTRIES,
+                        help=f"athlètes gardés en mémoire au maximum (défaut: {DEFAULT_MAX_ENTRIES})")
+    parser.add_argument("--standards", default=DEFAULT_STANDARDS, metavar="FICHIER",
+                        help="temps limites pour les points FINA et les écarts (défaut: temps-limites.json)")
+    add_http_arguments(parser)
+    args = parser.parse_args()
+    
+    # Cache disque en revalidation seule (TTL 0): sinon son propre TTL (--cache-ttl) s'ajouterait à --ttl
+    http_cache = None if args.no_cache else HttpCache(args.cache_dir, ttl=0, refresh=args.refresh)
+    proxy = AthleteProxy(make_session(args), http_cache, TtlLruCache(args.max_entries, args.ttl, args.stale),
+                         load_standards(args.standards), args.workers)
+    try:
+        asyncio.run(serve(proxy, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Publication compacte des données pour l'application (un fichier par nageur)
+
+Écrit dans <répertoire>/:
+- index.json: _metadata (date, saison) et liste des nageurs (id, nom, club, sexe,
+  nombre de records, hash du fichier du nageur)
+- swimmers/<id>.json: profil, records personnels et meilleurs temps de la saison
+- une copie .gz (et .br si le module brotli est installé) de chaque fichier,
+  servie directement par NGINX (gzip_static / brotli_static)
+
+Les fichiers sont minifiés et ne sont réécrits que si leur contenu change; l'app
+charge index.json puis uniquement swimmers/<id>.json?v=<hash> du nageur choisi.
+
+Usage: python publish.py [--data swimmers-data.json] [--season swimmers-season.json] [--output data]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+from swimrankings import SEASON_BESTS, build_output, latest_update, load_output
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_PUBLISH_DIR = "data"
+INDEX_FILE = "index.json"
+SWIMMERS_DIR = "swimmers"
+
+# Champs du nageur repris dans l'index (sélecteur de profil)
+INDEX_FIELDS = ("id", "fullName", "club", "gender", "yearOfBirth")
+
+
+def dumps_compact(document):
+    """JSON minifié (sans espaces, UTF-8 non échappé)"""
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+def write_artifact(path, content):
+    """Écrit `path` et ses copies compressées si le contenu a changé; retourne True si écrit"""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    variants = [(path, content), (path + ".gz", gzip.compress(content, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((path + ".br", brotli.compress(content, quality=11)))
+    
+    for variant_path, variant in variants:
+        tmp_path = f"{variant_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(variant)
+        os.replace(tmp_path, variant_path)
+    return True
+
+
+def remove_artifact(path):
+    for variant_path in (path, path + ".gz", path + ".br"):
+        if os.path.exists(variant_path):
+            os.remove(variant_path)
+
+
+def swimmer_document(record, season_record=None):
+    """Fichier d'un nageur: enregistrement des records + meilleurs temps de la saison"""
+    document = dict(record)
+    document[SEASON_BESTS] = (season_record or {}).get(SEASON_BESTS, [])
+    return document
+
+
+def publish(directory, swimmers, season_swimmers, season_year=None):
+    """Écrit l'index et les fichiers par nageur; retourne (fichiers écrits, fichiers supprimés)"""
+    swimmers_dir = os.path.join(directory, SWIMMERS_DIR)
+    entries = []
+    written = 0
+    
+    for athlete_id, record in swimmers.items():
+        content = dumps_compact(swimmer_document(record, season_swimmers.get(athlete_id)))
+        written += write_artifact(os.path.join(swimmers_dir, f"{athlete_id}.json"), content)
+        
+        entry = {field: record.get(field) for field in INDEX_FIELDS}
+        entry["personalBests"] = len(record.get("personalBests", []))
+        entry["seasonBests"] = len((season_swimmers.get(athlete_id) or {}).get(SEASON_BESTS, []))
+        entry["hash"] = content_hash(content)
+        entries.append(entry)
+    
+    # Nageurs retirés de la liste
+    removed = 0
+    if os.path.isdir(swimmers_dir):
+        for name in os.listdir(swimmers_dir):
+            if name.endswith(".json") and name[:-len(".json")] not in swimmers:
+                remove_artifact(os.path.join(swimmers_dir, name))
+                removed += 1
+    
+    # Date des données les plus récentes: l'index ne change pas si aucun nageur n'a changé
+    index = build_output(entries, season_year, generated=latest_update(swimmers))
+    written += write_artifact(os.path.join(directory, INDEX_FILE), dumps_compact(index))
+    return written, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publie les données par nageur (minifiées et précompressées)")
+    parser.add_argument("--data", default="swimmers-data.json", help="fichier des records personnels")
+    parser.add_argument("--season", default="swimmers-season.json", help="fichier des meilleurs temps de la saison")
+    parser.add_argument("--output", default=DEFAULT_PUBLISH_DIR,
+                        help=f"répertoire de publication (défaut: {DEFAULT_PUBLISH_DIR})")
+    args = parser.parse_args()
+    
+    data = load_output(args.data)
+    if data is None:
+        print(f"Impossible de lire {args.data}", file=sys.stderr)
+        sys.exit(1)
+    season = load_output(args.season) or {"_metadata": {}, "swimmers": {}}
+    season_year = season["_metadata"].get("season", {}).get("year")
+    
+    written, removed = publish(args.output, data["swimmers"], season["swimmers"], season_year)
+    print(f"{args.output}: {len(data['swimmers'])} nageurs, {written} fichiers écrits, {removed} supprimés"
+          f"{'' if brotli else ' (module brotli absent: pas de .br)'}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Composition des relais à partir des meilleurs temps individuels de l'effectif
+
+Pour chaque sexe et bassin: relais 4×50 / 4×100 nage libre et 4 nages, meilleure
+composition et k suivantes (--top). Un nageur ne nage qu'un parcours par relais.
+Le temps d'un relais est la somme des temps individuels (départ plongé, sans
+correction des relais lancés).
+
+Recherche exacte par séparation et évaluation (branch and bound) plutôt que par
+énumération: pour les k meilleures compositions, seuls les k + 3 plus rapides de
+chaque parcours peuvent être retenus (sinon k remplaçants plus rapides, libres,
+donneraient k compositions au moins aussi rapides); la recherche élague ensuite
+toute composition partielle dont la borne (temps déjà choisis + meilleur temps de
+chaque parcours restant) dépasse la k-ième meilleure trouvée. Instantané même
+pour plusieurs centaines de nageurs.
+
+Usage:
+    python relay_optimizer.py                              tous les relais, 3 compositions
+    python relay_optimizer.py --gender Female --pool 25 --born-from 2010 --born-to 2012 --top 5
+    python relay_optimizer.py --season --relay 4x100_Medley --json
+"""
+
+import argparse
+import heapq
+import json
+import sys
+from itertools import accumulate
+
+from swimrankings import PERSONAL_BESTS, SEASON_BESTS, load_output
+from time_codec import format_time
+
+GENDERS = ("Female", "Male")
+GENDER_LABELS = {"Female": "Dames", "Male": "Hommes"}
+POOLS = (25, 50)
+MEDLEY_ORDER = ("Backstroke", "Breaststroke", "Butterfly", "Freestyle")
+
+# Relais: (distance par parcours, nages des parcours dans l'ordre)
+RELAYS = {
+    "4x50_Freestyle": (50, ("Freestyle",) * 4),
+    "4x100_Freestyle": (100, ("Freestyle",) * 4),
+    "4x50_Medley": (50, MEDLEY_ORDER),
+    "4x100_Medley": (100, MEDLEY_ORDER),
+}
+DEFAULT_TOP = 3
+
+
+def relay_candidates(swimmers, results_key=PERSONAL_BESTS, gender=None, pool=None, born_from=None, born_to=None):
+    """Meilleurs temps des nageurs retenus: {(distance, nage): [(temps ms, athlete_id)]}, triés
+    
+    Filtres: sexe, bassin, année de naissance (bornes incluses); un nageur sans
+    année de naissance est exclu dès qu'une borne est donnée.
+    """
+    candidates = {}
+    for athlete_id, record in swimmers.items():
+        if gender and record.get("gender") != gender:
+            continue
+        year = record.get("yearOfBirth")
+        if (born_from or born_to) and not year:
+            continue
+        if (born_from and year < born_from) or (born_to and year > born_to):
+            continue
+        for result in record.get(results_key, []):
+            if pool and result["poolLength"] != pool:
+                continue
+            if result.get("timeMs"):
+                candidates.setdefault((result["distance"], result["stroke"]), []).append(
+                    (result["timeMs"], athlete_id))
+    for times in candidates.values():
+        times.sort()
+    return candidates
+
+
+def best_lineups(legs, top=1):
+    """Les `top` meilleures affectations d'un nageur différent par parcours
+    
+    legs: une liste de candidats [(temps ms, athlete_id)] par parcours.
+    Retourne [(temps total, [(temps, athlete_id) par parcours])], du plus rapide au plus lent.
+    """
+    count = len(legs)
+    if count == 0 or top < 1:
+        return []
+    # Au-delà des top + count - 1 premiers d'un parcours, un nageur n'entre dans aucune des top compositions
+    legs = [sorted(candidates)[:top + count - 1] for candidates in legs]
+    if any(not candidates for candidates in legs):
+        return []
+    if all(candidates == legs[0] for candidates in legs):
+        return best_combinations(legs[0], count, top)
+    
+    # Parcours le plus contraint d'abord: moins de candidats, élagage plus précoce
+    order = sorted(range(count), key=lambda leg: (len(legs[leg]), legs[leg][0][0]))
+    # bound[d]: somme des meilleurs temps des parcours order[d:]
+    bound = list(accumulate((legs[leg][0][0] for leg in reversed(order)), initial=0))[::-1]
+    best = []  # tas des top meilleures: (-total, affectation)
+    chosen = [None] * count
+    used = set()
+    
+    def search(depth, total):
+        if depth == count:
+            entry = (-total, tuple(chosen))
+            if len(best) < top:
+                heapq.heappush(best, entry)
+            else:
+                heapq.heappushpop(best, entry)
+            return
+        leg = order[depth]
+        for time_ms, athlete_id in legs[leg]:
+            # Candidats triés: les suivants ne font pas mieux
+            if len(best) == top and total + time_ms + bound[depth + 1] >= -best[0][0]:
+                break
+            if athlete_id in used:
+                continue
+            chosen[leg] = (time_ms, athlete_id)
+            used.add(athlete_id)
+            search(depth + 1, total + time_ms)
+            used.discard(athlete_id)
+    
+    search(0, 0)
+    return [(-total, list(lineup)) for total, lineup in sorted(best, key=lambda entry: (-entry[0], entry[1]))]
+
+
+def best_combinations(candidates, count, top=1):
+    """Les `top` meilleurs groupes de `count` nageurs sur une même épreuve (relais nage libre)
+    
+    Sans ordre des parcours: chaque groupe est cherché une seule fois (indices croissants
+    dans la liste triée), borné par les temps des suivants dans la liste.
+    """
+    candidates = sorted(candidates)
+    # Un nageur n'a qu'un meilleur temps par épreuve: les IDs sont distincts
+    prefix = list(accumulate((time_ms for time_ms, _ in candidates), initial=0))
+    if len(candidates) < count:
+        return []
+    best = []
+    chosen = []
+    
+    def search(start, total):
+        remaining = count - len(chosen)
+        if remaining == 0:
+            entry = (-total, tuple(chosen))
+            if len(best) < top:
+                heapq.heappush(best, entry)
+            else:
+                heapq.heappushpop(best, entry)
+            return
+        for index in range(start, len(candidates) - remaining + 1):
+            # Borne: ce nageur et les remaining - 1 suivants, les plus rapides possibles
+            lower = total + prefix[index + remaining] - prefix[index]
+            if len(best) == top and lower >= -best[0][0]:
+                break
+            chosen.append(candidates[index])
+            search(index + 1, total + candidates[index][0])
+            chosen.pop()
+    
+    search(0, 0)
+    return [(-total, list(lineup)) for total, lineup in sorted(best, key=lambda entry: (-entry[0], entry[1]))]
+
+
+def optimize_relays(swimmers, results_key=PERSONAL_BESTS, genders=GENDERS, pools=POOLS, relays=tuple(RELAYS),
+                    born_from=None, born_to=None, top=DEFAULT_TOP):
+    """Compositions de chaque relais: [{gender, poolLength, relay, lineups: [...]}]"""
+    results = []
+    for gender in genders:
+        for pool in pools:
+            candidates = relay_candidates(swimmers, results_key, gender, pool, born_from, born_to)
+            for relay in relays:
+                distance, strokes = RELAYS[relay]
+                lineups = best_lineups([candidates.get((distance, stroke), []) for stroke in strokes], top)
+                results.append({
+                    "gender": gender,
+                    "poolLength": pool,
+                    "relay": relay,
+                    "lineups": [lineup_document(total, legs, strokes, swimmers) for total, legs in lineups],
+                })
+    return results
+
+
+def lineup_document(total, legs, strokes, swimmers):
+    """Composition au format JSON: temps total et parcours dans l'ordre du relais"""
+    if len(set(strokes)) == 1:
+        # Nage libre: ordre des parcours laissé à l'entraîneur, du plus rapide au plus lent
+        legs = sorted(legs)
+    return {
+        "timeMs": total,
+        "timeDisplay": format_time(total),
+        "legs": [{"stroke": stroke, "id": athlete_id, "fullName": swimmers[athlete_id].get("fullName", ""),
+                  "timeMs": time_ms, "timeDisplay": format_time(time_ms)}
+                 for stroke, (time_ms, athlete_id) in zip(strokes, legs)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Meilleures compositions des relais de l'effectif")
+    parser.add_argument("--data", default="swimmers-data.json", help="fichier des records personnels")
+    parser.add_argument("--season-data", default="swimmers-season.json",
+                        help="fichier des meilleurs temps de la saison")
+    parser.add_argument("--season", action="store_true", help="utilise les meilleurs temps de la saison")
+    parser.add_argument("--gender", choices=GENDERS, help="limite à un sexe")
+    parser.add_argument("--pool", type=int, choices=POOLS, help="limite à un bassin")
+    parser.add_argument("--relay", nargs="+", choices=list(RELAYS), help="relais à composer (défaut: tous)")
+    parser.add_argument("--born-from", type=int, metavar="ANNÉE", help="nageurs nés en ANNÉE ou après")
+    parser.add_argument("--born-to", type=int, metavar="ANNÉE", help="nageurs nés en ANNÉE ou avant")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP,
+                        help=f"compositions par relais (défaut: {DEFAULT_TOP})")
+    parser.add_argument("--json", action="store_true", help="sortie JSON")
+    args = parser.parse_args()
+    
+    document = load_output(args.season_data if args.season else args.data)
+    if document is None:
+        print(f"Fichier manquant ou illisible: {args.season_data if args.season else args.data}", file=sys.stderr)
+        sys.exit(1)
+    
+    results = optimize_relays(document["swimmers"], SEASON_BESTS if args.season else PERSONAL_BESTS,
+                              [args.gender] if args.gender else GENDERS, [args.pool] if args.pool else POOLS,
+                              args.relay or tuple(RELAYS), args.born_from, args.born_to, args.top)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    
+    for result in results:
+        print(f"{GENDER_LABELS[result['gender']]} {result['poolLength']}m - {result['relay'].replace('_', ' ')}")
+        if not result["lineups"]:
+            print("  pas assez de nageurs avec un temps")
+        for rank, lineup in enumerate(result["lineups"], 1):
+            legs = " | ".join(f"{leg['stroke'][:6]} {leg['fullName']} {leg['timeDisplay']}" for leg in lineup["legs"])
+            print(f"  {rank}. {lineup['timeDisplay']:>8}  {legs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Historique des résultats (SQLite) alimenté par les scrapers
+
+Chaque run ajoute les temps récupérés (records personnels, meilleurs temps de la
+saison, historiques d'épreuve) au lieu d'écraser le JSON: la progression d'un
+athlète se reconstruit par requête au lieu de parcourir l'historique git.
+
+Un résultat est identifié par (athlète, nage, distance, bassin, temps, date):
+le même temps vu sur plusieurs pages ou plusieurs runs n'est stocké qu'une fois.
+
+Usage:
+    python results_store.py import swimmers-data.json swimmers-season.json
+    python results_store.py query --athlete 5332548 --event "100 Breaststroke" --pool 25 --season 2026
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import datetime
+
+from swimrankings import get_season_dates, load_output
+
+DEFAULT_STORE = "swimmers-history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS athletes (
+    id TEXT PRIMARY KEY,
+    full_name TEXT,
+    gender TEXT,
+    year_of_birth INTEGER,
+    club TEXT,
+    nation TEXT,
+    updated TEXT
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    athlete_id TEXT NOT NULL,
+    stroke TEXT NOT NULL,
+    distance INTEGER NOT NULL,
+    pool_length INTEGER NOT NULL,
+    time_ms INTEGER NOT NULL,
+    time_display TEXT NOT NULL,
+    -- date ISO de la course, '' si inconnue (anciens JSON sans date)
+    swim_date TEXT NOT NULL DEFAULT '',
+    city TEXT,
+    meet TEXT,
+    source TEXT,
+    first_seen TEXT NOT NULL,
+    UNIQUE (athlete_id, stroke, distance, pool_length, time_ms, swim_date)
+);
+
+-- progression d'un athlète sur une épreuve
+CREATE INDEX IF NOT EXISTS results_athlete_event
+    ON results (athlete_id, stroke, distance, pool_length, swim_date);
+-- toutes les courses d'une épreuve sur une période (ex: 100 brasse 25m de la saison)
+CREATE INDEX IF NOT EXISTS results_event_date
+    ON results (stroke, distance, pool_length, swim_date);
+"""
+
+# Champs de profil copiés dans la table athletes
+ATHLETE_COLUMNS = (
+    ("full_name", "fullName"), ("gender", "gender"), ("year_of_birth", "yearOfBirth"),
+    ("club", "club"), ("nation", "nation"), ("updated", "lastUpdated"),
+)
+
+
+class ResultsStore:
+    """Base SQLite des résultats (une connexion, à utiliser depuis un seul thread)"""
+    
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+    
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def add_athlete(self, record):
+        """Crée ou met à jour le profil d'un athlète"""
+        columns = ", ".join(column for column, _ in ATHLETE_COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column, _ in ATHLETE_COLUMNS)
+        # Pas d'écriture si rien n'a changé: le fichier reste identique d'un run à l'autre
+        differs = " OR ".join(f"{column} IS NOT excluded.{column}" for column, _ in ATHLETE_COLUMNS)
+        self.conn.execute(
+            f"INSERT INTO athletes (id, {columns}) VALUES (?{', ?' * len(ATHLETE_COLUMNS)}) "
+            f"ON CONFLICT (id) DO UPDATE SET {updates} WHERE {differs}",
+            [record["id"]] + [record.get(field) for _, field in ATHLETE_COLUMNS],
+        )
+    
+    def add_results(self, athlete_id, results, source):
+        """Ajoute des résultats (format du JSON publié); retourne le nombre de nouveaux résultats"""
+        now = datetime.utcnow().isoformat() + "Z"
+        rows = [
+            (athlete_id, result["stroke"], result["distance"], result["poolLength"], result["timeMs"],
+             result["timeDisplay"], result.get("date") or "", result.get("city"), result.get("meet"), source, now)
+            for result in results
+        ]
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO results (athlete_id, stroke, distance, pool_length, time_ms, time_display, "
+            "swim_date, city, meet, source, first_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return self.conn.total_changes - before
+    
+    def add_record(self, record, results_key, source=None):
+        """Ajoute un enregistrement athlète (profil + liste de temps `results_key`)"""
+        self.add_athlete(record)
+        return self.add_results(record["id"], record.get(results_key, []), source or results_key)
+    
+    def add_document(self, document):
+        """Importe un document publié (swimmers-data.json ou swimmers-season.json)"""
+        results_key = "seasonBests" if "season" in document["_metadata"] else "personalBests"
+        return sum(self.add_record(record, results_key) for record in document["swimmers"].values())
+    
+    def commit(self):
+        self.conn.commit()
+    
+    def has_history(self, athlete_id):
+        """True si l'historique d'au moins une épreuve de l'athlète a déjà été importé"""
+        row = self.conn.execute("SELECT 1 FROM results WHERE athlete_id = ? AND source = 'history' LIMIT 1",
+                                (athlete_id,)).fetchone()
+        return row is not None
+    
+    def query(self, athlete_id=None, stroke=None, distance=None, pool_length=None, start=None, end=None):
+        """Courses filtrées, triées par date; start/end: dates ISO incluses"""
+        clauses = []
+        params = []
+        for column, value in (("athlete_id", athlete_id), ("stroke", stroke), ("distance", distance),
+                              ("pool_length", pool_length)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start:
+            clauses.append("swim_date >= ?")
+            params.append(start)
+        if end:
+            clauses.append("swim_date <= ?")
+            params.append(end)
+        
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            "SELECT athlete_id, stroke, distance, pool_length, time_ms, time_display, swim_date, city, meet "
+            f"FROM results {where} ORDER BY swim_date, time_ms",
+            params,
+        )
+        return [
+            {
+                "athleteId": row["athlete_id"],
+                "stroke": row["stroke"],
+                "distance": row["distance"],
+                "poolLength": row["pool_length"],
+                "timeMs": row["time_ms"],
+                "timeDisplay": row["time_display"],
+                "date": row["swim_date"] or None,
+                "city": row["city"],
+                "meet": row["meet"],
+            }
+            for row in rows
+        ]
+    
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+def make_store(args):
+    """Ouvre l'historique si --store est fourni"""
+    return ResultsStore(args.store) if args.store else None
+
+
+def parse_event(value):
+    """'100 Breaststroke' → (100, 'Breaststroke')"""
+    distance, _, stroke = value.partition(" ")
+    return int(distance), stroke.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Historique des résultats SwimRankings (SQLite)")
+    parser.add_argument("--store", default=DEFAULT_STORE, help=f"fichier SQLite (défaut: {DEFAULT_STORE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    import_parser = commands.add_parser("import", help="importe des fichiers JSON publiés")
+    import_parser.add_argument("files", nargs="+")
+    
+    query_parser = commands.add_parser("query", help="liste les courses en JSON")
+    query_parser.add_argument("--athlete", help="ID SwimRankings")
+    query_parser.add_argument("--event", type=parse_event, help='épreuve, ex: "100 Breaststroke"')
+    query_parser.add_argument("--pool", type=int, choices=(25, 50), help="longueur du bassin")
+    query_parser.add_argument("--season", type=int, help="année de fin de saison (ex: 2026 pour 2025-2026)")
+    query_parser.add_argument("--from", dest="start", help="date de début (AAAA-MM-JJ)")
+    query_parser.add_argument("--to", dest="end", help="date de fin (AAAA-MM-JJ)")
+    args = parser.parse_args()
+    
+    with ResultsStore(args.store) as store:
+        if args.command == "import":
+            for path in args.files:
+                document = load_output(path)
+                if document is None:
+                    print(f"  ✗ {path} illisible", file=sys.stderr)
+                    continue
+                added = store.add_document(document)
+                print(f"  ✓ {path}: {added} nouveaux résultats", file=sys.stderr)
+            print(f"{store.count()} résultats dans {args.store}", file=sys.stderr)
+            return
+        
+        start, end = args.start, args.end
+        if args.season:
+            dates = get_season_dates(args.season)
+            start, end = start or dates["start"], end or dates["end"]
+        distance, stroke = args.event or (None, None)
+        results = store.query(args.athlete, stroke, distance, args.pool, start, end)
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
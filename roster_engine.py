@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Calculs vectorisés sur tout l'effectif: points FINA, écarts aux temps limites, qualifications
+
+Charge swimmers-data.json, swimmers-season.json et temps-limites.json dans des tableaux
+NumPy (athlète × épreuve × bassin, temps en ms entiers, 0 = pas de temps), puis calcule
+en une passe les points FINA, les écarts à chaque catégorie et les qualifications.
+Nécessite numpy (pip install numpy).
+
+Usage:
+    python roster_engine.py --near CS --pct 2            nageurs à moins de 2% du temps limite CS
+    python roster_engine.py --near RSR_Hiver --season    idem avec les meilleurs temps de la saison
+    python roster_engine.py --summary                    qualifiés par catégorie
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from standards import CATEGORY_ORDER, DEFAULT_STANDARDS, FINA_BASE_TIMES, load_standards
+from swimrankings import PERSONAL_BESTS, SEASON_BESTS, load_output
+from time_codec import format_time
+
+GENDERS = ("Female", "Male")
+POOLS = (25, 50)
+# Épreuves individuelles ("100_Breaststroke"), dans l'ordre de la table FINA
+EVENTS = tuple(FINA_BASE_TIMES["Female"][25])
+
+GENDER_INDEX = {gender: i for i, gender in enumerate(GENDERS)}
+POOL_INDEX = {pool: i for i, pool in enumerate(POOLS)}
+EVENT_INDEX = {event: i for i, event in enumerate(EVENTS)}
+CATEGORY_INDEX = {category: i for i, category in enumerate(CATEGORY_ORDER)}
+
+
+def fina_points(times_ms, base_ms):
+    """Points FINA vectorisés (0 sans temps ou sans temps de base), arrondis comme Math.round"""
+    valid = (times_ms > 0) & (base_ms > 0)
+    ratio = np.divide(base_ms, times_ms, out=np.zeros(np.broadcast(times_ms, base_ms).shape),
+                      where=valid)
+    return np.where(valid, np.floor(1000 * ratio ** 3 + 0.5), 0).astype(np.int32)
+
+
+def fill_times(array, row, results):
+    """Copie une liste de temps (format du JSON publié) dans array[row, épreuve, bassin]"""
+    for result in results:
+        event = EVENT_INDEX.get(f"{result['distance']}_{result['stroke']}")
+        pool = POOL_INDEX.get(result["poolLength"])
+        if event is not None and pool is not None:
+            array[row, event, pool] = result["timeMs"]
+
+
+class Roster:
+    """Effectif en colonnes: une ligne par athlète
+    
+    pb_ms, season_ms: (athlètes, épreuves, bassins) int32
+    base_ms: (sexes, épreuves, bassins) temps de base FINA
+    limits_ms: (sexes, catégories, épreuves, bassins) temps limites, 0 si la catégorie
+    n'existe pas pour l'épreuve ou le bassin
+    """
+    
+    def __init__(self, swimmers, season_swimmers, standards):
+        self.ids = list(swimmers)
+        self.names = [swimmers[athlete_id].get("fullName", "") for athlete_id in self.ids]
+        self.gender = np.array([GENDER_INDEX.get(swimmers[athlete_id].get("gender"), 0)
+                                for athlete_id in self.ids], dtype=np.int8)
+        
+        shape = (len(self.ids), len(EVENTS), len(POOLS))
+        self.pb_ms = np.zeros(shape, dtype=np.int32)
+        self.season_ms = np.zeros(shape, dtype=np.int32)
+        for row, athlete_id in enumerate(self.ids):
+            fill_times(self.pb_ms, row, swimmers[athlete_id].get(PERSONAL_BESTS, []))
+            season_record = season_swimmers.get(athlete_id) or {}
+            fill_times(self.season_ms, row, season_record.get(SEASON_BESTS, []))
+        
+        self.base_ms = np.zeros((len(GENDERS), len(EVENTS), len(POOLS)), dtype=np.float64)
+        self.limits_ms = np.zeros((len(GENDERS), len(CATEGORY_ORDER), len(EVENTS), len(POOLS)), dtype=np.int32)
+        for g, gender in enumerate(GENDERS):
+            for pool, events in FINA_BASE_TIMES[gender].items():
+                for event, base in events.items():
+                    self.base_ms[g, EVENT_INDEX[event], POOL_INDEX[pool]] = base
+            for pool, events in standards.limits.get(gender, {}).items():
+                for event, limits in events.items():
+                    if event not in EVENT_INDEX or pool not in POOL_INDEX:
+                        continue
+                    e, p = EVENT_INDEX[event], POOL_INDEX[pool]
+                    for category, limit_ms in limits:
+                        self.limits_ms[g, CATEGORY_INDEX[category], e, p] = limit_ms
+    
+    def times(self, season=False):
+        return self.season_ms if season else self.pb_ms
+    
+    def evaluate(self, season=False):
+        """Une passe sur tout l'effectif; retourne un dict de tableaux
+        
+        points: (A, E, P); limits, gaps, valid, qualified: (A, C, E, P)
+        gaps = temps - limite (ms), valide seulement si temps et limite existent
+        """
+        times = self.times(season)
+        points = fina_points(times, self.base_ms[self.gender])
+        limits = self.limits_ms[self.gender]
+        valid = (times[:, None] > 0) & (limits > 0)
+        gaps = np.where(valid, times[:, None] - limits, 0)
+        return {
+            "points": points,
+            "limits": limits,
+            "gaps": gaps,
+            "valid": valid,
+            "qualified": valid & (gaps <= 0),
+        }
+    
+    def near(self, category, pct, season=False, pool=None):
+        """Temps non qualifiés à moins de `pct`% de la limite de `category`, triés par écart relatif"""
+        result = self.evaluate(season)
+        c = CATEGORY_INDEX[category]
+        gaps = result["gaps"][:, c]
+        limits = result["limits"][:, c]
+        mask = result["valid"][:, c] & (gaps > 0) & (gaps * 100 <= limits * pct)
+        if pool is not None:
+            mask[:, :, [i for i, length in enumerate(POOLS) if length != pool]] = False
+        
+        rows, events, pools = np.nonzero(mask)
+        relative = gaps[rows, events, pools] / limits[rows, events, pools] * 100
+        times = self.times(season)
+        return [
+            {
+                "id": self.ids[a],
+                "fullName": self.names[a],
+                "event": EVENTS[e],
+                "poolLength": POOLS[p],
+                "timeMs": int(times[a, e, p]),
+                "limitMs": int(limits[a, e, p]),
+                "gapMs": int(gaps[a, e, p]),
+                "gapPct": round(float(rel), 2),
+                "finaPoints": int(result["points"][a, e, p]),
+            }
+            for (a, e, p), rel in sorted(zip(zip(rows, events, pools), relative),
+                                         key=lambda item: item[1])
+        ]
+    
+    def summary(self, season=False):
+        """Nombre de nageurs et de temps qualifiés par catégorie"""
+        qualified = self.evaluate(season)["qualified"]
+        return {
+            category: {
+                "swimmers": int(qualified[:, c].any(axis=(1, 2)).sum()),
+                "times": int(qualified[:, c].sum()),
+            }
+            for category, c in CATEGORY_INDEX.items()
+        }
+
+
+def load_roster(data_path="swimmers-data.json", season_path="swimmers-season.json",
+                standards_path=DEFAULT_STANDARDS):
+    """Charge les deux JSON publiés et les temps limites; FileNotFoundError si un fichier manque"""
+    data = load_output(data_path)
+    if data is None:
+        raise FileNotFoundError(data_path)
+    season = load_output(season_path) or {"swimmers": {}}
+    standards = load_standards(standards_path)
+    if standards is None:
+        raise FileNotFoundError(standards_path)
+    return Roster(data["swimmers"], season["swimmers"], standards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Points FINA et qualifications de tout l'effectif")
+    parser.add_argument("--data", default="swimmers-data.json", help="fichier des records personnels")
+    parser.add_argument("--season-data", default="swimmers-season.json",
+                        help="fichier des meilleurs temps de la saison")
+    parser.add_argument("--standards", default=DEFAULT_STANDARDS, help="fichier des temps limites")
+    parser.add_argument("--season", action="store_true", help="utilise les meilleurs temps de la saison")
+    parser.add_argument("--near", choices=CATEGORY_ORDER, help="catégorie dont on cherche les temps proches")
+    parser.add_argument("--pct", type=float, default=2.0, help="écart maximum en %% de la limite (défaut: 2)")
+    parser.add_argument("--pool", type=int, choices=POOLS, help="limite la recherche à un bassin")
+    parser.add_argument("--summary", action="store_true", help="nombre de qualifiés par catégorie")
+    parser.add_argument("--json", action="store_true", help="sortie JSON")
+    args = parser.parse_args()
+    
+    try:
+        roster = load_roster(args.data, args.season_data, args.standards)
+    except FileNotFoundError as e:
+        print(f"Fichier manquant ou illisible: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.near:
+        rows = roster.near(args.near, args.pct, args.season, args.pool)
+        if args.json:
+            print(json.dumps(rows, indent=2, ensure_ascii=False))
+            return
+        print(f"{len(rows)} temps à moins de {args.pct}% de la limite {args.near}")
+        for row in rows:
+            print(f"  {row['fullName']:<28} {row['event']:<18} {row['poolLength']}m "
+                  f"{format_time(row['timeMs']):>9} / {format_time(row['limitMs']):>9}  +{row['gapPct']:.2f}% "
+                  f"({row['finaPoints']} pts)")
+    else:
+        summary = roster.summary(args.season)
+        if args.json:
+            print(json.dumps(summary, indent=2))
+            return
+        for category, counts in summary.items():
+            print(f"  {category:<10} {counts['swimmers']:>4} nageurs, {counts['times']:>4} temps qualifiés")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Planificateur des mises à jour: rafraîchit chaque athlète selon son activité, dans un budget de requêtes
+
+Au lieu de tout re-télécharger une fois par jour, chaque athlète reçoit un intervalle
+de rafraîchissement:
+- compétition en cours ou imminente (fichier --meets): toutes les 2 heures
+- résultats modifiés récemment (lastUpdated, date de la dernière course): de 6 heures
+  (moins de 7 jours) à 7 jours (inactif depuis plus de 6 mois)
+Les athlètes dus passent par une file de priorité (le plus en retard par rapport à son
+intervalle d'abord) et sont mis à jour par lots avec update_swimmers.py --only, sans
+dépasser --budget requêtes par heure (2 requêtes par athlète, plus l'historique estimé
+avec --history). Seuls les athlètes effectivement mis à jour sont marqués vérifiés: ceux
+en erreur (--failed-file de update_swimmers.py) restent dus.
+
+Fichier des compétitions (JSON):
+    [{"name": "Championnats romands", "date": "2026-11-14", "end": "2026-11-15",
+      "athletes": ["5332548"]}]        (sans "athletes": tous les nageurs suivis)
+
+Usage:
+    python scheduler.py --ids-file athletes.txt --meets meets.json -- --store swimmers-history.db --publish-dir data
+    python scheduler.py --once ...      un seul passage (ex: cron toutes les heures)
+Les options après -- sont transmises à update_swimmers.py.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from swimrankings import PERSONAL_BESTS, SEASON_BESTS, load_output, parse_timestamp, read_id_file
+
+DEFAULT_STATE = "scheduler-state.json"
+DEFAULT_BUDGET = 600  # requêtes par heure
+DEFAULT_BATCH = 25
+DEFAULT_POLL = 300  # secondes entre deux passages au maximum
+# Clé de l'état réservée au seau à jetons (les autres clés sont des IDs d'athlètes)
+BUDGET_KEY = "_budget"
+
+# Requêtes par athlète mis à jour (records + saison)
+REQUESTS_PER_ATHLETE = 2
+# Avec --history: pages d'historique par athlète (une par épreuve), estimation moyenne
+HISTORY_REQUESTS_PER_ATHLETE = 8
+
+# Intervalle de rafraîchissement selon l'ancienneté de la dernière activité (jours → heures)
+ACTIVITY_INTERVALS = ((7, 6), (30, 24), (180, 72))
+DORMANT_INTERVAL = 7 * 24
+MEET_INTERVAL = 2
+# Fenêtre d'une compétition: la veille jusqu'à 2 jours après (publication des résultats)
+MEET_BEFORE = timedelta(days=1)
+MEET_AFTER = timedelta(days=2)
+
+
+class RequestBudget:
+    """Seau à jetons: `per_hour` requêtes par heure, au plus `burst` d'un coup
+    
+    tokens, updated: état d'un run précédent (voir snapshot), pour que le budget tienne
+    d'un run --once à l'autre; sans état, le seau est plein.
+    """
+    
+    def __init__(self, per_hour, burst=None, tokens=None, updated=None):
+        self.rate = per_hour / 3600
+        self.capacity = burst or max(REQUESTS_PER_ATHLETE, per_hour // 4)
+        self.tokens = self.capacity if tokens is None else min(self.capacity, tokens)
+        # Horloge murale (et non monotonic): l'état est repris par un autre processus
+        self.updated = time.time() if updated is None else updated
+    
+    def _refill(self):
+        now = time.time()
+        self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = now
+    
+    def snapshot(self):
+        """État à enregistrer: {tokens, updated} (updated en secondes depuis l'epoch)"""
+        self._refill()
+        return {"tokens": self.tokens, "updated": self.updated}
+    
+    def available(self):
+        self._refill()
+        return int(self.tokens)
+    
+    def spend(self, count):
+        self._refill()
+        self.tokens -= count
+    
+    def wait_time(self, count):
+        """Secondes avant de disposer de `count` jetons"""
+        self._refill()
+        return max(0.0, (count - self.tokens) / self.rate) if self.rate else float("inf")
+
+
+def load_meets(path):
+    """Compétitions: [(début, fin, IDs ou None pour tous)]"""
+    if not path:
+        return []
+    with open(path, encoding="utf-8") as f:
+        meets = json.load(f)
+    windows = []
+    for meet in meets:
+        start = datetime.fromisoformat(meet["date"])
+        end = datetime.fromisoformat(meet.get("end") or meet["date"]) + timedelta(days=1)
+        athletes = set(meet["athletes"]) if meet.get("athletes") else None
+        windows.append((start - MEET_BEFORE, end + MEET_AFTER, athletes))
+    return windows
+
+
+def last_activity(record):
+    """Date de la dernière activité connue: changement des résultats ou dernière course"""
+    dates = [parse_timestamp(record.get("lastUpdated"))]
+    for key in (PERSONAL_BESTS, SEASON_BESTS):
+        for result in record.get(key, []):
+            if result.get("date"):
+                dates.append(datetime.fromisoformat(result["date"]))
+    dates = [date for date in dates if date]
+    return max(dates) if dates else None
+
+
+def refresh_interval(athlete_id, activity, meets, now):
+    """Intervalle de rafraîchissement en heures"""
+    for start, end, athletes in meets:
+        if start <= now <= end and (athletes is None or athlete_id in athletes):
+            return MEET_INTERVAL
+    if activity is None:
+        return ACTIVITY_INTERVALS[0][1]
+    age_days = (now - activity).total_seconds() / 86400
+    for max_days, hours in ACTIVITY_INTERVALS:
+        if age_days <= max_days:
+            return hours
+    return DORMANT_INTERVAL
+
+
+def build_queue(athlete_ids, records, checked, meets, now):
+    """File de priorité des athlètes: [(-retard relatif, prochaine échéance, id)]
+    
+    Le retard relatif vaut (temps depuis la dernière vérification) / intervalle;
+    un athlète jamais vérifié passe en premier.
+    """
+    queue = []
+    for athlete_id in athlete_ids:
+        record = records.get(athlete_id) or {}
+        interval = timedelta(hours=refresh_interval(athlete_id, last_activity(record), meets, now))
+        last_checked = parse_timestamp(checked.get(athlete_id))
+        if last_checked is None:
+            overdue = float("inf")
+            due = now
+        else:
+            overdue = (now - last_checked) / interval
+            due = last_checked + interval
+        heapq.heappush(queue, (-overdue, due, athlete_id))
+    return queue
+
+
+def load_state(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_state(path, state):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def requests_per_athlete(update_args):
+    """Requêtes estimées par athlète pour les options transmises à update_swimmers.py"""
+    return REQUESTS_PER_ATHLETE + (HISTORY_REQUESTS_PER_ATHLETE if "--history" in update_args else 0)
+
+
+def run_update_script(arguments):
+    """Lance update_swimmers.py avec `arguments`
+    
+    Retourne les IDs en erreur (lus dans son --failed-file), [] si tous ont été mis à jour,
+    ou None si le run a échoué.
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "update_swimmers.py")
+    fd, failed_path = tempfile.mkstemp(prefix="update-failed-", suffix=".txt")
+    os.close(fd)
+    try:
+        if subprocess.run([sys.executable, script, *arguments, "--failed-file", failed_path]).returncode != 0:
+            return None
+        return read_id_file(failed_path)
+    finally:
+        os.remove(failed_path)
+
+
+def run_batch(athlete_ids, update_args):
+    """Met à jour un lot avec update_swimmers.py --only; retourne les IDs en erreur (None si le run a échoué)"""
+    return run_update_script([*update_args, "--only", *athlete_ids])
+
+
+def tracked_ids(args, document):
+    """Athlètes suivis: --ids-file, sinon ceux du document publié"""
+    if args.ids_file:
+        return list(dict.fromkeys(read_id_file(args.ids_file)))
+    return list((document or {}).get("swimmers", {}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Met à jour les athlètes par priorité, dans un budget de requêtes")
+    parser.add_argument("--ids-file", metavar="FICHIER", help="athlètes suivis (défaut: ceux de --data)")
+    parser.add_argument("--data", default="swimmers-data.json", help="records personnels (activité des athlètes)")
+    parser.add_argument("--meets", metavar="FICHIER", help="compétitions à venir (JSON)")
+    parser.add_argument("--state", default=DEFAULT_STATE,
+                        help=f"dates de dernière vérification par athlète et budget restant "
+                             f"(défaut: {DEFAULT_STATE})")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET,
+                        help=f"requêtes SwimRankings par heure au maximum (défaut: {DEFAULT_BUDGET})")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH,
+                        help=f"athlètes au plus par run de update_swimmers.py (défaut: {DEFAULT_BATCH})")
+    parser.add_argument("--poll", type=float, default=DEFAULT_POLL,
+                        help=f"attente maximum en secondes entre deux passages (défaut: {DEFAULT_POLL:.0f})")
+    parser.add_argument("--once", action="store_true", help="un seul passage puis sortie")
+    parser.add_argument("--dry-run", action="store_true", help="affiche la file sans rien télécharger")
+    args, update_args = parser.parse_known_args()
+    if update_args[:1] == ["--"]:
+        update_args = update_args[1:]
+    
+    state = load_state(args.state)
+    cost = requests_per_athlete(update_args)
+    saved_budget = state.get(BUDGET_KEY) or {}
+    # Au moins un athlète par seau plein, même avec l'historique
+    budget = RequestBudget(args.budget, max(cost, args.budget // 4), tokens=saved_budget.get("tokens"),
+                           updated=saved_budget.get("updated"))
+    
+    while True:
+        now = datetime.utcnow()
+        document = load_output(args.data)
+        athlete_ids = tracked_ids(args, document)
+        records = (document or {}).get("swimmers", {})
+        queue = build_queue(athlete_ids, records, state, load_meets(args.meets), now)
+        
+        due = []
+        next_due = None
+        while queue:
+            overdue, due_at, athlete_id = heapq.heappop(queue)
+            if due_at <= now:
+                due.append(athlete_id)
+            else:
+                next_due = min(next_due or due_at, due_at)
+        
+        if args.dry_run:
+            print(f"{len(due)}/{len(athlete_ids)} athlètes à mettre à jour (par priorité): {' '.join(due)}")
+            return
+        
+        batch = due[:min(args.batch, budget.available() // cost)]
+        if batch:
+            print(f"[{now:%Y-%m-%d %H:%M}] {len(batch)}/{len(due)} athlètes dus, budget {budget.available()} "
+                  f"requêtes", file=sys.stderr)
+            budget.spend(len(batch) * cost)
+            failed = run_batch(batch, update_args)
+            if failed is None:
+                print("  update_swimmers.py en erreur, lot repris au prochain passage", file=sys.stderr)
+            else:
+                checked_at = datetime.utcnow().isoformat() + "Z"
+                failed = set(failed)
+                for athlete_id in batch:
+                    if athlete_id not in failed:
+                        state[athlete_id] = checked_at
+                if failed:
+                    print(f"  {len(failed)} athlètes en erreur, repris au prochain passage", file=sys.stderr)
+            # Requêtes faites même en cas d'erreur: le budget dépensé est enregistré
+            state[BUDGET_KEY] = budget.snapshot()
+            save_state(args.state, state)
+        
+        if args.once:
+            return
+        
+        # Prochain passage: athlètes encore dus (attente du budget) ou prochaine échéance
+        if len(due) > len(batch):
+            delay = budget.wait_time(cost * min(args.batch, len(due) - len(batch)))
+        elif next_due is not None:
+            delay = (next_due - datetime.utcnow()).total_seconds()
+        else:
+            delay = args.poll
+        time.sleep(min(max(delay, 1.0), args.poll))
+
+
+if __name__ == "__main__":
+    main()
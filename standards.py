@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Points FINA et écarts aux temps limites, calculés une fois par run
+
+Les temps limites de temps-limites.json sont convertis en millisecondes au chargement;
+chaque record personnel / meilleur temps de la saison reçoit ensuite:
+- finaPoints: points FINA (même formule et mêmes temps de base que app.js)
+- standards: pour chaque catégorie du bassin (JO_A, JO_B, CS, CS_Hiver, RSR_Ete, RSR_Hiver),
+  {"limitMs", "gapMs", "finaPoints"}; gapMs <= 0 signifie temps limite réussi
+"""
+
+import json
+import os
+import sys
+
+from time_codec import parse_time
+
+DEFAULT_STANDARDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "temps-limites.json")
+
+# Ordre d'affichage des catégories (du plus exigeant au plus accessible, comme app.js)
+CATEGORY_ORDER = ("JO_A", "JO_B", "CS", "CS_Hiver", "RSR_Ete", "RSR_Hiver")
+
+# Temps de base FINA 2025 en ms (table World Aquatics, copie de FINA_BASE_TIMES dans app.js)
+FINA_BASE_TIMES = {
+    "Male": {
+        25: {
+            "50_Freestyle": 19900, "100_Freestyle": 44840, "200_Freestyle": 98610, "400_Freestyle": 212250,
+            "800_Freestyle": 440460, "1500_Freestyle": 846880, "50_Backstroke": 22110, "100_Backstroke": 48330,
+            "200_Backstroke": 105630, "50_Breaststroke": 24950, "100_Breaststroke": 55280,
+            "200_Breaststroke": 120160, "50_Butterfly": 21320, "100_Butterfly": 47710, "200_Butterfly": 106850,
+            "100_Medley": 49280, "200_Medley": 108880, "400_Medley": 234810,
+        },
+        50: {
+            "50_Freestyle": 20910, "100_Freestyle": 46400, "200_Freestyle": 102000, "400_Freestyle": 220070,
+            "800_Freestyle": 452120, "1500_Freestyle": 870670, "50_Backstroke": 23550, "100_Backstroke": 51600,
+            "200_Backstroke": 111920, "50_Breaststroke": 25950, "100_Breaststroke": 56880,
+            "200_Breaststroke": 125480, "50_Butterfly": 22270, "100_Butterfly": 49450, "200_Butterfly": 110340,
+            "200_Medley": 114000, "400_Medley": 242500,
+        },
+    },
+    "Female": {
+        25: {
+            "50_Freestyle": 22830, "100_Freestyle": 50250, "200_Freestyle": 110310, "400_Freestyle": 230250,
+            "800_Freestyle": 477420, "1500_Freestyle": 908240, "50_Backstroke": 25230, "100_Backstroke": 54020,
+            "200_Backstroke": 118040, "50_Breaststroke": 28370, "100_Breaststroke": 62360,
+            "200_Breaststroke": 132500, "50_Butterfly": 23940, "100_Butterfly": 52710, "200_Butterfly": 119320,
+            "100_Medley": 55110, "200_Medley": 121630, "400_Medley": 255480,
+        },
+        50: {
+            "50_Freestyle": 23610, "100_Freestyle": 51710, "200_Freestyle": 112230, "400_Freestyle": 235380,
+            "800_Freestyle": 484790, "1500_Freestyle": 920480, "50_Backstroke": 26860, "100_Backstroke": 57130,
+            "200_Backstroke": 123140, "50_Breaststroke": 29160, "100_Breaststroke": 64130,
+            "200_Breaststroke": 137550, "50_Butterfly": 24430, "100_Butterfly": 55180, "200_Butterfly": 121810,
+            "200_Medley": 126120, "400_Medley": 264380,
+        },
+    },
+}
+
+
+def fina_points(time_ms, base_ms):
+    """Points FINA = 1000 × (temps de base / temps)³, arrondi comme Math.round"""
+    if not time_ms or not base_ms:
+        return None
+    return int(1000 * (base_ms / time_ms) ** 3 + 0.5)
+
+
+class Standards:
+    """Temps limites (ms) indexés par sexe, bassin et épreuve"""
+    
+    def __init__(self, document):
+        self.version = document.get("_metadata", {}).get("version")
+        categories = document.get("categories", {})
+        # {sexe: {bassin: {"100_Breaststroke": [(catégorie, limite ms), ...]}}}
+        self.limits = {}
+        for gender in ("Female", "Male"):
+            for pool_key, events in document.get(gender, {}).items():
+                pool_length = int(pool_key.rstrip("m"))
+                for event, limits in events.items():
+                    self.limits.setdefault(gender, {}).setdefault(pool_length, {})[event] = [
+                        (category, parse_time(limits[category]))
+                        for category in CATEGORY_ORDER
+                        if category in limits
+                        # Catégorie d'un autre bassin (ex: CS_Hiver en 50m): ignorée, comme dans l'app
+                        and categories.get(category, {}).get("poolLength") in (None, pool_length)
+                    ]
+    
+    def annotate(self, result, gender):
+        """Ajoute finaPoints et standards à un résultat (format du JSON publié)"""
+        event = f"{result['distance']}_{result['stroke']}"
+        pool_length = result["poolLength"]
+        base_ms = FINA_BASE_TIMES.get(gender, {}).get(pool_length, {}).get(event)
+        
+        result["finaPoints"] = fina_points(result["timeMs"], base_ms)
+        result["standards"] = {
+            category: {
+                "limitMs": limit_ms,
+                "gapMs": result["timeMs"] - limit_ms,
+                "finaPoints": fina_points(limit_ms, base_ms),
+            }
+            for category, limit_ms in self.limits.get(gender, {}).get(pool_length, {}).get(event, [])
+        }
+        return result
+    
+    def annotate_swimmers(self, swimmers, results_key):
+        """Annote tous les temps `results_key` des nageurs d'un document"""
+        for record in swimmers.values():
+            gender = record.get("gender") or "Female"
+            for result in record.get(results_key, []):
+                self.annotate(result, gender)
+
+
+def load_standards(path=DEFAULT_STANDARDS):
+    """Charge temps-limites.json; retourne None (avec un avertissement) s'il est absent ou invalide"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return Standards(json.load(f))
+    except (OSError, ValueError) as e:
+        print(f"  Temps limites non chargés ({path}): {e}", file=sys.stderr)
+        return None
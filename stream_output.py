@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Écriture en flux des documents publiés (swimmers-data.json, swimmers-season.json)
+
+Chaque enregistrement est ajouté à un journal NDJSON (une ligne JSON par athlète) dès
+qu'il est parsé, au lieu d'être gardé en mémoire jusqu'à la fin du run. Le document
+final est ensuite assemblé en relisant le journal ligne par ligne (_metadata calculé au
+fil des ajouts: count, generated), écrit à côté puis remplacé d'un coup (os.replace).
+Le résultat est identique, octet pour octet, à write_json(build_output(...)).
+
+Après un crash, le journal (<sortie>.journal.ndjson) est relu au run suivant: les
+athlètes déjà écrits ne sont pas re-téléchargés. Il est supprimé une fois le document écrit.
+Sa première ligne décrit le run (saison, shard, liste d'IDs, voir journal_header): un
+journal laissé par un autre run (autre saison ou autre liste) est ignoré et remplacé.
+
+    python fetch_swimmers.py --ids-file athletes.txt --output swimmers-data.json
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+from swimrankings import latest_update
+
+JOURNAL_SUFFIX = ".journal.ndjson"
+
+
+def journal_path(output):
+    """Journal d'un document de sortie; None pour stdout (journal temporaire, sans reprise)"""
+    return None if output in (None, "-") else output + JOURNAL_SUFFIX
+
+
+def journal_header(athlete_ids, season_year=None, shard=None):
+    """En-tête d'un journal: le run qui l'a écrit (saison, shard, IDs demandés)"""
+    return {"journal": {"season": season_year, "shard": list(shard) if shard else None, "ids": list(athlete_ids)}}
+
+
+class RecordJournal:
+    """Journal NDJSON des enregistrements d'un run: {id, ...} par ligne, dans l'ordre d'ajout
+    
+    header: première ligne du journal (journal_header); un journal existant dont l'en-tête
+    diffère est vidé. Seuls les IDs (avec la position de leur ligne) et le lastUpdated le plus
+    récent sont gardés en mémoire.
+    Une dernière ligne tronquée (crash pendant l'écriture) est retirée à l'ouverture.
+    """
+    
+    def __init__(self, path=None, header=None):
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="swimmers-", suffix=JOURNAL_SUFFIX)
+            os.close(fd)
+        self.path = path
+        self.header = header or journal_header([])
+        # {id: position de la ligne dans le journal}
+        self.offsets = {}
+        self.latest = ""
+        self._load()
+        # Binaire: tell() donne la position en octets de chaque ligne ajoutée
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write((json.dumps(self.header, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+            self.file.flush()
+    
+    def _load(self):
+        valid_end = 0
+        try:
+            with open(self.path, "rb") as f:
+                first = f.readline()
+                try:
+                    header = json.loads(first) if first.endswith(b"\n") else None
+                except ValueError:
+                    header = None
+                if header == self.header:
+                    valid_end = len(first)
+                elif first:
+                    print(f"  {self.path}: journal d'un autre run (saison, shard ou IDs différents), ignoré",
+                          file=sys.stderr)
+                for line in f if valid_end else ():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    if not line.endswith(b"\n"):
+                        break
+                    self._track(record, valid_end)
+                    valid_end += len(line)
+        except FileNotFoundError:
+            return
+        if valid_end < os.path.getsize(self.path):
+            if valid_end:
+                print(f"  {self.path}: dernière ligne incomplète retirée", file=sys.stderr)
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_end)
+    
+    def _track(self, record, offset):
+        self.offsets[record["id"]] = offset
+        self.latest = max(self.latest, record.get("lastUpdated") or "")
+    
+    @property
+    def ids(self):
+        return self.offsets.keys()
+    
+    @property
+    def count(self):
+        return len(self.offsets)
+    
+    @property
+    def generated(self):
+        """Date du document: lastUpdated le plus récent (comme build_output)"""
+        return self.latest or latest_update({})
+    
+    def append(self, record):
+        """Ajoute un enregistrement (un ID déjà présent dans le journal ne doit pas être ré-ajouté)"""
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        offset = self.file.tell()
+        self.file.write(line)
+        self.file.flush()
+        self._track(record, offset)
+    
+    def records(self, athlete_ids=None):
+        """Relit les enregistrements du journal, un à la fois (ceux de `athlete_ids` s'il est fourni)"""
+        self.file.flush()
+        wanted = set(athlete_ids) if athlete_ids is not None else None
+        with open(self.path, encoding="utf-8") as f:
+            f.readline()  # en-tête
+            for line in f:
+                record = json.loads(line)
+                if wanted is None or record["id"] in wanted:
+                    yield record
+    
+    def merged_records(self, athlete_ids, carried):
+        """Comme merge_swimmers, sans charger le journal: pour chaque ID (dans l'ordre),
+        l'enregistrement du journal s'il y est, sinon celui de `carried` ({id: enregistrement})"""
+        self.file.flush()
+        with open(self.path, "rb") as f:
+            for athlete_id in athlete_ids:
+                if athlete_id in self.offsets:
+                    f.seek(self.offsets[athlete_id])
+                    yield json.loads(f.readline())
+                elif athlete_id in carried:
+                    yield carried[athlete_id]
+    
+    def write_document(self, output, metadata, minify=False, athlete_ids=None, carried=None):
+        """Écrit le document {_metadata, swimmers} (même format que write_json) puis supprime le journal
+        
+        output: fichier remplacé atomiquement, ou None / '-' pour stdout.
+        athlete_ids: IDs du run; les enregistrements d'autres athlètes ne sont pas écrits.
+        carried: enregistrements hors journal ({id: enregistrement}, ex: repris du document
+        précédent), écrits avec ceux du journal dans l'ordre de athlete_ids.
+        """
+        if carried is None:
+            records = self.records(athlete_ids)
+        else:
+            records = self.merged_records(athlete_ids, carried)
+        if output in (None, "-"):
+            write_stream(sys.stdout, metadata, records, minify)
+            sys.stdout.flush()
+        else:
+            tmp_path = f"{output}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                write_stream(f, metadata, records, minify)
+            os.replace(tmp_path, output)
+        self.close()
+        os.remove(self.path)
+    
+    def close(self):
+        self.file.close()
+
+
+def write_stream(f, metadata, records, minify=False):
+    """Écrit {"_metadata": ..., "swimmers": {id: enregistrement}} enregistrement par enregistrement
+    
+    Même texte que json.dumps(document, indent=2) (ou compact si minify), suivi d'un saut de ligne.
+    """
+    if minify:
+        f.write('{"_metadata":' + json.dumps(metadata, ensure_ascii=False, separators=(",", ":")) + ',"swimmers":{')
+        for i, record in enumerate(records):
+            f.write(("," if i else "") + json.dumps(record["id"], ensure_ascii=False) + ":"
+                    + json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        f.write("}}\n")
+        return
+    
+    # Les sauts de ligne des chaînes sont échappés par json.dumps: seuls ceux de l'indentation sont remplacés
+    f.write('{\n  "_metadata": ' + json.dumps(metadata, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+            + ',\n  "swimmers": {')
+    empty = True
+    for record in records:
+        f.write(("\n" if empty else ",\n") + "    " + json.dumps(record["id"], ensure_ascii=False) + ": "
+                + json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n    "))
+        empty = False
+    f.write("}\n}\n" if empty else "\n  }\n}\n")
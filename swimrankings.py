@@ -0,0 +1,1051 @@
+#!/usr/bin/env python3
+"""
+SwimRankings - Code partagé par les scrapers (parser HTML, requêtes, saisons)
+Utilisé par fetch_swimmers.py, fetch_swimmers_season.py et update_swimmers.py
+"""
+
+import argparse
+import codecs
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from html.parser import HTMLParser
+
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_TTL, HttpCache
+from http_session import (
+    DEFAULT_CIRCUIT_PAUSE, DEFAULT_CIRCUIT_THRESHOLD, DEFAULT_MIN_INTERVAL, DEFAULT_RETRIES, DEFAULT_TIMEOUT,
+    CircuitBreaker, HttpError, HttpSession, RetryPolicy,
+)
+from standards import DEFAULT_STANDARDS
+from time_codec import find_time
+
+BASE_URL = "https://www.swimrankings.net/index.php"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# Taille des morceaux lus sur la réponse HTTP (parsing au fil du téléchargement)
+CHUNK_SIZE = 16 * 1024
+
+# Nombre de requêtes simultanées (le délai entre requêtes est géré par la session HTTP)
+DEFAULT_WORKERS = 4
+
+# Clés des listes de temps selon le type de page
+PERSONAL_BESTS = "personalBests"
+SEASON_BESTS = "seasonBests"
+
+# Champs de profil communs aux deux types de page
+PROFILE_FIELDS = ("fullName", "firstName", "lastName", "club", "nation", "yearOfBirth", "gender")
+
+# Champs exclus du hash de contenu d'un enregistrement (horodatage et hash lui-même)
+HASH_EXCLUDED_FIELDS = ("lastUpdated", "contentHash")
+
+# Dates de téléchargement des athlètes (mode incrémental), à côté du document: <sortie>.fetched
+# (sans extension .json: un glob shards/data-*.json de merge_shards.py ne le prend pas)
+FETCH_TIMES_SUFFIX = ".fetched"
+
+# Expressions régulières du parser, compilées une seule fois
+# Année de naissance: "(2010&nbsp;&nbsp;<img...": l'entité est décodée, la balise termine le texte
+BIRTH_YEAR_RE = re.compile(r'\((\d{4})(?:\s|$)')
+NATION_RE = re.compile(r'^([A-Z]{3})(?:\s*-\s*(.+))?$')
+YEAR_RE = re.compile(r"(\d{4})")
+DISTANCE_RE = re.compile(r"(\d+)")
+# Date de course "12&nbsp;Mar&nbsp;2025" (l'entité est décodée en espace insécable)
+DATE_RE = re.compile(r"^(\d{1,2})\s+([A-Za-z]{3})\s+(\d{4})$")
+# Lien de l'épreuve vers l'historique complet: "...&styleId=13"
+STYLE_ID_RE = re.compile(r"styleId=(\d+)")
+
+MONTHS = {month: i for i, month in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+
+
+def get_season_year():
+    """Calcule l'année de saison SwimRankings (année de fin de saison)
+    
+    La saison va du 1er septembre au 31 août.
+    - Entre septembre et décembre: année suivante (ex: nov 2025 → 2026)
+    - Entre janvier et août: année courante (ex: mars 2026 → 2026)
+    """
+    now = datetime.now()
+    return now.year + 1 if now.month >= 9 else now.year
+
+
+def get_season_label(season_year):
+    """Retourne le label de saison, ex: '2025-2026'"""
+    return f"{season_year - 1}-{season_year}"
+
+
+def get_season_dates(season_year):
+    """Retourne les dates de début et fin de saison"""
+    return {
+        "start": f"{season_year - 1}-09-01",
+        "end": f"{season_year}-08-31"
+    }
+
+
+def athlete_url(athlete_id, season_year=None):
+    """URL de la page athlète: records personnels, ou meilleurs temps d'une saison si season_year"""
+    url = f"{BASE_URL}?page=athleteDetail&athleteId={athlete_id}"
+    if season_year:
+        url += f"&pbest={season_year}"
+    return url
+
+
+def history_url(athlete_id, style_id):
+    """URL de l'historique complet d'une épreuve (toutes les courses de l'athlète)"""
+    return f"{BASE_URL}?page=athleteDetail&athleteId={athlete_id}&styleId={style_id}"
+
+
+def parse_date(text):
+    """Convertit une date SwimRankings ('12 Mar 2025') en date ISO; None si non reconnue"""
+    match = DATE_RE.match(text.replace("\xa0", " ").strip())
+    if not match:
+        return None
+    month = MONTHS.get(match.group(2).lower())
+    if not month:
+        return None
+    return f"{match.group(3)}-{month:02d}-{int(match.group(1)):02d}"
+
+
+def parse_row_details(cells):
+    """Date, ville et compétition d'une ligne de résultat (colonnes suivant la date)"""
+    for i, cell in enumerate(cells):
+        date = parse_date(cell)
+        if date:
+            city = cells[i + 1] if i + 1 < len(cells) else ""
+            meet = cells[i + 2] if i + 2 < len(cells) else ""
+            return {"date": date, "city": city, "meet": meet}
+    return {}
+
+
+class SwimRankingsParser(HTMLParser):
+    """Parse une page athlète SwimRankings
+    
+    results_key: "personalBests" (page athleteDetail) ou "seasonBests" (page pbest=<saison>)
+    parse_profile: si False, ignore nation/club/année de naissance (déjà connus par l'autre page)
+    """
+    
+    def __init__(self, results_key=PERSONAL_BESTS, parse_profile=True):
+        super().__init__()
+        self.results_key = results_key
+        self.parse_profile = parse_profile
+        self.data = {
+            "fullName": "",
+            "club": "",
+            "nation": "",
+            "yearOfBirth": None,
+            "gender": "Male",
+            results_key: []
+        }
+        self.in_title = False
+        self.in_table = False
+        self.current_pool = 50
+        self.current_stroke = None
+        self.in_row = False
+        self.row_cells = []
+        self.row_style_id = None
+        self.current_cell = ""
+        self.capture_text = False
+        # Temps indexés par (stroke, distance, poolLength), dans l'ordre de la page
+        self.results_index = {}
+        # Profil lu au fil des balises (pas de pré-analyse du document complet)
+        self.in_nationclub = False
+        self.birth_year_seen = False
+        # Texte reçu depuis la dernière balise (peut arriver en plusieurs morceaux)
+        self.text_parts = []
+        # Temps cumulé passé dans process_row (métriques)
+        self.process_row_time = 0.0
+    
+    def close(self):
+        """Termine le parsing et publie la liste des temps dans self.data"""
+        super().close()
+        self.flush_text()
+        self.data[self.results_key] = list(self.results_index.values())
+    
+    def handle_starttag(self, tag, attrs):
+        self.flush_text()
+        
+        if tag == "title":
+            self.in_title = True
+            self.capture_text = True
+        elif tag == "table":
+            self.in_table = True
+        elif tag == "tr" and self.in_table:
+            self.in_row = True
+            self.row_cells = []
+            self.row_style_id = None
+        elif tag == "a" and self.in_row and not self.row_cells:
+            # Lien de la cellule épreuve vers l'historique de l'épreuve
+            style_match = STYLE_ID_RE.search(dict(attrs).get("href") or "")
+            if style_match:
+                self.row_style_id = int(style_match.group(1))
+        elif tag == "td" and self.in_row:
+            self.current_cell = ""
+            self.capture_text = True
+        elif tag == "th" and self.in_row:
+            self.current_cell = ""
+            self.capture_text = True
+        elif self.parse_profile:
+            if tag == "img":
+                # Detect gender: gender1.png = Male, gender2.png = Female
+                src = (dict(attrs).get("src") or "").lower()
+                if "gender2.png" in src:
+                    self.data["gender"] = "Female"
+            elif tag == "div" and ("id", "nationclub") in attrs:
+                # Format: <br>SUI - Suisse<br>Lausanne Aquatique
+                self.in_nationclub = True
+    
+    def handle_endtag(self, tag):
+        self.flush_text()
+        
+        if tag == "title":
+            self.in_title = False
+            self.capture_text = False
+        elif tag == "table":
+            self.in_table = False
+        elif tag == "tr" and self.in_row:
+            self.in_row = False
+            started = time.perf_counter()
+            self.process_row()
+            self.process_row_time += time.perf_counter() - started
+        elif tag in ("td", "th") and self.capture_text:
+            self.row_cells.append(self.current_cell.strip())
+            self.capture_text = False
+        elif tag == "div":
+            self.in_nationclub = False
+    
+    def handle_comment(self, data):
+        self.flush_text()
+    
+    def handle_decl(self, decl):
+        self.flush_text()
+    
+    def handle_data(self, data):
+        self.text_parts.append(data)
+    
+    def flush_text(self):
+        if self.text_parts:
+            text = "".join(self.text_parts)
+            self.text_parts = []
+            self.handle_text(text)
+    
+    def handle_profile_text(self, data):
+        # Extract year of birth from the name div: (2010&nbsp;&nbsp;<img...)
+        if not self.birth_year_seen:
+            birth_match = BIRTH_YEAR_RE.search(data)
+            if birth_match:
+                self.birth_year_seen = True
+                year = int(birth_match.group(1))
+                if 1950 < year <= 2025:
+                    self.data["yearOfBirth"] = year
+        
+        # Extract nation and club from <div id="nationclub">
+        if self.in_nationclub:
+            for line in data.split("\n"):
+                line = line.replace("\xa0", " ").strip()
+                # Nation line format: "SUI - Suisse" or just "SUI"
+                nation_match = NATION_RE.match(line)
+                if nation_match:
+                    self.data["nation"] = nation_match.group(1)
+                elif line and not self.data["club"]:
+                    # Other non-empty line is likely the club
+                    self.data["club"] = line
+    
+    def handle_text(self, data):
+        if self.parse_profile:
+            self.handle_profile_text(data)
+        
+        text = data.strip()
+        if self.in_title and text:
+            # Extract name from title
+            name = text.replace("SwimRankings.net -", "").strip()
+            if name:
+                self.data["fullName"] = name
+        
+        if self.capture_text:
+            self.current_cell += " " + text
+        
+        if not text:
+            return
+        
+        # Detect pool length
+        text_lower = text.lower()
+        if "long course" in text_lower or "50 m" in text_lower:
+            self.current_pool = 50
+        elif "short course" in text_lower or "25 m" in text_lower:
+            self.current_pool = 25
+        
+        # Detect stroke headers
+        if "freestyle" in text_lower or "freistil" in text_lower:
+            self.current_stroke = "Freestyle"
+        elif "backstroke" in text_lower or "rücken" in text_lower:
+            self.current_stroke = "Backstroke"
+        elif "breaststroke" in text_lower or "brust" in text_lower:
+            self.current_stroke = "Breaststroke"
+        elif "butterfly" in text_lower or "schmetterling" in text_lower:
+            self.current_stroke = "Butterfly"
+        elif "medley" in text_lower or "lagen" in text_lower:
+            self.current_stroke = "Medley"
+    
+    def process_row(self):
+        if len(self.row_cells) < 2:
+            return
+        
+        first_cell = self.row_cells[0].lower()
+        
+        # Extract club/nation/birth
+        if self.parse_profile:
+            if "club" in first_cell and len(self.row_cells) > 1:
+                self.data["club"] = self.row_cells[1]
+            elif "nation" in first_cell and len(self.row_cells) > 1:
+                self.data["nation"] = self.row_cells[1]
+            elif "born" in first_cell or "jahrgang" in first_cell:
+                match = YEAR_RE.search(self.row_cells[1] if len(self.row_cells) > 1 else first_cell)
+                if match:
+                    self.data["yearOfBirth"] = int(match.group(1))
+        
+        # Extract times
+        first_raw = self.row_cells[0]
+        distance_match = DISTANCE_RE.match(first_raw)
+        
+        if distance_match:
+            distance = int(distance_match.group(1))
+            stroke = self.current_stroke
+            
+            # Detect stroke in cell
+            cell_lower = first_raw.lower()
+            if "free" in cell_lower or "libre" in cell_lower:
+                stroke = "Freestyle"
+            elif "back" in cell_lower or "dos" in cell_lower:
+                stroke = "Backstroke"
+            elif "breast" in cell_lower or "brasse" in cell_lower:
+                stroke = "Breaststroke"
+            elif "fly" in cell_lower or "pap" in cell_lower:
+                stroke = "Butterfly"
+            elif "medley" in cell_lower or "4 n" in cell_lower:
+                stroke = "Medley"
+            
+            if not stroke:
+                return
+            
+            # Pool length is in column 2 (index 1) with format "25m" or "50m"
+            row_pool_length = 50  # default
+            if len(self.row_cells) > 1:
+                bassin_cell = self.row_cells[1].strip().lower()
+                if bassin_cell == "25m" or bassin_cell == "25":
+                    row_pool_length = 25
+                elif bassin_cell == "50m" or bassin_cell == "50":
+                    row_pool_length = 50
+            
+            # Keep the first time found for each event (index instead of a linear scan)
+            key = (stroke, distance, row_pool_length)
+            if key in self.results_index:
+                return
+            
+            # Find time in cells (starting from column 3, index 2)
+            for cell in self.row_cells[2:]:
+                found = find_time(cell)
+                if found:
+                    time_ms, time_display = found
+                    
+                    if time_ms > 0:
+                        result = {
+                            "stroke": stroke,
+                            "distance": distance,
+                            "poolLength": row_pool_length,
+                            "timeMs": time_ms,
+                            "timeDisplay": time_display
+                        }
+                        result.update(parse_row_details(self.row_cells))
+                        if self.row_style_id:
+                            result["styleId"] = self.row_style_id
+                        self.results_index[key] = result
+                    break
+
+
+class HistoryParser(SwimRankingsParser):
+    """Parse la page d'historique d'une épreuve (history_url): toutes les courses de l'athlète
+    
+    Chaque ligne avec un temps donne une course; le bassin, la date, la ville et la
+    compétition sont reconnus par le contenu des cellules.
+    """
+    
+    def __init__(self, stroke, distance):
+        super().__init__("history", parse_profile=False)
+        self.stroke = stroke
+        self.distance = distance
+        self.history = []
+    
+    def close(self):
+        super().close()
+        self.data["history"] = self.history
+    
+    def process_row(self):
+        pool_length = None
+        found = None
+        for cell in self.row_cells:
+            lower = cell.lower()
+            if pool_length is None and lower in ("25m", "50m", "25", "50"):
+                pool_length = int(lower[:2])
+            elif found is None:
+                found = find_time(cell)
+        
+        if found is None or pool_length is None:
+            return
+        time_ms, time_display = found
+        if time_ms <= 0:
+            return
+        
+        result = {
+            "stroke": self.stroke,
+            "distance": self.distance,
+            "poolLength": pool_length,
+            "timeMs": time_ms,
+            "timeDisplay": time_display,
+        }
+        result.update(parse_row_details(self.row_cells))
+        self.history.append(result)
+
+
+_default_session = None
+
+
+def default_session():
+    """Session HTTP utilisée quand aucune n'est fournie (appels directs de fetch_athlete, etc.)"""
+    global _default_session
+    if _default_session is None:
+        _default_session = HttpSession(HEADERS)
+    return _default_session
+
+
+class Page:
+    """Page SwimRankings téléchargée ou servie par le cache
+    
+    unchanged: True si le contenu est identique à la version en cache
+    (réponse 304, entrée encore fraîche ou même hash de contenu).
+    timings: durées en secondes par phase (voir metrics.PHASES)
+    """
+    
+    def __init__(self, url, body=None, unchanged=False, cache_entry=None, streamed=False, response=None,
+                 timings=None, bytes_decoded=0):
+        self.url = url
+        self._body = body
+        self.unchanged = unchanged
+        self.cache_entry = cache_entry
+        # True si le corps a été transmis au fil de l'eau à un parser (fetch_page(sink=...))
+        self.streamed = streamed
+        # Réponse HTTP (None si servie par le cache sans requête): latence, connexion réutilisée
+        self.response = response
+        self.timings = timings or {}
+        self.bytes_decoded = bytes_decoded
+    
+    @property
+    def not_modified(self):
+        return self.response is not None and self.response.status == 304
+    
+    @property
+    def bytes_received(self):
+        return self.response.bytes_received if self.response is not None else 0
+    
+    @property
+    def body(self):
+        if self._body is None and self.cache_entry is not None:
+            self._body = self.cache_entry.read_body()
+        return self._body
+    
+    @property
+    def html(self):
+        return self.body.decode("utf-8", errors="ignore")
+
+
+def fetch_page(url, session=None, cache=None, sink=None):
+    """Télécharge une page SwimRankings (via le cache HTTP si fourni); retourne None en cas d'erreur
+    
+    Si `sink` est fourni (ex: parser.feed), la réponse est lue par morceaux et le texte
+    décodé lui est transmis au fil du téléchargement, sans garder le corps en mémoire.
+    Les pages servies par le cache (fraîches ou 304) ne passent pas par `sink`.
+    Page.timings sépare connexion, téléchargement, décodage et temps passé dans `sink` ("parse").
+    """
+    
+    session = session or default_session()
+    entry = cache.lookup(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        return Page(url, unchanged=True, cache_entry=entry)
+    
+    headers = cache.conditional_headers(entry) if entry else None
+    
+    writer = None
+    chunks = None if sink else []
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    decode_time = sink_time = 0.0
+    bytes_decoded = 0
+    
+    try:
+        with session.get(url, headers) as response:
+            if response.status == 304 and entry:
+                response.read()
+                cache.touch(entry)
+                timings = {"connect": response.connect_time, "download": response.elapsed}
+                return Page(url, unchanged=True, cache_entry=entry, response=response, timings=timings)
+            if response.status != 200:
+                response.read()
+                raise HttpError(url, response.status, response.reason)
+            
+            writer = cache.writer(url) if cache else None
+            for chunk in response.iter_content(CHUNK_SIZE):
+                bytes_decoded += len(chunk)
+                if writer:
+                    writer.write(chunk)
+                if sink:
+                    started = time.perf_counter()
+                    text = decoder.decode(chunk)
+                    decoded = time.perf_counter()
+                    sink(text)
+                    decode_time += decoded - started
+                    sink_time += time.perf_counter() - decoded
+                else:
+                    chunks.append(chunk)
+            if sink:
+                sink(decoder.decode(b"", final=True))
+    except Exception as e:
+        if writer:
+            writer.discard()
+        print(f"  Erreur fetch {url}: {e}", file=sys.stderr)
+        return None
+    
+    # elapsed couvre toute la lecture du corps, parsing au fil de l'eau compris
+    timings = {
+        "connect": response.connect_time,
+        "download": max(0.0, (response.elapsed or 0.0) - decode_time - sink_time),
+        "decode": decode_time,
+        "parse": sink_time,
+    }
+    
+    body = b"".join(chunks) if chunks is not None else None
+    if not writer:
+        return Page(url, body, streamed=sink is not None, response=response, timings=timings,
+                    bytes_decoded=bytes_decoded)
+    
+    entry, unchanged = writer.commit(response.headers)
+    return Page(url, body, unchanged, entry, streamed=sink is not None, response=response, timings=timings,
+                bytes_decoded=bytes_decoded)
+
+
+def fetch_html(url, session=None, cache=None):
+    """Télécharge une page SwimRankings; retourne None en cas d'erreur"""
+    page = fetch_page(url, session, cache)
+    return page.html if page else None
+
+
+def split_name(data):
+    """Nettoie fullName et le découpe en firstName / lastName"""
+    
+    fullName = data["fullName"]
+    # Remove SwimRankings prefix (case insensitive)
+    for prefix in ["Swimrankings -", "SwimRankings -", "swimrankings -", "Swimrankings-", "SwimRankings-"]:
+        if prefix in fullName:
+            fullName = fullName.replace(prefix, "")
+    fullName = fullName.strip()
+    data["fullName"] = fullName
+    
+    # Handle "LASTNAME, Firstname" format
+    if "," in fullName:
+        parts = fullName.split(",", 1)
+        data["lastName"] = parts[0].strip()
+        data["firstName"] = parts[1].strip() if len(parts) > 1 else ""
+    else:
+        parts = fullName.split()
+        data["firstName"] = parts[0] if parts else ""
+        data["lastName"] = " ".join(parts[1:]) if len(parts) > 1 else ""
+
+
+def parse_athlete(html, athlete_id, results_key=PERSONAL_BESTS, profile=None):
+    """Parse une page athlète et retourne l'enregistrement JSON
+    
+    Si `profile` est fourni (enregistrement déjà parsé de l'autre page), les champs
+    de profil en sont repris et la page n'est parsée que pour ses temps.
+    """
+    parser = SwimRankingsParser(results_key, parse_profile=profile is None)
+    parser.feed(html)
+    return finish_athlete(parser, athlete_id, profile)
+
+
+def finish_athlete(parser, athlete_id, profile=None):
+    """Termine le parsing et complète l'enregistrement (id, lastUpdated, nom, profil)"""
+    parser.close()
+    results_key = parser.results_key
+    
+    data = parser.data
+    data["id"] = athlete_id
+    data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+    
+    # Count by pool length for debug
+    count_25 = sum(1 for pb in data[results_key] if pb["poolLength"] == 25)
+    count_50 = sum(1 for pb in data[results_key] if pb["poolLength"] == 50)
+    print(f"    {athlete_id} 50m: {count_50} temps, 25m: {count_25} temps", file=sys.stderr)
+    
+    if profile is None:
+        split_name(data)
+    else:
+        for field in PROFILE_FIELDS:
+            data[field] = profile.get(field, data.get(field))
+    
+    return data
+
+
+def fetch_record(athlete_id, session=None, results_key=PERSONAL_BESTS, season_year=None, cache=None, profile=None,
+                 metrics=None, parse_pool=None):
+    """Télécharge et parse une page athlète; retourne None en cas d'erreur
+    
+    La page est parsée au fil du téléchargement, ou, si `parse_pool` (parse_pool.ParsePool)
+    est fourni, téléchargée entière puis parsée dans un processus du pool. Si elle n'a pas
+    changé depuis le dernier run (cache HTTP), l'enregistrement parsé en cache est réutilisé.
+    Les durées par phase sont ajoutées à `metrics` (RunMetrics) s'il est fourni.
+    """
+    started = time.perf_counter()
+    url = athlete_url(athlete_id, season_year)
+    parser = None if parse_pool else SwimRankingsParser(results_key, parse_profile=profile is None)
+    page = fetch_page(url, session, cache, sink=parser.feed if parser else None)
+    if page is None:
+        if metrics is not None:
+            metrics.record_error(athlete_id, time.perf_counter() - started)
+        return None
+    
+    if page.response is not None and page.response.elapsed is not None:
+        connection = "connexion réutilisée" if page.response.reused else "nouvelle connexion"
+        print(f"    {athlete_id} {page.response.elapsed * 1000:.0f} ms ({connection})", file=sys.stderr)
+    
+    entry = page.cache_entry
+    if page.unchanged and entry is not None and entry.parsed:
+        data = entry.parsed
+        data["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+        if profile is not None:
+            for field in PROFILE_FIELDS:
+                data[field] = profile.get(field, data.get(field))
+        data["contentHash"] = content_hash(data)
+        print(f"    {athlete_id} inchangé (cache)", file=sys.stderr)
+        if metrics is not None:
+            metrics.record_page(athlete_id, page, time.perf_counter() - started)
+        return data
+    
+    if parser is None:
+        data, timings = parse_pool.parse(page.body, athlete_id, results_key, profile)
+        for phase, seconds in timings.items():
+            page.timings[phase] = page.timings.get(phase, 0.0) + seconds
+    else:
+        if not page.streamed:
+            decode_started = time.perf_counter()
+            html = page.html
+            parse_started = time.perf_counter()
+            parser.feed(html)
+            page.timings["decode"] = page.timings.get("decode", 0.0) + parse_started - decode_started
+            page.timings["parse"] = page.timings.get("parse", 0.0) + time.perf_counter() - parse_started
+        data = finish_athlete(parser, athlete_id, profile)
+        # process_row est appelé depuis feed: on le retire du temps de parsing
+        page.timings["process_row"] = parser.process_row_time
+        page.timings["parse"] = max(0.0, page.timings.get("parse", 0.0) - parser.process_row_time)
+    
+    data["contentHash"] = content_hash(data)
+    if entry is not None:
+        cache.save_parsed(entry, data)
+    
+    if metrics is not None:
+        metrics.record_page(athlete_id, page, time.perf_counter() - started)
+    return data
+
+
+def content_hash(record):
+    """Hash (sha256, 16 caractères) du contenu parsé d'un enregistrement, hors horodatage"""
+    content = {field: value for field, value in record.items() if field not in HASH_EXCLUDED_FIELDS}
+    serialized = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
+
+
+def record_changed(record, previous):
+    """True si l'enregistrement est absent du document précédent ou si son contentHash diffère"""
+    old = (previous or {}).get("swimmers", {}).get(record["id"])
+    return not old or old.get("contentHash") != record.get("contentHash")
+
+
+def carry_unchanged(record, previous):
+    """Reprend le lastUpdated du document précédent si le contenu de l'enregistrement n'a pas changé
+    
+    Un enregistrement est inchangé si son contentHash est celui du document précédent:
+    lastUpdated ne bouge alors pas et le fichier publié reste identique.
+    Retourne True si l'enregistrement est nouveau ou modifié.
+    """
+    old = (previous or {}).get("swimmers", {}).get(record["id"])
+    if old and old.get("lastUpdated") and old.get("contentHash") == record.get("contentHash"):
+        record["lastUpdated"] = old["lastUpdated"]
+        return False
+    return True
+
+
+def fetch_history(athlete_id, style_id, stroke, distance, session=None, cache=None, metrics=None):
+    """Télécharge l'historique complet d'une épreuve; retourne la liste des courses ou None
+    
+    Les durées par phase sont ajoutées à `metrics` (RunMetrics) s'il est fourni.
+    """
+    started = time.perf_counter()
+    parser = HistoryParser(stroke, distance)
+    page = fetch_page(history_url(athlete_id, style_id), session, cache, sink=parser.feed)
+    if page is None:
+        if metrics is not None:
+            metrics.record_error(athlete_id, time.perf_counter() - started)
+        return None
+    if not page.streamed:
+        parser.feed(page.html)
+    parser.close()
+    if metrics is not None:
+        metrics.record_page(athlete_id, page, time.perf_counter() - started)
+    return parser.history
+
+
+def history_events(record, results_key=PERSONAL_BESTS):
+    """Épreuves d'un enregistrement ayant un lien vers leur historique: [(styleId, nage, distance)]"""
+    events = {}
+    for result in (record or {}).get(results_key, []):
+        if result.get("styleId"):
+            events.setdefault(result["styleId"], (result["stroke"], result["distance"]))
+    return [(style_id, stroke, distance) for style_id, (stroke, distance) in events.items()]
+
+
+def fetch_concurrently(athlete_ids, fetch_fn, workers=DEFAULT_WORKERS):
+    """Applique fetch_fn(athlete_id) en parallèle (pool borné de threads)
+    
+    Retourne une liste de (athlete_id, résultat) dans l'ordre des IDs fournis;
+    le résultat vaut None si la récupération a échoué, sans interrompre les autres.
+    """
+    return list(iter_concurrently(athlete_ids, fetch_fn, workers))
+
+
+def iter_concurrently(athlete_ids, fetch_fn, workers=DEFAULT_WORKERS):
+    """Comme fetch_concurrently, mais produit les (athlete_id, résultat) au fil de l'eau
+    
+    Au plus 2 × workers récupérations sont soumises d'avance: les résultats non encore
+    consommés ne s'accumulent pas en mémoire, quelle que soit la taille de la liste.
+    """
+    workers = max(1, workers)
+    athlete_ids = iter(athlete_ids)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            for athlete_id in athlete_ids:
+                pending.append((athlete_id, pool.submit(fetch_fn, athlete_id)))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                return
+            
+            athlete_id, future = pending.popleft()
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  Erreur parse {athlete_id}: {e}", file=sys.stderr)
+                result = None
+            yield athlete_id, result
+
+
+def latest_update(swimmers):
+    """lastUpdated le plus récent des nageurs ({id: enregistrement}), maintenant s'il n'y en a pas"""
+    latest = max((record.get("lastUpdated") or "" for record in swimmers.values()), default="")
+    return latest or datetime.utcnow().isoformat() + "Z"
+
+
+def build_output(swimmers, season_year=None, standards=None, generated=None):
+    """Construit le document JSON publié (avec _metadata)
+    
+    standards: temps limites (standards.Standards) ayant servi à annoter les temps
+    generated: date du document; par défaut le lastUpdated le plus récent, pour que le
+    document ne change pas si aucun nageur n'a changé
+    """
+    
+    return {
+        "_metadata": build_metadata(len(swimmers), generated or latest_update(swimmers), season_year, standards),
+        "swimmers": swimmers
+    }
+
+
+def build_metadata(count, generated, season_year=None, standards=None, standards_version=None):
+    """_metadata d'un document publié (voir build_output)
+    
+    standards_version: version des temps limites quand seul le numéro est connu (fusion des shards)
+    """
+    
+    metadata = {
+        "generated": generated,
+        "source": "swimrankings.net",
+        "count": count
+    }
+    
+    if standards is not None:
+        metadata["standards"] = standards.version
+    elif standards_version is not None:
+        metadata["standards"] = standards_version
+    
+    if season_year:
+        season_dates = get_season_dates(season_year)
+        metadata["season"] = {
+            "year": season_year,
+            "label": get_season_label(season_year),
+            "start": season_dates["start"],
+            "end": season_dates["end"]
+        }
+    
+    return metadata
+
+
+def load_output(path):
+    """Charge un document publié existant; retourne None s'il est absent ou illisible"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"  Impossible de lire {path}: {e}", file=sys.stderr)
+        return None
+    
+    if not isinstance(document, dict) or not isinstance(document.get("swimmers"), dict):
+        return None
+    return document
+
+
+def parse_timestamp(value):
+    """Convertit un horodatage ISO (ex: '2026-02-03T06:47:43.333662Z') en datetime UTC naïf"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.rstrip("Z"))
+    except ValueError:
+        return None
+
+
+def select_stale(athlete_ids, documents, stale_hours, now=None, fetched=None):
+    """Sélectionne les athlètes à re-télécharger en mode incrémental
+    
+    Un athlète est retenu s'il manque dans l'un des documents (nouvel ID) ou si son
+    dernier téléchargement date de plus de `stale_hours` heures. L'ordre des IDs est conservé.
+    fetched: dates de téléchargement ({id: horodatage}, voir load_fetch_times). lastUpdated
+    ne change qu'avec le contenu: il ne sert que pour un athlète sans date de téléchargement.
+    """
+    now = now or datetime.utcnow()
+    fetched = fetched or {}
+    selected = []
+    
+    for athlete_id in athlete_ids:
+        records = [(document or {}).get("swimmers", {}).get(athlete_id) for document in documents]
+        if not all(records):
+            selected.append(athlete_id)
+            continue
+        checked = parse_timestamp(fetched.get(athlete_id))
+        if checked is None:
+            dates = [parse_timestamp(record.get("lastUpdated")) for record in records]
+            checked = None if None in dates else min(dates)
+        if checked is None or (now - checked).total_seconds() >= stale_hours * 3600:
+            selected.append(athlete_id)
+    
+    return selected
+
+
+def fetch_times_path(output):
+    """Fichier des dates de téléchargement des athlètes d'un document publié (à côté du document)"""
+    return output + FETCH_TIMES_SUFFIX
+
+
+def load_fetch_times(path):
+    """Dates de dernier téléchargement par athlète ({id: horodatage ISO}); {} si absent ou illisible"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            times = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return times if isinstance(times, dict) else {}
+
+
+def save_fetch_times(path, times):
+    """Écrit les dates de téléchargement (hors du document publié, qui ne change pas pour autant)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(times, f, indent=1, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def merge_swimmers(athlete_ids, previous, fetched):
+    """Fusionne les enregistrements récupérés avec le document précédent
+    
+    Pour chaque ID de la liste (dans l'ordre), garde le nouvel enregistrement s'il a
+    été récupéré, sinon le dernier enregistrement valide du document précédent.
+    """
+    previous_swimmers = (previous or {}).get("swimmers", {})
+    swimmers = {}
+    
+    for athlete_id in athlete_ids:
+        if athlete_id in fetched:
+            swimmers[athlete_id] = fetched[athlete_id]
+        elif athlete_id in previous_swimmers:
+            swimmers[athlete_id] = previous_swimmers[athlete_id]
+    
+    return swimmers
+
+
+def add_common_arguments(parser):
+    """Options partagées par les scripts de récupération"""
+    parser.add_argument("athlete_ids", nargs="*", help="IDs SwimRankings des athlètes")
+    parser.add_argument("--ids-file", metavar="FICHIER",
+                        help="lit aussi les IDs dans un fichier (un par ligne, # pour les commentaires; - pour stdin)")
+    add_http_arguments(parser)
+    parser.add_argument("--standards", default=DEFAULT_STANDARDS, metavar="FICHIER",
+                        help="temps limites utilisés pour les points FINA et les écarts (défaut: temps-limites.json)")
+    parser.add_argument("--store", metavar="FICHIER",
+                        help="ajoute les temps récupérés à l'historique SQLite (voir results_store.py)")
+    parser.add_argument("--metrics", metavar="FICHIER",
+                        help="écrit les métriques du run (durées par phase p50/p95, octets, cache, relances) en JSON")
+    parser.add_argument("--shard", type=parse_shard, metavar="i/N",
+                        help="ne traite que le shard i sur N (1 ≤ i ≤ N) de la liste d'IDs; sortie partielle "
+                             "à fusionner avec merge_shards.py")
+    parser.add_argument("--parse-processes", type=int, default=0, metavar="N",
+                        help="parse les pages dans N processus, les --workers threads ne faisant que télécharger "
+                             "(défaut: 0, parsing dans les threads; voir parse_pool.py)")
+    parser.add_argument("--parse-queue", type=int, default=None, metavar="N",
+                        help="pages au plus en attente de parsing (défaut: 2 par processus)")
+
+
+def add_http_arguments(parser):
+    """Options réseau et cache (scrapers et découverte des IDs)"""
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"nombre de requêtes simultanées (défaut: {DEFAULT_WORKERS})")
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL,
+                        help=f"délai minimum en secondes entre deux requêtes vers le même hôte (défaut: {DEFAULT_MIN_INTERVAL})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"timeout des requêtes en secondes (défaut: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help=f"relances par requête sur erreur réseau, 429 ou 5xx (défaut: {DEFAULT_RETRIES})")
+    parser.add_argument("--circuit-threshold", type=float, default=DEFAULT_CIRCUIT_THRESHOLD,
+                        help=f"taux d'erreur récent qui suspend le run (défaut: {DEFAULT_CIRCUIT_THRESHOLD})")
+    parser.add_argument("--circuit-pause", type=float, default=DEFAULT_CIRCUIT_PAUSE,
+                        help=f"durée en secondes de la suspension (défaut: {DEFAULT_CIRCUIT_PAUSE:.0f})")
+    parser.add_argument("--no-keep-alive", action="store_true",
+                        help="ouvre une nouvelle connexion par requête (pour comparer les latences)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"répertoire du cache HTTP (défaut: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-ttl", type=int, default=DEFAULT_TTL,
+                        help=f"durée de validité en secondes des pages sans ETag/Last-Modified (défaut: {DEFAULT_TTL})")
+    parser.add_argument("--no-cache", action="store_true", help="désactive le cache HTTP")
+    parser.add_argument("--refresh", action="store_true",
+                        help="ignore le contenu du cache et retélécharge toutes les pages")
+
+
+def parse_id_lines(lines):
+    """IDs d'une liste de lignes (format athletes.txt): séparés par des blancs, # commente la fin de ligne"""
+    athlete_ids = []
+    for line in lines:
+        athlete_ids += line.split("#", 1)[0].split()
+    return athlete_ids
+
+
+def read_id_file(path):
+    """IDs d'un fichier (ou de stdin si path vaut '-')"""
+    if path == "-":
+        return parse_id_lines(sys.stdin)
+    with open(path, encoding="utf-8") as f:
+        return parse_id_lines(f)
+
+
+def write_id_file(path, athlete_ids):
+    """Écrit les IDs au format de read_id_file (un par ligne)"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(f"{athlete_id}\n" for athlete_id in athlete_ids))
+
+
+def collect_athlete_ids(args):
+    """IDs de la ligne de commande puis de --ids-file, dédoublonnés dans l'ordre"""
+    athlete_ids = list(args.athlete_ids)
+    if args.ids_file:
+        athlete_ids += read_id_file(args.ids_file)
+    return list(dict.fromkeys(athlete_ids))
+
+
+def parse_shard(value):
+    """'i/N' → (i, N), avec 1 ≤ i ≤ N (option --shard)"""
+    index, _, count = value.partition("/")
+    if not (index.isdigit() and count.isdigit()) or not 1 <= int(index) <= int(count):
+        raise argparse.ArgumentTypeError("format attendu: i/N avec 1 ≤ i ≤ N (ex: 2/4)")
+    return int(index), int(count)
+
+
+def shard_index(athlete_id, count):
+    """Shard (1 à count) d'un athlète: hash stable de l'ID
+    
+    Ne dépend ni de la liste ni de la machine (contrairement à hash()): chaque job d'une
+    matrice calcule la même répartition, et un athlète ajouté ne déplace pas les autres.
+    """
+    digest = hashlib.sha256(athlete_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def select_shard(athlete_ids, args):
+    """IDs du shard demandé par --shard (tous sans --shard), dans l'ordre de la liste"""
+    if not args.shard:
+        return athlete_ids
+    index, count = args.shard
+    selected = [athlete_id for athlete_id in athlete_ids if shard_index(athlete_id, count) == index]
+    print(f"Shard {index}/{count}: {len(selected)}/{len(athlete_ids)} athlètes", file=sys.stderr)
+    return selected
+
+
+def shard_metadata(args, athlete_ids):
+    """Entrée _metadata["shard"] d'une sortie partielle: shard et IDs qui lui sont attribués"""
+    index, count = args.shard
+    return {"index": index, "count": count, "ids": list(athlete_ids)}
+
+
+def make_session(args):
+    """Construit la session HTTP (connexions persistantes) à partir des options"""
+    return HttpSession(HEADERS, timeout=args.timeout, min_interval=args.min_interval,
+                       keep_alive=not args.no_keep_alive,
+                       retry_policy=RetryPolicy(args.retries),
+                       circuit_breaker=CircuitBreaker(args.circuit_threshold, pause=args.circuit_pause))
+
+
+def report_run(session, metrics, args):
+    """Affiche la latence et le résumé des métriques; écrit le fichier --metrics"""
+    print(f"Latence moyenne: {session.latency.summary()}", file=sys.stderr)
+    metrics.record_session(session)
+    metrics.print_summary()
+    if args.metrics:
+        metrics.write(args.metrics)
+        print(f"Métriques écrites dans {args.metrics}", file=sys.stderr)
+
+
+def make_cache(args):
+    """Construit le cache HTTP à partir des options de la ligne de commande"""
+    if args.no_cache:
+        return None
+    return HttpCache(args.cache_dir, ttl=args.cache_ttl, refresh=args.refresh)
+
+
+def write_json(path, document, minify=False):
+    """Écrit un document JSON publié (même format que la sortie des scripts, ou minifié)
+    
+    Le fichier est écrit à côté puis remplacé d'un coup: un run interrompu laisse l'ancien document intact.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        if minify:
+            f.write(json.dumps(document, ensure_ascii=False, separators=(",", ":")))
+        else:
+            f.write(json.dumps(document, indent=2, ensure_ascii=False))
+        f.write("\n")
+    os.replace(tmp_path, path)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Conversion des temps de nage: texte ("1:04.85", "00:30.40", "30.25") ↔ millisecondes
+
+Un seul module pour les scrapers (cellules des pages SwimRankings), les temps limites
+(temps-limites.json) et les calculs sur l'effectif:
+- parse_time: un temps complet, validé (ValueError si malformé)
+- find_time: premier temps contenu dans un texte (cellule HTML), avec son affichage
+- parse_times / parse_times_array: listes ou tableaux de temps en une passe
+- format_time: millisecondes → affichage (même format que timeDisplay et formatTime de app.js)
+"""
+
+import re
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Temps dans une cellule: "1:04.85" ou "30.25"; groupes minutes (optionnel), secondes, centièmes
+TIME_RE = re.compile(r"(?:(\d{1,2}):)?(\d{2})\.(\d{2})")
+
+# Tables de conversion de parse_time: "07" → 7 (centièmes, secondes < 60), "7"/"07" → 7 (minutes)
+DECIMAL_SEPARATORS = ".,"
+TWO_DIGITS = {f"{i:02d}": i for i in range(100)}
+SECONDS = {f"{i:02d}": i for i in range(60)}
+NUMBERS = {**{str(i): i for i in range(100)}, **TWO_DIGITS}
+
+
+def parse_time(text):
+    """Temps 'M:SS.cc', 'MM:SS.cc' ou 'S.cc' (virgule acceptée) en millisecondes
+    
+    Sans regex ni int(): les groupes de chiffres, à position fixe depuis la fin, sont
+    convertis par table, ce qui les valide en même temps. ValueError si le texte
+    n'est pas un temps valide (secondes >= 60 avec des minutes, chiffres manquants,
+    caractères parasites).
+    """
+    value = text.strip()
+    try:
+        if value[-3] in DECIMAL_SEPARATORS:
+            centis = TWO_DIGITS[value[-2:]]
+            head = value[:-3]
+            if len(head) <= 2:
+                return NUMBERS[head] * 1000 + centis * 10
+            if head[-3] == ":":
+                return (NUMBERS[head[:-3]] * 60 + SECONDS[head[-2:]]) * 1000 + centis * 10
+    except (IndexError, KeyError):
+        pass
+    raise ValueError(f"temps invalide: {text!r}")
+
+
+def try_parse_time(text):
+    """Comme parse_time, mais None pour un temps invalide ou absent"""
+    try:
+        return parse_time(text)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def find_time(text):
+    """Premier temps d'un texte (cellule HTML): (millisecondes, affichage) ou None"""
+    # Cas courant: la cellule ne contient que le temps ("1:04.85", "30.25")
+    value = text.strip()
+    if value[-3:-2] == "." and (len(value) == 5 or value[-6:-5] == ":"):
+        try:
+            return parse_time(value), value
+        except ValueError:
+            pass
+    match = TIME_RE.search(text)
+    if match is None:
+        return None
+    minutes, seconds, centis = match.groups()
+    return (int(minutes or 0) * 60 + int(seconds)) * 1000 + int(centis) * 10, match.group(0)
+
+
+def parse_times(values, errors="raise"):
+    """Liste (ou tableau) de temps → liste de millisecondes
+    
+    errors="raise": ValueError au premier temps invalide; errors="coerce": None à sa place.
+    """
+    if errors == "raise":
+        return [parse_time(value) for value in values]
+    if errors == "coerce":
+        return [try_parse_time(value) for value in values]
+    raise ValueError(f"errors doit valoir 'raise' ou 'coerce', pas {errors!r}")
+
+
+def parse_times_array(values, missing=0):
+    """Tableau NumPy int32 des temps en millisecondes; `missing` pour les temps invalides (nécessite numpy)"""
+    if np is None:
+        raise ImportError("parse_times_array nécessite numpy (pip install numpy)")
+    parse = try_parse_time
+    return np.fromiter((ms if ms is not None else missing for ms in map(parse, values)),
+                       dtype=np.int32, count=len(values))
+
+
+def format_time(ms):
+    """Millisecondes → '1:04.85' ou '30.25' (arrondi au centième)"""
+    if ms < 0:
+        raise ValueError(f"temps négatif: {ms}")
+    seconds, centis = divmod((int(ms) + 5) // 10, 100)
+    minutes, seconds = divmod(seconds, 60)
+    if minutes:
+        return f"{minutes}:{seconds:02d}.{centis:02d}"
+    return f"{seconds}.{centis:02d}"
+
+
+def format_times(values):
+    """Liste de millisecondes → liste d'affichages"""
+    return [format_time(ms) for ms in values]
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+SwimRankings Update - Run quotidien combiné (records personnels + saison courante)
+Télécharge les pages athleteDetail et athleteDetail&pbest=<saison> de chaque athlète
+dans un même job et écrit swimmers-data.json et swimmers-season.json en un seul run.
+Les enregistrements passent par un journal par sortie (stream_output.RecordJournal):
+un run interrompu reprend sans re-télécharger les athlètes déjà écrits dans les deux.
+Utilisé par GitHub Actions (.github/workflows/update-swimmers.yml)
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from swimrankings import (
+    PERSONAL_BESTS, SEASON_BESTS, add_common_arguments, build_metadata, carry_unchanged, collect_athlete_ids,
+    fetch_history, fetch_record, fetch_times_path, get_season_dates, get_season_label, get_season_year, history_events,
+    iter_concurrently, latest_update, load_fetch_times, load_output, make_cache, make_session, read_id_file,
+    record_changed, report_run, save_fetch_times, select_shard, select_stale, shard_metadata, write_id_file,
+)
+from metrics import RunMetrics
+from parse_pool import make_parse_pool
+from publish import publish
+from results_store import make_store
+from standards import load_standards
+from stream_output import RecordJournal, journal_header, journal_path
+
+DATA_OUTPUT = "swimmers-data.json"
+SEASON_OUTPUT = "swimmers-season.json"
+
+# En mode incrémental, âge (heures) à partir duquel un athlète est re-téléchargé
+DEFAULT_STALE_HOURS = 20
+
+
+def fetch_athlete_all(athlete_id, season_year, session=None, cache=None, metrics=None, parse_pool=None):
+    """Récupère records personnels et meilleurs temps de la saison d'un athlète
+    
+    Le profil (nom, club, nation, sexe, année) est parsé une seule fois, sur la page
+    des records; la page de saison n'est parsée que pour ses temps.
+    Si `parse_pool` est fourni, les deux pages sont parsées dans ses processus.
+    Retourne (personal, season), chacun pouvant valoir None en cas d'erreur.
+    """
+    personal = fetch_record(athlete_id, session, PERSONAL_BESTS, cache=cache, metrics=metrics, parse_pool=parse_pool)
+    season = fetch_record(athlete_id, session, SEASON_BESTS, season_year, cache=cache, profile=personal,
+                          metrics=metrics, parse_pool=parse_pool)
+    return personal, season
+
+
+def fetch_athlete_history(athlete_id, personal, session=None, cache=None, metrics=None):
+    """Historique complet de chaque épreuve des records (une page par épreuve)
+    
+    Retourne les courses des pages téléchargées; une épreuve en erreur est ignorée.
+    """
+    races = []
+    for style_id, stroke, distance in history_events(personal):
+        races += fetch_history(athlete_id, style_id, stroke, distance, session, cache, metrics) or []
+    return races
+
+
+def carried_records(athlete_ids, previous, journal):
+    """Enregistrements du document précédent à reprendre: IDs de la liste absents du journal"""
+    previous_swimmers = (previous or {}).get("swimmers", {})
+    return {athlete_id: previous_swimmers[athlete_id] for athlete_id in athlete_ids
+            if athlete_id not in journal.ids and athlete_id in previous_swimmers}
+
+
+def document_metadata(journal, carried, season_year=None, standards=None):
+    """_metadata du document écrit (journal + enregistrements repris), comme build_output sur leur fusion"""
+    generated = max([journal.latest] + [record.get("lastUpdated") or "" for record in carried.values()])
+    return build_metadata(journal.count + len(carried), generated or latest_update({}), season_year, standards)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Met à jour swimmers-data.json et swimmers-season.json")
+    add_common_arguments(parser)
+    parser.add_argument("--data-output", default=DATA_OUTPUT,
+                        help=f"fichier des records personnels (défaut: {DATA_OUTPUT})")
+    parser.add_argument("--season-output", default=SEASON_OUTPUT,
+                        help=f"fichier des meilleurs temps de la saison (défaut: {SEASON_OUTPUT})")
+    parser.add_argument("--season", type=int, default=None,
+                        help="année de fin de saison SwimRankings (défaut: saison courante)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="fusionne dans les fichiers existants au lieu de les régénérer "
+                             "(un athlète en erreur garde son dernier enregistrement valide)")
+    parser.add_argument("--stale-hours", type=float, default=DEFAULT_STALE_HOURS,
+                        help=f"mode incrémental: re-télécharge les athlètes téléchargés il y a plus de N heures "
+                             f"(défaut: {DEFAULT_STALE_HOURS}; dates dans <data-output>.fetched)")
+    parser.add_argument("--only", nargs="+", metavar="ID",
+                        help="mode incrémental: re-télécharge uniquement ces IDs")
+    parser.add_argument("--only-file", metavar="FICHIER",
+                        help="comme --only, IDs lus dans un fichier (un par ligne, # pour les commentaires)")
+    parser.add_argument("--minify", action="store_true",
+                        help="écrit les fichiers JSON sans indentation")
+    parser.add_argument("--publish-dir", metavar="RÉPERTOIRE",
+                        help="publie aussi un fichier par nageur + index.json, minifiés et précompressés (publish.py)")
+    parser.add_argument("--history", action="store_true",
+                        help="avec --store: ajoute l'historique complet de chaque épreuve (une page par épreuve), "
+                             "pour les athlètes aux résultats modifiés ou encore sans historique dans la base")
+    parser.add_argument("--failed-file", metavar="FICHIER",
+                        help="écrit les IDs en erreur (records ou saison), un par ligne; vide si tous ont réussi")
+    args = parser.parse_args(argv)
+    if args.only_file:
+        args.only = (args.only or []) + read_id_file(args.only_file)
+    if args.shard and args.publish_dir:
+        parser.error("--publish-dir avec --shard publierait un seul shard: publier après merge_shards.py")
+    return args
+
+
+def main():
+    """Point d'entrée principal"""
+    
+    args = parse_args()
+    
+    season_year = args.season or get_season_year()
+    season_dates = get_season_dates(season_year)
+    print(f"Saison courante: {get_season_label(season_year)} (pbest={season_year})", file=sys.stderr)
+    print(f"Période: {season_dates['start']} au {season_dates['end']}", file=sys.stderr)
+    
+    # Documents précédents: comparaison des contentHash (et fusion en mode incrémental)
+    previous = load_output(args.data_output)
+    previous_season = load_output(args.season_output)
+    # Les meilleurs temps d'une autre saison ne sont pas réutilisables
+    if previous_season and previous_season["_metadata"].get("season", {}).get("year") != season_year:
+        previous_season = None
+    merge = bool(args.incremental or args.only)
+    # Dates de téléchargement: hors des documents, dont lastUpdated ne change qu'avec le contenu
+    fetch_times_file = fetch_times_path(args.data_output)
+    fetch_times = load_fetch_times(fetch_times_file)
+    
+    # IDs en argument / --ids-file, dédoublonnés dans l'ordre; sans IDs, reprend ceux du fichier existant
+    athlete_ids = collect_athlete_ids(args)
+    if not athlete_ids and previous and merge:
+        athlete_ids = list(previous["swimmers"])
+    if args.only:
+        athlete_ids += [athlete_id for athlete_id in args.only if athlete_id not in athlete_ids]
+    
+    if not athlete_ids:
+        print("Usage: python update_swimmers.py [--workers N] [--incremental] [--ids-file FICHIER] "
+              "<athleteId1> [athleteId2] ...")
+        sys.exit(1)
+    athlete_ids = select_shard(athlete_ids, args)
+    
+    if args.only:
+        shard_ids = set(athlete_ids)
+        to_fetch = [athlete_id for athlete_id in dict.fromkeys(args.only) if athlete_id in shard_ids]
+    elif args.incremental:
+        to_fetch = select_stale(athlete_ids, [previous, previous_season], args.stale_hours, fetched=fetch_times)
+    else:
+        to_fetch = athlete_ids
+    
+    session = make_session(args)
+    cache = make_cache(args)
+    metrics = RunMetrics()
+    store = make_store(args)
+    parse_pool = make_parse_pool(args)
+    with_history = bool(store and args.history)
+    # Historique re-téléchargé seulement si les résultats ont changé (nouvelle course), ou s'il manque dans la base
+    without_history = set()
+    if with_history:
+        without_history = {athlete_id for athlete_id in to_fetch if not store.has_history(athlete_id)}
+    
+    def fetch(athlete_id):
+        personal, season = fetch_athlete_all(athlete_id, season_year, session, cache, metrics, parse_pool)
+        races = []
+        if with_history and personal and (athlete_id in without_history or record_changed(personal, previous)
+                                          or (season and record_changed(season, previous_season))):
+            races = fetch_athlete_history(athlete_id, personal, session, cache, metrics)
+        return personal, season, races
+    
+    # Enregistrements écrits au fil de l'eau dans un journal par sortie (reprise après un crash)
+    journal = RecordJournal(journal_path(args.data_output), journal_header(athlete_ids, shard=args.shard))
+    season_journal = RecordJournal(journal_path(args.season_output),
+                                   journal_header(athlete_ids, season_year, args.shard))
+    resumed = journal.ids & season_journal.ids
+    if resumed:
+        print(f"Reprise: {len(resumed)} athlètes déjà dans {journal.path} et {season_journal.path}", file=sys.stderr)
+        to_fetch = [athlete_id for athlete_id in to_fetch if athlete_id not in resumed]
+    standards = load_standards(args.standards)
+    
+    # IDs dont le contenu a changé (lastUpdated ne bouge que dans ce cas), avec le nom affiché
+    changed = []
+    changed_season = []
+    changed_names = {}
+    # IDs dont une page n'a pas pu être téléchargée (--failed-file)
+    failed = []
+    
+    print(f"Fetching {len(to_fetch)}/{len(athlete_ids)} athletes...", file=sys.stderr)
+    try:
+        for athlete_id, result in iter_concurrently(to_fetch, fetch, args.workers):
+            personal, season, races = result or (None, None, [])
+            
+            if personal:
+                if carry_unchanged(personal, previous):
+                    changed.append(athlete_id)
+                    changed_names[athlete_id] = personal["fullName"]
+                print(f"  ✓ {personal['fullName']} - {len(personal['personalBests'])} PBs", file=sys.stderr)
+            else:
+                print(f"  ✗ Erreur records pour {athlete_id}", file=sys.stderr)
+            
+            if season:
+                if carry_unchanged(season, previous_season):
+                    changed_season.append(athlete_id)
+                    changed_names[athlete_id] = season["fullName"]
+                print(f"  ✓ {season['fullName']} - {len(season['seasonBests'])} season bests", file=sys.stderr)
+            else:
+                print(f"  ✗ Erreur saison pour {athlete_id}", file=sys.stderr)
+            
+            if personal and season:
+                fetch_times[athlete_id] = datetime.utcnow().isoformat() + "Z"
+            else:
+                failed.append(athlete_id)
+            
+            if store:
+                added = 0
+                if personal:
+                    added += store.add_record(personal, PERSONAL_BESTS)
+                if season:
+                    added += store.add_record(season, SEASON_BESTS)
+                added += store.add_results(athlete_id, races, "history")
+                if added:
+                    print(f"  + {added} nouveaux résultats dans l'historique", file=sys.stderr)
+            
+            # Points FINA et écarts aux temps limites, calculés une fois pour l'app
+            # (un athlète repris d'un run interrompu n'a qu'une de ses deux pages à ajouter)
+            if personal and athlete_id not in journal.ids:
+                if standards:
+                    standards.annotate_swimmers({athlete_id: personal}, PERSONAL_BESTS)
+                journal.append(personal)
+            if season and athlete_id not in season_journal.ids:
+                if standards:
+                    standards.annotate_swimmers({athlete_id: season}, SEASON_BESTS)
+                season_journal.append(season)
+    finally:
+        if parse_pool:
+            parse_pool.close()
+    
+    metrics.record_changes(PERSONAL_BESTS, changed)
+    metrics.record_changes(SEASON_BESTS, changed_season)
+    print(f"Modifiés: {len(changed)}/{journal.count} records, {len(changed_season)}/{season_journal.count} saison"
+          f"{': ' + ', '.join(changed_names.values()) if changed_names else ''}", file=sys.stderr)
+    
+    report_run(session, metrics, args)
+    save_fetch_times(fetch_times_file, {athlete_id: fetch_times[athlete_id] for athlete_id in athlete_ids
+                                        if athlete_id in fetch_times})
+    if store:
+        print(f"Historique: {store.count()} résultats dans {store.path}", file=sys.stderr)
+        store.close()
+    
+    # Athlètes non re-téléchargés ou en erreur: dernier enregistrement valide
+    carried = carried_records(athlete_ids, previous, journal) if merge else {}
+    carried_season = carried_records(athlete_ids, previous_season, season_journal) if merge else {}
+    if standards:
+        standards.annotate_swimmers(carried, PERSONAL_BESTS)
+        standards.annotate_swimmers(carried_season, SEASON_BESTS)
+    
+    data_metadata = document_metadata(journal, carried, standards=standards)
+    season_metadata = document_metadata(season_journal, carried_season, season_year, standards)
+    if args.shard:
+        data_metadata["shard"] = season_metadata["shard"] = shard_metadata(args, athlete_ids)
+    journal.write_document(args.data_output, data_metadata, args.minify, athlete_ids, carried)
+    season_journal.write_document(args.season_output, season_metadata, args.minify, athlete_ids, carried_season)
+    print(f"Écrit {args.data_output} ({data_metadata['count']}) et {args.season_output} ({season_metadata['count']})",
+          file=sys.stderr)
+    if args.failed_file:
+        # Après l'écriture des documents: un run interrompu avant ne produit pas de liste (code de sortie non nul)
+        write_id_file(args.failed_file, failed)
+        print(f"{len(failed)} athlètes en erreur écrits dans {args.failed_file}", file=sys.stderr)
+    
+    if args.publish_dir:
+        # Relu une fois les documents écrits: chaque nageur est publié avec ses deux enregistrements
+        swimmers = load_output(args.data_output)["swimmers"]
+        season_swimmers = load_output(args.season_output)["swimmers"]
+        written, removed = publish(args.publish_dir, swimmers, season_swimmers, season_year)
+        print(f"Publié {args.publish_dir}: {written} fichiers écrits, {removed} supprimés", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()